@@ -0,0 +1,17 @@
+""" prich - CLI and Python API to run LLM prompt templates """
+
+__all__ = ["PrichSession", "PrichError", "RunContext", "RunResult", "StepResult"]
+
+
+def __getattr__(name: str):
+    # public API is imported lazily to keep the CLI startup fast
+    if name in ["PrichSession", "PrichError"]:
+        from prich.core import session
+        return getattr(session, name)
+    if name == "RunContext":
+        from prich.core.run_context import RunContext
+        return RunContext
+    if name in ["RunResult", "StepResult"]:
+        from prich.core import run_result
+        return getattr(run_result, name)
+    raise AttributeError(f"module 'prich' has no attribute '{name}'")
@@ -27,6 +27,8 @@ def list_providers(global_only: bool, local_only: bool, details: bool):
         if provider_config.provider_type == 'mlx_local':
             if 'model_path' in provider_config.model_dump().keys():
                 provider_model = provider_config.model_path
+        elif provider_config.provider_type == 'group':
+            provider_model = f"{provider_config.strategy}: {', '.join(provider_config.providers)}"
         else:
             if 'model' in provider_config.model_dump().keys():
                 provider_model = provider_config.model
@@ -0,0 +1,46 @@
+import click
+from prich.core.utils import console_print
+
+
+@click.group("dev")
+def dev_group():
+    """Development and benchmarking tools."""
+    pass
+
+
+@dev_group.command(name="mock-llm")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Host to listen on")
+@click.option("--port", default=11435, show_default=True, type=int, help="Port to listen on")
+@click.option("--model", "models", multiple=True, help="Model name served by /api/tags and /v1/models (multiple allowed, default 'mock')")
+@click.option("--response", "response_text", type=str, default=None, help="Response text (split into word tokens)")
+@click.option("--echo", is_flag=True, default=False, help="Respond with the prompt (last user message) text")
+@click.option("--ttft-ms", type=float, default=0, show_default=True, help="Time to first token in milliseconds")
+@click.option("--tokens-per-sec", type=float, default=0, show_default=True, help="Generation speed (0 - no delay)")
+@click.option("--error-rate", type=click.FloatRange(0, 1), default=0, show_default=True, help="Part of requests failed with 500 error")
+@click.option("--rate-limit-rate", type=click.FloatRange(0, 1), default=0, show_default=True, help="Part of requests rejected with 429 rate limit")
+@click.option("--retry-after", type=int, default=1, show_default=True, help="Retry-After seconds sent with 429 responses")
+@click.option("--load-ms", type=float, default=0, show_default=True, help="Ollama model load time in milliseconds (when not resident)")
+@click.option("--seed", type=int, default=None, help="Random seed for the error injection")
+@click.option("--log-requests", is_flag=True, default=False, help="Log requests")
+def mock_llm(host: str, port: int, models: tuple, response_text: str, echo: bool, ttft_ms: float, tokens_per_sec: float,
+             error_rate: float, rate_limit_rate: float, retry_after: int, load_ms: float, seed: int, log_requests: bool):
+    """Run local mock LLM server (OpenAI /v1/chat/completions and Ollama /api/generate compatible)."""
+    from prich.core.mock_llm import MockLLMOptions, create_mock_llm_server
+
+    options = MockLLMOptions(models=list(models), response=response_text, echo=echo, ttft_ms=ttft_ms,
+                             tokens_per_sec=tokens_per_sec, error_rate=error_rate, rate_limit_rate=rate_limit_rate,
+                             retry_after=retry_after, load_ms=load_ms, seed=seed)
+    try:
+        server = create_mock_llm_server(host, port, options, log_requests=log_requests)
+    except OSError as e:
+        raise click.ClickException(f"Failed to start mock LLM server on {host}:{port}: {e}")
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    console_print(f"Mock LLM server is running on [green]{url}[/green] (models: {', '.join(options.models)})")
+    console_print(f"[dim]OpenAI provider configuration base_url: {url}/v1, Ollama provider base_url: {url}[/dim]")
+    console_print("[dim]Press Ctrl+C to stop[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -3,6 +3,7 @@ from prich.constants import RESERVED_RUN_TEMPLATE_CLI_OPTIONS
 from prich.models.template import TemplateModel
 from prich.core.loaders import load_global_config, load_local_config, load_merged_config, load_templates
 from prich.core.engine import run_template
+from prich.core.run_context import RunContext, use_run_context
 from prich.core.state import _loaded_templates
 from prich.core.utils import should_use_global_only, should_use_local_only, is_verbose, console_print
 
@@ -80,16 +81,25 @@ def create_dynamic_command(config, template: TemplateModel) -> click.Command:
         click.Option(["-v", "--verbose"], is_flag=True, default=False, help="Verbose mode"),
         click.Option(["-q", "--quiet"], is_flag=True, default=False, help="Suppress all output"),
         click.Option(["-f", "--only-final-output"], is_flag=True, default=False,
-                     help="Suppress output and show only the last step output")
+                     help="Suppress output and show only the last step output"),
+        click.Option(["--record"], type=click.Path(file_okay=False), default=None,
+                     help="Record LLM provider responses into the cassettes folder"),
+        click.Option(["--replay"], type=click.Path(file_okay=False), default=None,
+                     help="Replay LLM provider responses from the cassettes folder (no provider calls)"),
+        click.Option(["--replay-timing"], is_flag=True, default=False,
+                     help="Replay responses with the recorded stream timing")
     ])
 
     @click.pass_context
     def dynamic_command(ctx, **kwargs):
-        if is_verbose():
-            console_print(
-                f"[dim]Template: [green]{template.name}[/green] ({template.version}), {template.source.value}, args: {', '.join([f'{k}={v}' for k, v in kwargs.items() if v])}[/dim]")
-            console_print(f"[dim]{template.description}[/dim]")
-        run_template(template.id, **kwargs)
+        # run flags are resolved once here and used by the engine, steps and providers
+        run_context = RunContext.from_click(ctx)
+        with use_run_context(run_context):
+            if is_verbose():
+                console_print(
+                    f"[dim]Template: [green]{template.name}[/green] ({template.version}), {template.source.value}, args: {', '.join([f'{k}={v}' for k, v in kwargs.items() if v])}[/dim]")
+                console_print(f"[dim]{template.description}[/dim]")
+            run_template(template.id, run_context=run_context, **kwargs)
 
     return click.Command(name=template.id, callback=dynamic_command, params=options,
                          help=f"{template.description if template.description else ''}",
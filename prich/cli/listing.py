@@ -4,7 +4,6 @@ import click
 from prich.models.file_scope import FileScope
 from prich.core.loaders import get_loaded_templates
 from prich.core.utils import console_print
-from prich.models.template_repo_manifest import TemplatesRepoManifest, TemplateRepoItem
 
 
 @click.command(name="tags")
@@ -36,12 +35,13 @@ def list_tags(global_only: bool, local_only: bool):
 @click.option("-t", "--tag", "tags", multiple=True, help="Tag to include (ex. '-t code -t review')")
 @click.option("-r", "--remote", "remote_repo", is_flag=True, help="List remote templates available for installation")
 @click.option("-j", "--json", "json_only", is_flag=True, help="Output in json format")
-def list_templates(global_only: bool, local_only: bool, remote_repo: bool, json_only: bool, tags: List[str]):
+@click.option("--refresh", is_flag=True, help="Revalidate cached remote templates manifest")
+def list_templates(global_only: bool, local_only: bool, remote_repo: bool, json_only: bool, tags: List[str], refresh: bool):
     """List templates."""
     if remote_repo and (global_only or local_only):
         raise click.ClickException("When listing remote templates available for installation the global or local options are not supported, use: 'prich list -r'")
     if remote_repo:
-        list_github_templates(tags, json_only)
+        list_github_templates(tags, json_only, refresh)
         return
     if global_only and local_only:
         raise click.ClickException("Use only one local or global option, use: 'prich list -g' or 'prich list -l'")
@@ -67,28 +67,15 @@ def list_templates(global_only: bool, local_only: bool, remote_repo: bool, json_
         template_details = f" (ver:{template.version}, tags:[green]{','.join(template.tags) if template.tags else '-'}[/green])"
         console_print(f"- {template.id}[dim]{marker}[/dim]: [dim]{template.description or '-'}{template_details}[/dim]")
 
-def list_github_templates(tags, json_only):
+def list_github_templates(tags, json_only, refresh: bool = False):
     """List available for installation templates from GitHub."""
-    import requests
     import json
     from rich.table import Table
     from rich.console import Console
-
-    def has_any_tag(template: TemplateRepoItem, tags: List[str]) -> bool:
-        lowered_tags = {t.lower() for t in template.tags}
-        return any(t.lower() in lowered_tags for t in tags)
-
-    TEMPLATES_MANIFEST_URL = "https://raw.githubusercontent.com/oleks-dev/prich-templates/main/templates/manifest.json"
+    from prich.cli.template_utils import get_remote_prich_templates_manifest, has_any_tag
 
     console = Console()
-    try:
-        console.print(f"Fetching: {TEMPLATES_MANIFEST_URL}")
-        response = requests.get(TEMPLATES_MANIFEST_URL)
-        response.raise_for_status()
-        json_data = json.loads(response.text)
-        manifest = TemplatesRepoManifest(**json_data)
-    except Exception as e:
-        raise click.ClickException(f"Error: Failed to fetch or parse templates repository manifest: {e}")
+    manifest = get_remote_prich_templates_manifest(refresh=refresh)
 
     templates = manifest.templates or []
     if not templates:
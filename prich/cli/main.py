@@ -1,11 +1,17 @@
 import click
 
 from prich.cli.run import run_group
-from prich.cli.templates import template_install, show_template, create_template, venv_install
+from prich.cli.templates import template_install, show_template, create_template, venv_install, templates_sync, \
+    templates_update, venv_gc
 from prich.cli.listing import list_tags, list_templates
 from prich.cli.config import config_group
 from prich.cli.validate import validate_templates
 from prich.cli.init_cmd import init, completion
+from prich.cli.dev import dev_group
+from prich.cli.provider import provider_group
+from prich.cli.serve import serve
+from prich.cli.queue import queue_group, worker
+from prich.cli.testing import run_tests
 from prich.version import VERSION
 
 @click.group()
@@ -16,6 +22,8 @@ def cli():
 
 cli.add_command(run_group)
 cli.add_command(template_install)
+cli.add_command(templates_sync)
+cli.add_command(templates_update)
 cli.add_command(config_group)
 cli.add_command(init)
 cli.add_command(completion)
@@ -24,7 +32,14 @@ cli.add_command(list_templates)
 cli.add_command(show_template)
 cli.add_command(create_template)
 cli.add_command(validate_templates)
+cli.add_command(run_tests)
 cli.add_command(venv_install)
+cli.add_command(venv_gc)
+cli.add_command(provider_group)
+cli.add_command(serve)
+cli.add_command(queue_group)
+cli.add_command(worker)
+cli.add_command(dev_group)
 
 if __name__ == "__main__":
     cli()
\ No newline at end of file
@@ -0,0 +1,103 @@
+import click
+from prich.core.loaders import get_loaded_config
+from prich.core.utils import console_print
+
+WARMUP_PROVIDER_TYPES = ["ollama", "mlx_local"]
+
+
+def _status(message: str):
+    from contextlib import nullcontext
+    from prich.core.utils import console, is_print_enabled
+    return console.status(message) if is_print_enabled() else nullcontext()
+
+
+def _select_providers(config, names: tuple) -> dict:
+    if not names:
+        return {name: provider for name, provider in config.providers.items() if provider.provider_type in WARMUP_PROVIDER_TYPES}
+    not_found = [name for name in names if name not in config.providers]
+    if not_found:
+        raise click.ClickException(f"Provider {', '.join(not_found)} configuration not found. Check your config.yaml file.")
+    return {name: config.providers[name] for name in names}
+
+
+@click.group("provider")
+def provider_group():
+    """Manage LLM provider models."""
+    pass
+
+
+@provider_group.command(name="warmup")
+@click.argument("names", nargs=-1)
+@click.option("-k", "--keep-alive", type=str, default=None, help="How long the model stays loaded (ex. 30m, -1 to keep loaded), provider keep_alive is used by default")
+@click.option("-g", "--global", "global_only", is_flag=True, help="Only global config providers")
+@click.option("-l", "--local", "local_only", is_flag=True, help="Only local config providers")
+def warmup(names: tuple, keep_alive: str, global_only: bool, local_only: bool):
+    """Preload provider models (all ollama and mlx_local providers by default)."""
+    from prich.llm_providers.get_llm_provider import get_llm_provider
+    from prich.llm_providers.provider_group import ProviderStatsStore
+
+    config, _ = get_loaded_config()
+    providers = _select_providers(config, names)
+    if not providers:
+        raise click.ClickException("No providers to warm up found.")
+    if keep_alive is not None and keep_alive.lstrip("-").isdigit():
+        keep_alive = int(keep_alive)
+    stats = ProviderStatsStore()
+    failed = False
+    for name, provider in providers.items():
+        if provider.provider_type not in WARMUP_PROVIDER_TYPES:
+            console_print(f"- [green]{name}[/green] [dim]({provider.provider_type})[/dim]: [yellow]warmup is not supported[/yellow]")
+            continue
+        try:
+            with _status(f"Loading {name}..."):
+                result = get_llm_provider(name, provider).warmup(keep_alive=keep_alive)
+        except click.ClickException as e:
+            failed = True
+            console_print(f"- [green]{name}[/green] [dim]({provider.provider_type})[/dim]: [red]{e.message}[/red]")
+            continue
+        stats.record_load(name, result.get("load_ms"))
+        keep_alive_info = f", keep_alive {result.get('keep_alive')}" if result.get("keep_alive") is not None else ""
+        console_print(f"- [green]{name}[/green] [dim]({provider.provider_type})[/dim]: loaded, load {result.get('load_ms')} ms, total {result.get('duration_ms')} ms{keep_alive_info}")
+    stats.save()
+    if failed:
+        raise click.ClickException("Some providers failed to warm up.")
+
+
+@provider_group.command(name="status")
+@click.argument("names", nargs=-1)
+@click.option("-g", "--global", "global_only", is_flag=True, help="Only global config providers")
+@click.option("-l", "--local", "local_only", is_flag=True, help="Only local config providers")
+def status(names: tuple, global_only: bool, local_only: bool):
+    """Show which provider models are loaded (all ollama and mlx_local providers by default)."""
+    from prich.llm_providers.get_llm_provider import get_llm_provider
+    from prich.llm_providers.provider_group import ProviderStatsStore
+
+    config, _ = get_loaded_config()
+    providers = _select_providers(config, names)
+    if not providers:
+        raise click.ClickException("No providers with status found.")
+    stats = ProviderStatsStore()
+    for name, provider in providers.items():
+        if provider.provider_type not in WARMUP_PROVIDER_TYPES:
+            console_print(f"- [green]{name}[/green] [dim]({provider.provider_type})[/dim]: [yellow]status is not supported[/yellow]")
+            continue
+        try:
+            result = get_llm_provider(name, provider).status()
+        except click.ClickException as e:
+            console_print(f"- [green]{name}[/green] [dim]({provider.provider_type})[/dim]: [red]{e.message}[/red]")
+            continue
+        details = []
+        if result.get("expires_at"):
+            details.append(f"expires at {result.get('expires_at')}")
+        if result.get("details"):
+            details.append(result.get("details"))
+        provider_stats = stats.get(name)
+        if provider_stats.get("load_ms") is not None:
+            details.append(f"last warmup load {provider_stats.get('load_ms')} ms at {provider_stats.get('loaded_at')}")
+        if provider_stats.get("latency_ms") is not None:
+            details.append(f"avg response {provider_stats.get('latency_ms')} ms")
+        if provider_stats.get("slot_wait_ms") is not None:
+            details.append(f"avg slot wait {provider_stats.get('slot_wait_ms')} ms")
+        state = "[green]loaded[/green]" if result.get("resident") else "[yellow]not loaded[/yellow]"
+        details_text = f" [dim]({', '.join(details)})[/dim]" if details else ""
+        console_print(f"- [green]{name}[/green] [dim]({provider.provider_type})[/dim]: {state}{details_text}")
@@ -0,0 +1,155 @@
+import json
+import click
+from pathlib import Path
+from prich.core.utils import console_print, shorten_path
+
+
+def _get_job_queue(db: str | None, global_only: bool):
+    from prich.core.job_queue import JobQueue
+    from prich.core.utils import get_prich_dir
+    return JobQueue(Path(db) if db else get_prich_dir(global_only) / "queue.db")
+
+
+def _parse_variables(var_items: tuple, vars_json: str | None) -> dict:
+    variables = {}
+    if vars_json:
+        try:
+            variables = json.loads(vars_json)
+        except ValueError as e:
+            raise click.ClickException(f"Failed to parse --vars JSON: {e}")
+        if not isinstance(variables, dict):
+            raise click.ClickException("--vars should be a JSON object with variables.")
+    for item in var_items:
+        name, sep, value = item.partition("=")
+        if not sep or not name:
+            raise click.ClickException(f"Wrong variable '{item}', use NAME=VALUE format.")
+        variables[name] = value
+    return variables
+
+
+@click.group("queue")
+def queue_group():
+    """Durable local queue of template runs processed by 'prich worker'."""
+    pass
+
+
+@queue_group.command(name="submit")
+@click.argument("template_id")
+@click.option("--var", "var_items", multiple=True, help="Template variable NAME=VALUE (multiple allowed)")
+@click.option("--vars", "vars_json", type=str, default=None, help="Template variables JSON object")
+@click.option("--from-file", "from_file", type=click.File("r"), default=None, help="JSON lines file with variables object per job (- for stdin), --var/--vars are added to each job")
+@click.option("-p", "--provider", type=str, default=None, help="Override LLM provider")
+@click.option("--max-attempts", type=click.IntRange(1), default=3, show_default=True, help="Attempts before the job fails")
+@click.option("--db", type=click.Path(dir_okay=False), default=None, help="Queue database file (.prich/queue.db by default)")
+@click.option("-g", "--global", "global_only", is_flag=True, help="Use global ~/.prich/queue.db")
+def queue_submit(template_id: str, var_items: tuple, vars_json: str, from_file, provider: str, max_attempts: int, db: str, global_only: bool):
+    """Append template run jobs to the queue."""
+    variables = _parse_variables(var_items, vars_json)
+    variables_list = []
+    if from_file:
+        for line_number, line in enumerate(from_file, 1):
+            if not line.strip():
+                continue
+            try:
+                job_variables = json.loads(line)
+            except ValueError as e:
+                raise click.ClickException(f"Failed to parse line {line_number} of {from_file.name}: {e}")
+            if not isinstance(job_variables, dict):
+                raise click.ClickException(f"Line {line_number} of {from_file.name} should be a JSON object with variables.")
+            variables_list.append({**job_variables, **variables})
+    else:
+        variables_list.append(variables)
+    job_queue = _get_job_queue(db, global_only)
+    ids = job_queue.submit(template_id, variables_list, provider=provider, max_attempts=max_attempts)
+    if len(ids) == 1:
+        console_print(f"Job [green]{ids[0]}[/green] submitted ({template_id}) to {shorten_path(job_queue.path)}")
+    else:
+        console_print(f"[green]{len(ids)}[/green] jobs submitted ({template_id}, ids {ids[0]}-{ids[-1]}) to {shorten_path(job_queue.path)}")
+
+
+@queue_group.command(name="status")
+@click.option("--window", type=click.IntRange(1), default=10, show_default=True, help="Throughput window in minutes")
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+@click.option("--db", type=click.Path(dir_okay=False), default=None, help="Queue database file (.prich/queue.db by default)")
+@click.option("-g", "--global", "global_only", is_flag=True, help="Use global ~/.prich/queue.db")
+def queue_status(window: int, as_json: bool, db: str, global_only: bool):
+    """Show queue backlog and throughput."""
+    job_queue = _get_job_queue(db, global_only)
+    status = job_queue.status(window_seconds=window * 60)
+    if as_json:
+        click.echo(json.dumps(status, indent=2))
+        return
+    counts = status.get("counts")
+    oldest = f" (oldest {status.get('oldest_queued_sec')}s)" if status.get("oldest_queued_sec") is not None else ""
+    expired = f" ([yellow]{status.get('expired_leases')} expired leases[/yellow])" if status.get("expired_leases") else ""
+    failed = f"[red]{counts.get('failed')}[/red]" if counts.get("failed") else "0"
+    avg_duration = f", avg {status.get('avg_duration_ms')} ms per job" if status.get("avg_duration_ms") is not None else ""
+    console_print(f"Queue {shorten_path(job_queue.path)}:")
+    console_print(f"- queued: {counts.get('queued')}{oldest}")
+    console_print(f"- running: {counts.get('running')}{expired}")
+    console_print(f"- done: [green]{counts.get('done')}[/green]")
+    console_print(f"- failed: {failed}")
+    console_print(f"Throughput (last {window} min): {status.get('throughput_per_min')} jobs/min, {status.get('done_recently')} done{avg_duration}")
+
+
+@queue_group.command(name="result")
+@click.argument("job_id", type=int)
+@click.option("--json", "as_json", is_flag=True, help="Output as JSON")
+@click.option("--db", type=click.Path(dir_okay=False), default=None, help="Queue database file (.prich/queue.db by default)")
+@click.option("-g", "--global", "global_only", is_flag=True, help="Use global ~/.prich/queue.db")
+def queue_result(job_id: int, as_json: bool, db: str, global_only: bool):
+    """Show job status and output."""
+    from dataclasses import asdict
+
+    job = _get_job_queue(db, global_only).get(job_id)
+    if job is None:
+        raise click.ClickException(f"Job {job_id} not found.")
+    if as_json:
+        click.echo(json.dumps(asdict(job), indent=2, default=str))
+        return
+    console_print(f"Job [green]{job.id}[/green] ({job.template_id}): {job.status}, attempts {job.attempts}/{job.max_attempts}{f', {job.duration_ms} ms' if job.duration_ms is not None else ''}")
+    if job.error:
+        from rich.markup import escape
+        console_print(f"[red]{escape(job.error)}[/red]")
+    if job.output is not None:
+        click.echo(job.output)
+
+
+@click.command("worker")
+@click.option("-c", "--concurrency", type=click.IntRange(1), default=1, show_default=True, help="Jobs processed concurrently")
+@click.option("--lease", "lease_seconds", type=click.IntRange(5), default=300, show_default=True, help="Job lease seconds, extended while running (expired leases are picked up by other workers)")
+@click.option("--poll-interval", type=float, default=1.0, show_default=True, help="Seconds between checks of an empty queue")
+@click.option("--retry-backoff", type=float, default=10, show_default=True, help="First retry delay seconds (doubled with each attempt)")
+@click.option("--exit-when-empty", is_flag=True, help="Stop when no jobs are available")
+@click.option("--db", type=click.Path(dir_okay=False), default=None, help="Queue database file (.prich/queue.db by default)")
+@click.option("-g", "--global", "global_only", is_flag=True, help="Only global config, templates and ~/.prich/queue.db")
+@click.option("-l", "--local", "local_only", is_flag=True, help="Only local config and templates")
+def worker(concurrency: int, lease_seconds: int, poll_interval: float, retry_backoff: float, exit_when_empty: bool, db: str,
+           global_only: bool, local_only: bool):
+    """Process queued template run jobs (several workers could process one queue)."""
+    from prich.core.job_queue import run_worker
+    from prich.core.run_context import RunContext
+    from prich.core.session import PrichSession
+
+    job_queue = _get_job_queue(db, global_only)
+    session = PrichSession(run_context=RunContext(quiet=True, global_only=global_only, local_only=local_only))
+    session.get_config()
+
+    def on_job_done(job, status):
+        if status == "done":
+            console_print(f"- job [green]{job.id}[/green] ({job.template_id}) done")
+        elif status == "queued":
+            console_print(f"- job [green]{job.id}[/green] ({job.template_id}) [yellow]failed, retry queued[/yellow]")
+        elif status == "failed":
+            console_print(f"- job [green]{job.id}[/green] ({job.template_id}) [red]failed[/red]")
+        elif status == "lost":
+            console_print(f"- job [green]{job.id}[/green] ({job.template_id}) [yellow]lease lost, result is not recorded[/yellow]")
+
+    console_print(f"Worker is processing {shorten_path(job_queue.path)} (concurrency {concurrency})")
+    try:
+        processed = run_worker(job_queue, session, concurrency=concurrency, lease_seconds=lease_seconds, poll_interval=poll_interval,
+                               retry_backoff_sec=retry_backoff, exit_when_empty=exit_when_empty, on_job_done=on_job_done)
+    except KeyboardInterrupt:
+        console_print("[yellow]Worker stopped, leases of running jobs expire and they are picked up again[/yellow]")
+        return
+    console_print(f"Worker stopped, {processed} jobs processed")
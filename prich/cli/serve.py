@@ -0,0 +1,53 @@
+import click
+from prich.core.utils import console_print
+
+
+def _parse_template_limits(values: tuple) -> dict:
+    limits = {}
+    for value in values:
+        template_id, _, limit = value.partition("=")
+        if not template_id or not limit.isdigit() or int(limit) < 1:
+            raise click.ClickException(f"Wrong template limit '{value}', use TEMPLATE_ID=N format (ex. code-review=2).")
+        limits[template_id] = int(limit)
+    return limits
+
+
+@click.command("serve")
+@click.option("--host", default="127.0.0.1", show_default=True, help="Host to listen on")
+@click.option("--port", default=8765, show_default=True, type=int, help="Port to listen on")
+@click.option("--workers", default=4, show_default=True, type=click.IntRange(1), help="Templates running concurrently")
+@click.option("--queue-size", default=16, show_default=True, type=click.IntRange(0), help="Requests waiting for a worker, requests over it are rejected with 429")
+@click.option("--template-limit", "template_limits", multiple=True, help="Template concurrency limit TEMPLATE_ID=N (multiple allowed)")
+@click.option("--default-template-limit", type=click.IntRange(1), default=None, help="Concurrency limit of templates without --template-limit (workers count by default)")
+@click.option("--retry-after", type=int, default=1, show_default=True, help="Retry-After seconds sent with 429 responses")
+@click.option("-g", "--global", "global_only", is_flag=True, default=False, help="Only global config and templates")
+@click.option("-l", "--local", "local_only", is_flag=True, default=False, help="Only local config and templates")
+@click.option("--log-requests", is_flag=True, default=False, help="Log requests")
+def serve(host: str, port: int, workers: int, queue_size: int, template_limits: tuple, default_template_limit: int,
+          retry_after: int, global_only: bool, local_only: bool, log_requests: bool):
+    """Run HTTP server exposing templates as POST /templates/{id}/run endpoints."""
+    from prich.core.run_context import RunContext
+    from prich.core.server import RunScheduler, create_prich_server
+    from prich.core.session import PrichSession
+
+    session = PrichSession(run_context=RunContext(quiet=True, global_only=global_only, local_only=local_only))
+    # config and templates are loaded once and shared by all requests
+    session.get_config()
+    templates = session.get_templates()
+    scheduler = RunScheduler(workers=workers, queue_size=queue_size, template_limits=_parse_template_limits(template_limits),
+                             default_template_limit=default_template_limit)
+    try:
+        server = create_prich_server(session, host, port, scheduler=scheduler, retry_after=retry_after, log_requests=log_requests)
+    except OSError as e:
+        raise click.ClickException(f"Failed to start prich server on {host}:{port}: {e}")
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    console_print(f"prich server is running on [green]{url}[/green] ({len(templates)} templates, {workers} workers, queue {queue_size})")
+    console_print(f"[dim]Run template: curl -X POST {url}/templates/<template_id>/run -d '{{\"variable\": \"value\"}}'[/dim]")
+    console_print("[dim]Press Ctrl+C to stop[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        scheduler.shutdown()
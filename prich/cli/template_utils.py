@@ -1,17 +1,27 @@
 import hashlib
 from pathlib import Path
 
-from prich.models.template_repo_manifest import TemplatesRepoManifest
+from prich.models.template_repo_manifest import TemplatesRepoManifest, TemplateRepoItem
+from prich.models.templates_lock import TemplatesLockModel, TemplateLockItem
 
-def get_remote_prich_templates_manifest(manifest_url: str = "https://raw.githubusercontent.com/oleks-dev/prich-templates/main/templates/manifest.json"):
+TEMPLATES_LOCK_FILE_NAME = "templates.lock"
+TEMPLATE_META_FILE_NAME = ".prich-meta.json"
+SKIPPED_TEMPLATE_DIRS = {"venv", "__pycache__"}
+
+def get_remote_prich_templates_manifest(manifest_url: str = None, refresh: bool = False) -> TemplatesRepoManifest:
+    """ Templates repository manifest (configured settings.templates_manifest_url), cached locally with conditional requests """
     import click
     import json
-    import requests
+    from prich.core.manifest_cache import ManifestCache, get_manifest_settings
+    from prich.core.utils import console_print
+
+    configured_url, ttl = get_manifest_settings()
+    manifest_url = manifest_url or configured_url
+    manifest_text, source = ManifestCache(ttl=ttl).get(manifest_url, refresh=refresh)
+    if source == "offline":
+        console_print(f"[yellow]Failed to reach {manifest_url}, using cached templates manifest.[/yellow]")
     try:
-        response = requests.get(manifest_url)
-        response.raise_for_status()
-        json_data = json.loads(response.text)
-        manifest = TemplatesRepoManifest(**json_data)
+        manifest = TemplatesRepoManifest(**json.loads(manifest_text))
     except Exception as e:
         raise click.ClickException(f"Error: Failed to fetch or parse templates repository manifest: {e}")
     return manifest
@@ -21,17 +31,25 @@ def iter_files(base: Path):
         if p.is_file():
             yield p
 
-def directory_hash(dir_path: Path) -> tuple[str, list[str]]:
-    FILE_MODE = 0o100644  # regular file with 0644 perms
+FILE_MODE = 0o100644  # regular file with 0644 perms
+
 
+def _hash_file_header(h, rel: str):
+    # hash path + normalized type/perms (followed by file bytes)
+    h.update(b"PATH\x00" + rel.encode("utf-8"))
+    h.update(b"MODE\x00" + str(FILE_MODE).encode())
+
+def directory_hash(dir_path: Path, files: list[str] = None) -> tuple[str, list[str]]:
+    """ Folder checksum (sha256 of sorted files paths and content), files limits it to the listed relative paths """
     h = hashlib.sha256()
     dir_files_list = []
+    files = {Path(rel).as_posix() for rel in files} if files is not None else None
     for p in iter_files(dir_path):
         rel = p.relative_to(dir_path).as_posix()
+        if files is not None and rel not in files:
+            continue
         dir_files_list.append(str(rel))
-        # hash path + normalized type/perms + file bytes
-        h.update(b"PATH\x00" + rel.encode("utf-8"))
-        h.update(b"MODE\x00" + str(FILE_MODE).encode())
+        _hash_file_header(h, rel)
         with p.open("rb") as f:
             while True:
                 chunk = f.read(1024 * 1024)
@@ -39,3 +57,132 @@ def directory_hash(dir_path: Path) -> tuple[str, list[str]]:
                     break
                 h.update(chunk)
     return h.hexdigest(), dir_files_list
+
+
+class OrderedDirectoryHasher:
+    """
+    directory_hash of files received concurrently (ex. downloaded), computed while the files are streamed.
+
+    Chunks are hashed in the directory_hash files order, chunks of a file are buffered until all previous files
+    are complete. valid is False when an already hashed file was restarted (use directory_hash then).
+    """
+    def __init__(self, files: list[str]):
+        import threading
+        # same order as iter_files (sorted paths)
+        self._order = sorted({Path(rel).as_posix() for rel in files}, key=Path)
+        self._index = {rel: idx for idx, rel in enumerate(self._order)}
+        self._buffers = {rel: [] for rel in self._order}
+        self._completed = set()
+        self._current = 0
+        self._current_started = False
+        self._current_fed = False  # current file bytes were hashed
+        self._hash = hashlib.sha256()
+        self._lock = threading.Lock()
+        self.valid = True
+
+    def _advance(self):
+        while self._current < len(self._order):
+            rel = self._order[self._current]
+            if not self._current_started:
+                _hash_file_header(self._hash, rel)
+                self._current_started = True
+            for chunk in self._buffers[rel]:
+                self._hash.update(chunk)
+                self._current_fed = True
+            self._buffers[rel] = []
+            if rel not in self._completed:
+                return
+            self._current += 1
+            self._current_started = False
+            self._current_fed = False
+
+    def update(self, rel: str, chunk: bytes):
+        with self._lock:
+            self._buffers[Path(rel).as_posix()].append(chunk)
+            self._advance()
+
+    def complete(self, rel: str):
+        with self._lock:
+            self._completed.add(Path(rel).as_posix())
+            self._advance()
+
+    def restart(self, rel: str):
+        """ File is received again from the beginning """
+        rel = Path(rel).as_posix()
+        with self._lock:
+            if self._index[rel] < self._current or (self._index[rel] == self._current and self._current_fed):
+                self.valid = False
+            self._buffers[rel] = []
+
+    def hexdigest(self) -> str:
+        with self._lock:
+            return self._hash.hexdigest()
+
+
+def has_any_tag(template: TemplateRepoItem, tags: list[str]) -> bool:
+    lowered_tags = {t.lower() for t in template.tags}
+    return any(t.lower() in lowered_tags for t in tags)
+
+
+def load_templates_lock(lock_file: Path) -> TemplatesLockModel:
+    """ Load templates lock file (empty lock when the file is not present) """
+    import click
+    import yaml
+    if not lock_file.exists():
+        return TemplatesLockModel()
+    try:
+        return TemplatesLockModel(**(yaml.safe_load(lock_file.read_text(encoding="utf-8")) or {}))
+    except Exception as e:
+        raise click.ClickException(f"Failed to load templates lock file {lock_file}: {e}")
+
+
+def update_templates_lock(lock_file: Path, installed: list[TemplateRepoItem]):
+    """ Pin installed remote templates (id, version, folder_checksum) in the templates lock file """
+    import yaml
+    lock = load_templates_lock(lock_file)
+    templates = {item.id: item for item in lock.templates}
+    for item in installed:
+        templates[item.id] = TemplateLockItem(id=item.id, version=item.version, folder_checksum=item.folder_checksum)
+    lock.templates = sorted(templates.values(), key=lambda item: item.id)
+    lock_file.parent.mkdir(parents=True, exist_ok=True)
+    lock_file.write_text(yaml.safe_dump(lock.model_dump(), sort_keys=False), encoding="utf-8")
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def template_file_hashes(folder: Path) -> dict[str, str]:
+    """ sha256 of template files by relative path (venv, __pycache__ and install metadata are skipped) """
+    hashes = {}
+    for p in iter_files(folder):
+        rel = p.relative_to(folder)
+        if SKIPPED_TEMPLATE_DIRS.intersection(rel.parts[:-1]) or rel.as_posix() == TEMPLATE_META_FILE_NAME:
+            continue
+        hashes[rel.as_posix()] = file_sha256(p)
+    return hashes
+
+
+def load_template_meta(folder: Path) -> dict | None:
+    """ Template install metadata (source and installed files hashes), None when not present """
+    import json
+    try:
+        return json.loads((folder / TEMPLATE_META_FILE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save_template_meta(folder: Path, source: dict, files: dict[str, str], version: str = None):
+    import json
+    import os
+    from datetime import datetime, timezone
+    meta_file = folder / TEMPLATE_META_FILE_NAME
+    tmp_file = meta_file.with_name(f"{meta_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps({"source": source, "version": version,
+                                    "installed_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                                    "files": files}, indent=2), encoding="utf-8")
+    os.replace(tmp_file, meta_file)
@@ -9,29 +9,124 @@ import click
 
 from prich.constants import PRICH_DIR_NAME
 from prich.core.loaders import get_loaded_templates, get_loaded_config, get_loaded_template
-from prich.core.utils import console_print, is_valid_template_id, get_prich_dir, get_prich_templates_dir, shorten_path
+from prich.core.utils import console_print, is_valid_template_id, get_prich_dir, get_prich_templates_dir, shorten_path, \
+    get_home_dir
 from prich.cli.venv_utils import install_template_python_dependencies
-from prich.cli.template_utils import directory_hash
+from prich.cli.template_utils import directory_hash, OrderedDirectoryHasher, save_template_meta, template_file_hashes
 from prich.models.template import TemplateModel, VariableDefinition, LLMStep
 
+DOWNLOAD_WORKERS = 8
+DOWNLOAD_RETRIES = 3
+DOWNLOAD_TIMEOUT = 30  # seconds, connect and read timeout
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+def _http_session(pool_size: int = DOWNLOAD_WORKERS):
+    """ requests session with a connection pool shared by concurrent downloads """
+    import requests
+    from requests.adapters import HTTPAdapter
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
 def _download_zip(url: str) -> Path:
-    """ Download zip file into temporary file and return path to it """
-    import tempfile
+    """ Download zip file into temporary file and return path to it, interrupted downloads are resumed on the next run """
+    import hashlib
+    partial_file = get_home_dir() / PRICH_DIR_NAME / "cache" / "downloads" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]}.zip.part"
+    _download_file(url, partial_file, resume=True)
     with tempfile.NamedTemporaryFile(delete=False, suffix=".zip") as tmp:
-        return _download_file(url, tmp.name)
-
-def _download_file(url: str, dest_file: str | Path) -> Path:
+        zip_file = Path(tmp.name)
+    shutil.move(partial_file, zip_file)
+    return zip_file
+
+def _download_file(url: str, dest_file: str | Path, session=None, on_chunk=None, on_restart=None, resume: bool = False,
+                   retries: int = DOWNLOAD_RETRIES) -> Path:
+    """
+    Download url (or copy local mirror file) into dest_file, streamed chunks are passed to on_chunk.
+
+    Interrupted downloads are retried continuing from the received size with HTTP Range (If-Range keeps the same
+    file version), on_restart is called when the server sends the whole file again. resume continues the present dest_file.
+    """
+    import time
     import requests
     if isinstance(dest_file, str):
         dest_file = Path(dest_file)
     dest_file.parent.mkdir(parents=True, exist_ok=True)
-    response = requests.get(url, stream=True)
-    response.raise_for_status()
-    with open(dest_file, "wb") as save_to_file:
-        for chunk in response.iter_content(chunk_size=8192):
-            save_to_file.write(chunk)
-        save_to_file.flush()
-    return dest_file
+    if not url.startswith(("http://", "https://")):
+        # local templates repository mirror
+        with open(Path(url[len("file://"):] if url.startswith("file://") else url).expanduser(), "rb") as src_file, \
+                open(dest_file, "wb") as save_to_file:
+            while chunk := src_file.read(DOWNLOAD_CHUNK_SIZE):
+                save_to_file.write(chunk)
+                if on_chunk:
+                    on_chunk(chunk)
+        return dest_file
+    session = session or requests
+    validator_file = dest_file.with_name(dest_file.name + ".validator")
+    validator = validator_file.read_text() if resume and validator_file.exists() else None
+    if not resume or not validator:
+        dest_file.unlink(missing_ok=True)
+    for attempt in range(retries + 1):
+        offset = dest_file.stat().st_size if dest_file.exists() else 0
+        headers = {"Range": f"bytes={offset}-", "If-Range": validator} if offset and validator else {}
+        try:
+            with session.get(url, stream=True, headers=headers, timeout=DOWNLOAD_TIMEOUT) as response:
+                if offset and response.status_code == 416:
+                    # partial file doesn't match the remote one, download it again
+                    dest_file.unlink(missing_ok=True)
+                    validator = None
+                    if on_restart:
+                        on_restart()
+                    continue
+                response.raise_for_status()
+                if offset and response.status_code != 206:
+                    # server sent the whole file (changed or no ranges support)
+                    offset = 0
+                    if on_restart:
+                        on_restart()
+                validator = response.headers.get("ETag") or response.headers.get("Last-Modified") or validator
+                if resume and validator:
+                    validator_file.write_text(validator)
+                with open(dest_file, "ab" if offset else "wb") as save_to_file:
+                    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        save_to_file.write(chunk)
+                        if on_chunk:
+                            on_chunk(chunk)
+            validator_file.unlink(missing_ok=True)
+            return dest_file
+        except requests.HTTPError as e:
+            if attempt == retries or e.response is None or e.response.status_code < 500:
+                raise
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError):
+            if attempt == retries:
+                raise
+        time.sleep(min(0.5 * 2 ** attempt, 5))
+    # the last attempt restarted the download (416)
+    raise requests.HTTPError(f"Failed to download {url}: download restarted too many times")
+
+def _download_files(downloads: list[tuple], workers: int = DOWNLOAD_WORKERS):
+    """
+    Download (url, dest file, relative path, hasher) items concurrently over one connection pool,
+    files are hashed while streamed by their OrderedDirectoryHasher (optional).
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    workers = max(min(workers, len(downloads)), 1)
+    session = _http_session(workers)
+
+    def download(url: str, dest_file: Path, rel: str, hasher: OrderedDirectoryHasher = None):
+        _download_file(url, dest_file, session=session,
+                       on_chunk=(lambda chunk: hasher.update(rel, chunk)) if hasher else None,
+                       on_restart=(lambda: hasher.restart(rel)) if hasher else None)
+        if hasher:
+            hasher.complete(rel)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prich-download") as executor:
+            for future in [executor.submit(download, *item) for item in downloads]:
+                future.result()
+    finally:
+        session.close()
 
 def _extract_zip(path: Path) -> Path:
     """ Extract zip archive into temporary folder and return path of it """
@@ -60,73 +155,157 @@ def check_if_dest_present(template_id: str, dest_folder: Path, global_install: b
             f"Template '{template_id}' already exists in {scope} directory ({shorten_path(str(dest_folder))}). Use --force to overwrite.")
 
 
+def _install_lock():
+    """ Host-wide install lock, concurrent installs (ex. into the shared venv) wait for each other """
+    from prich.core.file_lock import file_lock
+    return file_lock(get_home_dir() / PRICH_DIR_NAME / "locks" / "install.lock",
+                     on_wait=lambda: console_print("[dim]Waiting for another prich install to finish...[/dim]"))
+
+
+def _download_remote_templates(templates_manifest, templates_to_install: list, console) -> dict:
+    """ Download remote templates files concurrently (all templates at once), returns template id: downloaded folder """
+    remote_templates_repo_path = templates_manifest.templates_download_path
+    downloads = []
+    folders = {}
+    hashers = {}
+    for template_to_install in templates_to_install:
+        tmp_path = Path(tempfile.mkdtemp())
+        folders[template_to_install.id] = tmp_path
+        hashers[template_to_install.id] = OrderedDirectoryHasher(template_to_install.files)
+        downloads.extend((f"{remote_templates_repo_path}/{template_to_install.id}/{file_to_download}",
+                          tmp_path / file_to_download, file_to_download, hashers[template_to_install.id])
+                         for file_to_download in template_to_install.files)
+    try:
+        with console.status("Downloading..."):
+            _download_files(downloads)
+    except Exception as e:
+        for tmp_path in folders.values():
+            safe_remove(tmp_path)
+        raise click.ClickException(f"Failed to download remote template files: {str(e)}")
+    mismatches = []
+    for template_to_install in templates_to_install:
+        hasher = hashers[template_to_install.id]
+        # folder checksum is computed while downloading, files are read again only when a download was restarted
+        downloaded_template_hash = hasher.hexdigest() if hasher.valid else directory_hash(folders[template_to_install.id])[0]
+        if downloaded_template_hash != template_to_install.folder_checksum:
+            mismatches.append(f"Downloaded template {template_to_install.id} folder checksum {downloaded_template_hash} doesn't match the manifest one {template_to_install.folder_checksum}.")
+    if mismatches:
+        # nothing is installed when any of the templates doesn't match the manifest
+        for tmp_path in folders.values():
+            safe_remove(tmp_path)
+        raise click.ClickException("\n".join(mismatches))
+    return folders
+
+
+def _install_remote_templates(template_ids: list, install_all: bool, tags: tuple, force: bool, no_venv: bool,
+                              global_install: bool, console):
+    """ Install templates from the remote templates repository (one manifest fetch, parallel downloads) """
+    from prich.cli.template_utils import get_remote_prich_templates_manifest, has_any_tag, update_templates_lock, \
+        TEMPLATES_LOCK_FILE_NAME
+    templates_dir = get_prich_templates_dir(global_install)
+    for template_id in template_ids:
+        if not is_valid_template_id(template_id):
+            raise click.ClickException(f"Remote Template ID {template_id} is not valid.")
+        check_if_dest_present(template_id, templates_dir / template_id, global_install, force)
+
+    try:
+        with console.status("Fetching templates manifest..."):
+            templates_manifest = get_remote_prich_templates_manifest()
+    except Exception as e:
+        raise click.ClickException(f"Failed to fetch remote templates repository manifest: {str(e)}")
+    templates_to_install = []
+    if install_all or tags:
+        for template_to_install in templates_manifest.templates:
+            if tags and not has_any_tag(template_to_install, tags):
+                continue
+            if (templates_dir / template_to_install.id).exists() and not force:
+                console_print(f"[dim]Template {template_to_install.id} is already installed, skipped (use --force to reinstall).[/dim]")
+                continue
+            templates_to_install.append(template_to_install)
+        if not templates_to_install:
+            console_print(f"[yellow]No templates to install{f' with tags: {chr(44).join(tags)}' if tags else ''}.[/yellow]")
+            return
+    for template_id in template_ids:
+        found = [x for x in templates_manifest.templates if x.id == template_id]
+        if not found:
+            raise click.ClickException(f"Remote Template ID {template_id} not found in the repository {templates_manifest.repository}.")
+        if found[0] not in templates_to_install:
+            templates_to_install.append(found[0])
+
+    with _install_lock():
+        folders = _download_remote_templates(templates_manifest, templates_to_install, console)
+        installed = []
+        try:
+            for template_to_install in templates_to_install:
+                _install_template_source(str(folders[template_to_install.id]), True, force, no_venv, global_install, console,
+                                         source={"type": "remote", "id": template_to_install.id})
+                installed.append(template_to_install)
+        finally:
+            # downloaded folders of not installed templates are left when an install fails
+            for tmp_path in folders.values():
+                safe_remove(tmp_path)
+            if installed:
+                update_templates_lock(get_prich_dir(global_install) / TEMPLATES_LOCK_FILE_NAME, installed)
+
+
 @click.command("install")
-@click.argument("path")
+@click.argument("paths", nargs=-1)
 @click.option("--force", is_flag=True, help="Overwrite existing templates")
 @click.option("--no-venv", is_flag=True, help="Skip venv setup")
 @click.option("-g", "--global", "global_install", is_flag=True, help=f"Install to ~/{PRICH_DIR_NAME}/templates")
 @click.option("-r", "--remote", "from_remote", is_flag=True, help="Install template from prich-templates GitHub repo or zip URL")
-def template_install(path: str, force: bool, no_venv: bool, global_install: bool, from_remote: bool):
-    """Install a template from PATH, zip, or prich-templates."""
+@click.option("--all", "install_all", is_flag=True, help="Install all remote templates (with --remote)")
+@click.option("-t", "--tag", "tags", multiple=True, help="Install remote templates with tag (with --remote, ex. '-t code -t review')")
+def template_install(paths: tuple, force: bool, no_venv: bool, global_install: bool, from_remote: bool, install_all: bool, tags: tuple):
+    """Install templates from PATHS, zip, or prich-templates (remote template ids)."""
     from rich.console import Console
-    from prich.cli.template_utils import get_remote_prich_templates_manifest
     console = Console()
-    templates_dir = get_prich_templates_dir(global_install)
-    src_dir = None
-    remove_source = False
-
-    if from_remote:
-        if path.startswith("http://") or path.startswith("https://"):
+    if (install_all or tags) and not from_remote:
+        raise click.ClickException("Options --all and --tag are supported only with --remote, use: 'prich install -r --all'")
+    if not paths and not install_all and not tags:
+        raise click.ClickException("Specify template path, zip file or remote template ids, use: 'prich install ./template-folder' or 'prich install -r <template_id>'")
+    if install_all and (paths or tags):
+        raise click.ClickException("Option --all doesn't combine with template ids or tags.")
+
+    remote_urls = [path for path in paths if path.startswith(("http://", "https://"))] if from_remote else []
+    remote_ids = [path for path in paths if path not in remote_urls] if from_remote else []
+    with _install_lock():
+        for path in remote_urls:
             # Install from remote archive file
             if not path.endswith(".zip"):
                 raise click.ClickException("Remote URL should point to a zip file.")
-            from_url = path
-
             try:
                 tmp_zip_file = None
-                with console.status(f"Downloading {path} from {from_url}..."):
-                    tmp_zip_file = _download_zip(
-                        url=from_url
-                    )
+                with console.status(f"Downloading {path}..."):
+                    tmp_zip_file = _download_zip(url=path)
             except Exception:
                 if tmp_zip_file and tmp_zip_file.exists():
                     safe_remove(tmp_zip_file)
                 raise click.ClickException(
                     f"Failed to download template {path}, check if the template is available in the remote.")
-            path = str(tmp_zip_file)
-
-        else:
-            # Install from remote repo by id
-            if not is_valid_template_id(path):
-                raise click.ClickException(f"Remote Template ID {path} is not valid.")
-            check_if_dest_present(path, templates_dir / path, global_install, force)
-
             try:
-                with console.status("Fetching templates manifest..."):
-                    templates_manifest = get_remote_prich_templates_manifest()
-            except Exception as e:
-                raise click.ClickException(f"Failed to fetch remote templates repository manifest: {str(e)}")
-            if path not in [x.id for x in templates_manifest.templates]:
-                raise click.ClickException(f"Remote Template ID {path} not found in the repository {templates_manifest.repository}.")
-            template_to_install = [x for x in templates_manifest.templates if x.id == path][0]
-            tmp_path = Path(tempfile.mkdtemp())
-            try:
-                with console.status("Downloading..."):
-                    for file_to_download in template_to_install.files:
-                        remote_templates_repo_path = templates_manifest.templates_download_path
-                        download_to_file = tmp_path / file_to_download
-                        _download_file(f"{remote_templates_repo_path}/{template_to_install.id}/{file_to_download}", download_to_file)
-            except Exception as e:
-                raise click.ClickException(f"Failed to download remote template files: {str(e)}")
-            downloaded_template_hash, files = directory_hash(tmp_path)
-            if downloaded_template_hash != template_to_install.folder_checksum:
-                console_print("[yellow]Downloaded template folder checksum is not matching with mentioned in the manifest![/yellow]")
-                console_print(f"[yellow]From the manifest: {template_to_install.folder_checksum}[/yellow]")
-                console_print(f"[yellow]Downloaded files : {downloaded_template_hash}[/yellow]")
-            path = str(tmp_path)
-
-        remove_source = True
-
+                _install_template_source(str(tmp_zip_file), True, force, no_venv, global_install, console,
+                                         source={"type": "url", "url": path})
+            finally:
+                safe_remove(tmp_zip_file)
+        for path in paths if not from_remote else []:
+            _install_template_source(path, False, force, no_venv, global_install, console)
+    if remote_ids or install_all or tags:
+        _install_remote_templates(remote_ids, install_all, tags, force, no_venv, global_install, console)
+
+
+def _install_template_source(path: str, remove_source: bool, force: bool, no_venv: bool, global_install: bool, console,
+                             source: dict = None) -> TemplateModel:
+    """
+    Install template from folder or zip file path, remove_source removes the source after installation.
+
+    source - where the template comes from (saved in the template install metadata and used by 'prich update'),
+    the folder or zip file path by default.
+    """
+    templates_dir = get_prich_templates_dir(global_install)
+    src_dir = None
+    if not source:
+        source = {"type": "zip" if path.endswith(".zip") else "folder", "path": str(Path(path).resolve())}
     if path.endswith(".zip"):
         # Install from archive
         try:
@@ -184,6 +363,8 @@ def template_install(path: str, force: bool, no_venv: bool, global_install: bool
     template_files.sort()
     for template_file in template_files:
         console_print(f" + {str(template_file).replace(str(template_folder), '.')}")
+    save_template_meta(template_folder, source, template_file_hashes(src_dir), version=template.version)
+    _compile_template_scripts(template_folder)
 
     sh_files = list((template_folder / "scripts").glob("**/*.sh"))
     if sh_files:
@@ -211,19 +392,33 @@ def template_install(path: str, force: bool, no_venv: bool, global_install: bool
     console_print()
     console_print(f"Template [green]{template_id}[/green] installed successfully.")
     console_print(f"Run: [cyan]prich[/cyan] run [green]{template_id}[/green]{' -g' if global_install else ''} --help")
+    return template
+
+
+def _compile_template_scripts(template_folder: Path):
+    """ Byte-compile template python scripts (__pycache__ is used by imports and python step workers) """
+    import compileall
+    import re
+    scripts_folder = template_folder / "scripts"
+    if scripts_folder.is_dir():
+        compileall.compile_dir(scripts_folder, quiet=2, rx=re.compile(r"[/\\]venv[/\\]"))
 
 
 def install_template_venv(template: TemplateModel, template_base: Path = None, force: bool = False):
     """Install Python venv for a template"""
-    from prich.cli.venv_utils import install_python_venv
+    from prich.cli.venv_utils import install_python_venv, link_pooled_venv
 
     if not template_base:
         template_base = Path(template.folder)
     scripts_folder = template_base / "scripts"
     if template.venv == "isolated":
         template_venv = scripts_folder / "venv"
-        install_python_venv(template_venv, force=force, venv_type="isolated")
-        install_template_python_dependencies(template_venv, template_base)
+        if template_venv.is_dir() and not template_venv.is_symlink() and not force:
+            # venv installed before the venvs pool
+            install_python_venv(template_venv, venv_type="isolated")
+            install_template_python_dependencies(template_venv, template_base)
+        else:
+            link_pooled_venv(template_venv, scripts_folder / "requirements.txt", force=force)
         console_print("[green]Done![/green]")
     elif template.venv == "shared":
         prich_dir = get_prich_dir()
@@ -244,7 +439,253 @@ def install_template_venv(template: TemplateModel, template_base: Path = None, f
 def venv_install(template_id, global_only, force):
     """Install venv for Template with python script steps"""
     template = get_loaded_template(template_id)
-    install_template_venv(template=template, force=force)
+    with _install_lock():
+        install_template_venv(template=template, force=force)
+
+
+@click.command("venv-gc")
+@click.option("--dry-run", is_flag=True, help="Only list unreferenced venvs")
+def venv_gc(dry_run: bool):
+    """Remove pooled venvs not used by any installed template"""
+    from prich.cli.venv_utils import gc_pooled_venvs, get_venv_pool_dir
+    removed = gc_pooled_venvs(dry_run=dry_run)
+    for venv_folder in removed:
+        console_print(f"- {shorten_path(str(venv_folder))}")
+    if not removed:
+        console_print(f"No unreferenced venvs in {shorten_path(str(get_venv_pool_dir()))}.")
+    else:
+        console_print(f"{'Found' if dry_run else 'Removed'} {len(removed)} unreferenced venvs.")
+
+
+@click.command("sync")
+@click.option("-g", "--global", "global_install", is_flag=True, help=f"Sync ~/{PRICH_DIR_NAME}/templates with ~/{PRICH_DIR_NAME}/templates.lock")
+@click.option("--no-venv", is_flag=True, help="Skip venv setup")
+@click.option("--lock-file", type=click.Path(dir_okay=False, path_type=Path), default=None,
+              help=f"Templates lock file ({PRICH_DIR_NAME}/templates.lock by default)")
+def templates_sync(global_install: bool, no_venv: bool, lock_file: Path):
+    """Install remote templates pinned in the templates lock file, up to date templates are skipped."""
+    from rich.console import Console
+    from prich.cli.template_utils import get_remote_prich_templates_manifest, load_templates_lock, TEMPLATES_LOCK_FILE_NAME
+    console = Console()
+    lock_file = lock_file or get_prich_dir(global_install) / TEMPLATES_LOCK_FILE_NAME
+    if not lock_file.exists():
+        raise click.ClickException(f"Templates lock file {shorten_path(str(lock_file))} not found, it is created by 'prich install -r <template_id>'.")
+    lock = load_templates_lock(lock_file)
+    if not lock.templates:
+        console_print(f"[yellow]No templates in {shorten_path(str(lock_file))}.[/yellow]")
+        return
+    try:
+        with console.status("Fetching templates manifest..."):
+            templates_manifest = get_remote_prich_templates_manifest()
+    except Exception as e:
+        raise click.ClickException(f"Failed to fetch remote templates repository manifest: {str(e)}")
+    remote_templates = {x.id: x for x in templates_manifest.templates}
+    issues = []
+    for locked in lock.templates:
+        remote_template = remote_templates.get(locked.id)
+        if not remote_template:
+            issues.append(f"Template {locked.id} not found in the repository {templates_manifest.repository}.")
+        elif remote_template.folder_checksum != locked.folder_checksum:
+            issues.append(f"Template {locked.id} {locked.version} is not available in the repository (available {remote_template.version}), update it with 'prich install -r {locked.id} --force'.")
+    if issues:
+        raise click.ClickException("\n".join(issues))
+
+    templates_dir = get_prich_templates_dir(global_install)
+    templates_to_install = []
+    for locked in lock.templates:
+        template_folder = templates_dir / locked.id
+        if template_folder.exists() and directory_hash(template_folder, remote_templates[locked.id].files)[0] == locked.folder_checksum:
+            console_print(f"- {locked.id} [dim]({locked.version}) is up to date[/dim]")
+        else:
+            templates_to_install.append(remote_templates[locked.id])
+    if templates_to_install:
+        with _install_lock():
+            folders = _download_remote_templates(templates_manifest, templates_to_install, console)
+            for template_to_install in templates_to_install:
+                # modified or partially installed template is replaced
+                safe_remove(templates_dir / template_to_install.id)
+                _install_template_source(str(folders[template_to_install.id]), True, False, no_venv, global_install, console,
+                                         source={"type": "remote", "id": template_to_install.id})
+    console_print()
+    console_print(f"Synced {len(lock.templates)} templates, {len(templates_to_install)} installed, {len(lock.templates) - len(templates_to_install)} up to date.")
+
+def _verify_remote_update(template_id: str, remote_template, src_dir: Path, template_folder: Path, downloaded: set) -> dict[str, str]:
+    """
+    Check downloaded files against the manifest files checksums and the updated template files (downloaded and
+    kept installed ones) against the folder checksum, returns files hashes by relative path.
+    """
+    import hashlib
+
+    file_checksums = remote_template.file_checksums or {}
+    hasher = OrderedDirectoryHasher(remote_template.files)
+    new_files = {}
+    mismatched = []
+    for rel in remote_template.files:
+        file_hash = hashlib.sha256()
+        with open(src_dir / rel if rel in downloaded else template_folder / rel, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                file_hash.update(chunk)
+                hasher.update(rel, chunk)
+        hasher.complete(rel)
+        new_files[rel] = file_hash.hexdigest()
+        if file_checksums.get(rel) is not None and file_checksums.get(rel) != new_files[rel]:
+            mismatched.append(rel)
+    if mismatched:
+        raise click.ClickException(f"Downloaded template {template_id} files don't match the manifest checksums: {', '.join(mismatched)}.")
+    if hasher.hexdigest() != remote_template.folder_checksum:
+        raise click.ClickException(f"Updated template {template_id} folder checksum {hasher.hexdigest()} doesn't match the manifest one {remote_template.folder_checksum}.")
+    return new_files
+
+
+def _update_template(template_folder: Path, meta: dict, get_manifest, no_venv: bool, console) -> tuple[list[str], list[str]]:
+    """
+    Update installed template from its source (install metadata), only changed files are replaced.
+
+    Changed files are staged next to the installed ones and moved in place with os.replace, files removed
+    from the source are deleted, returns (changed, removed) files.
+    """
+    from prich.core.loaders import load_template_model
+
+    template_id = template_folder.name
+    source = meta.get("source") or {}
+    installed = template_file_hashes(template_folder)
+    version = None
+    tmp_paths = []
+    try:
+        if source.get("type") == "remote":
+            templates_manifest = get_manifest()
+            remote_template = next((x for x in templates_manifest.templates if x.id == source.get("id")), None)
+            if not remote_template:
+                raise click.ClickException(f"Template {template_id} not found in the repository {templates_manifest.repository}.")
+            version = remote_template.version
+            removed = sorted(rel for rel in meta.get("files", {}) if rel not in remote_template.files and rel in installed)
+            if not removed and directory_hash(template_folder, remote_template.files)[0] == remote_template.folder_checksum:
+                return [], []
+            # only changed files are downloaded when the manifest has files checksums
+            file_checksums = remote_template.file_checksums or {}
+            to_download = [rel for rel in remote_template.files
+                           if file_checksums.get(rel) is None or installed.get(rel) != file_checksums.get(rel)]
+            src_dir = Path(tempfile.mkdtemp())
+            tmp_paths.append(src_dir)
+            try:
+                with console.status(f"Downloading {template_id}..."):
+                    _download_files([(f"{templates_manifest.templates_download_path}/{template_id}/{rel}", src_dir / rel, rel, None)
+                                     for rel in to_download])
+            except Exception as e:
+                raise click.ClickException(f"Failed to download remote template files: {str(e)}")
+            new_files = _verify_remote_update(template_id, remote_template, src_dir, template_folder, set(to_download))
+        elif source.get("type") in ["zip", "url"]:
+            try:
+                zip_file = _download_zip(source["url"]) if source["type"] == "url" else Path(source["path"])
+                if source["type"] == "url":
+                    tmp_paths.append(zip_file)
+                src_dir = _extract_zip(zip_file)
+                tmp_paths.append(src_dir)
+            except Exception as e:
+                raise click.ClickException(f"Failed to get template {template_id} source {source.get('url') or source.get('path')}: {e}")
+            new_files = template_file_hashes(src_dir)
+        elif source.get("type") == "folder":
+            src_dir = Path(source["path"])
+            if not src_dir.is_dir():
+                raise click.ClickException(f"Template {template_id} source folder {shorten_path(str(src_dir))} not found.")
+            new_files = template_file_hashes(src_dir)
+        else:
+            raise click.ClickException(f"Template {template_id} source is unknown, reinstall it with 'prich install --force'.")
+
+        changed = sorted(rel for rel, file_hash in new_files.items() if installed.get(rel) != file_hash)
+        removed = sorted(rel for rel in meta.get("files", {}) if rel not in new_files and rel in installed)
+        staged = []
+        try:
+            for rel in changed:
+                dest_file = template_folder / rel
+                dest_file.parent.mkdir(parents=True, exist_ok=True)
+                staged_file = dest_file.with_name(f".{dest_file.name}.prich-update")
+                shutil.copy2(src_dir / rel, staged_file)
+                staged.append((staged_file, dest_file))
+        except OSError as e:
+            for staged_file, _ in staged:
+                safe_remove(staged_file)
+            raise click.ClickException(f"Failed to update template {template_id}: {e}")
+        for staged_file, dest_file in staged:
+            os.replace(staged_file, dest_file)
+        for rel in removed:
+            safe_remove(template_folder / rel)
+    finally:
+        for tmp_path in tmp_paths:
+            safe_remove(tmp_path)
+
+    template = load_template_model(template_folder / f"{template_id}.yaml")
+    save_template_meta(template_folder, source, new_files, version=version or template.version)
+    if changed:
+        _compile_template_scripts(template_folder)
+    if not no_venv and template.venv and (changed or removed):
+        venv_folder = template_folder / "scripts" / "venv" if template.venv == "isolated" else get_prich_dir() / "venv"
+        requirements_changed = "scripts/requirements.txt" in changed or "scripts/requirements.txt" in removed
+        if not venv_folder.exists() or (venv_folder.is_symlink() and requirements_changed):
+            # pooled venvs are shared by the requirements hash, the template is linked to another one
+            install_template_venv(template=template, template_base=template_folder)
+        elif requirements_changed:
+            install_template_python_dependencies(venv_folder, template_folder)
+        else:
+            console_print("[dim]requirements.txt is not changed, venv dependencies installation skipped.[/dim]")
+    return changed, removed
+
+
+@click.command("update")
+@click.argument("template_ids", nargs=-1)
+@click.option("-g", "--global", "global_install", is_flag=True, help=f"Update templates in ~/{PRICH_DIR_NAME}/templates")
+@click.option("--no-venv", is_flag=True, help="Skip venv dependencies installation")
+def templates_update(template_ids: tuple, global_install: bool, no_venv: bool):
+    """Update installed templates from their install sources, only changed files are replaced."""
+    from rich.console import Console
+    from prich.cli.template_utils import get_remote_prich_templates_manifest, load_template_meta, update_templates_lock, \
+        TEMPLATES_LOCK_FILE_NAME
+    console = Console()
+    templates_dir = get_prich_templates_dir(global_install)
+    if template_ids:
+        template_folders = [templates_dir / template_id for template_id in template_ids]
+        for template_folder in template_folders:
+            if not template_folder.is_dir():
+                raise click.ClickException(f"Template {template_folder.name} is not installed in {shorten_path(str(templates_dir))}.")
+    else:
+        template_folders = sorted(folder for folder in templates_dir.iterdir() if folder.is_dir()) if templates_dir.exists() else []
+
+    manifest = None
+
+    def get_manifest():
+        # remote templates are resolved against one manifest fetch
+        nonlocal manifest
+        if manifest is None:
+            try:
+                with console.status("Fetching templates manifest..."):
+                    manifest = get_remote_prich_templates_manifest()
+            except Exception as e:
+                raise click.ClickException(f"Failed to fetch remote templates repository manifest: {str(e)}")
+        return manifest
+
+    updated = []
+    with _install_lock():
+        for template_folder in template_folders:
+            meta = load_template_meta(template_folder)
+            if not meta:
+                console_print(f"- {template_folder.name}: [yellow]no install metadata, reinstall it with 'prich install --force' to enable updates[/yellow]")
+                continue
+            changed, removed = _update_template(template_folder, meta, get_manifest, no_venv, console)
+            if changed or removed:
+                updated.append(template_folder.name)
+                console_print(f"- {template_folder.name}: [green]updated[/green] [dim]({len(changed)} changed, {len(removed)} removed)[/dim]")
+                for rel in changed:
+                    console_print(f"  [dim]~ {rel}[/dim]")
+                for rel in removed:
+                    console_print(f"  [dim]- {rel}[/dim]")
+            else:
+                console_print(f"- {template_folder.name}: [dim]up to date[/dim]")
+        remote_updated = [x for x in manifest.templates if x.id in updated] if manifest else []
+        if remote_updated:
+            update_templates_lock(get_prich_dir(global_install) / TEMPLATES_LOCK_FILE_NAME, remote_updated)
+    console_print()
+    console_print(f"Updated {len(updated)} of {len(template_folders)} templates.")
+
 
 @click.command("show")
 @click.argument("template_id")
@@ -0,0 +1,58 @@
+import sys
+import click
+from prich.core.utils import console_print
+
+
+def _print_result(result):
+    from rich.markup import escape
+    status_color = {"passed": "green", "failed": "red", "error": "red"}[result.status]
+    console_print(f"- {result.template_id} › {escape(result.name)}: [{status_color}]{result.status}[/{status_color}] [dim]({result.duration_ms} ms)[/dim]")
+    for failure in result.failures:
+        console_print(f"  [red]{escape(failure)}[/red]")
+
+
+@click.command("test")
+@click.argument("template_ids", nargs=-1)
+@click.option("-j", "--jobs", type=click.IntRange(1), default=4, show_default=True, help="Test cases running in parallel")
+@click.option("-g", "--global", "global_only", is_flag=True, default=False, help="Only global config and templates")
+@click.option("-l", "--local", "local_only", is_flag=True, default=False, help="Only local config and templates")
+@click.option("--junit", "junit_file", type=click.Path(dir_okay=False), default=None, help="Save JUnit XML report to file")
+@click.option("--json", "json_only", is_flag=True, default=False, help="Output results in json format")
+def run_tests(template_ids: tuple, jobs: int, global_only: bool, local_only: bool, junit_file: str, json_only: bool):
+    """Run template test cases (template folder tests/*.yaml files)."""
+    import time
+    from prich.core.run_context import RunContext
+    from prich.core.session import PrichSession
+    from prich.core.template_tests import load_template_tests, run_template_tests, junit_report
+
+    if global_only and local_only:
+        raise click.ClickException("Use only one local or global option, use: 'prich test -g' or 'prich test -l'")
+    session = PrichSession(run_context=RunContext(quiet=True, global_only=global_only, local_only=local_only))
+    templates = session.get_templates() if not template_ids else [session.get_template(template_id) for template_id in template_ids]
+    tests = []
+    for template in sorted(templates, key=lambda t: t.id):
+        tests.extend(load_template_tests(template))
+    if not tests:
+        console_print("[yellow]No template test cases found.[/yellow]")
+        sys.exit(1)
+
+    started = time.perf_counter()
+    results = run_template_tests(session, tests, jobs=jobs)
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    if junit_file:
+        with open(junit_file, "w", encoding="utf-8") as f:
+            f.write(junit_report(results))
+    failed_count = sum(1 for result in results if result.status != "passed")
+    if json_only:
+        import json
+        from dataclasses import asdict
+        click.echo(json.dumps({"results": [asdict(result) for result in results], "duration_ms": duration_ms}, indent=2))
+    else:
+        for result in results:
+            _print_result(result)
+        console_print()
+        templates_count = len({result.template_id for result in results})
+        console_print(f"Ran {len(results)} test cases of {templates_count} templates in {duration_ms} ms, "
+                      f"{'[red]' if failed_count else '[green]'}{len(results) - failed_count} passed, {failed_count} failed{'[/red]' if failed_count else '[/green]'}.")
+    if failed_count:
+        sys.exit(2)
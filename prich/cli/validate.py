@@ -5,7 +5,7 @@ import click
 import yaml
 from pydantic import ValidationError as PydanticValidationError
 from prich.constants import PRICH_DIR_NAME
-from prich.models.template import CommandStep, PythonStep
+from prich.models.template import CommandStep, PythonStep, CommandPipelineStep
 from prich.core.file_scope import classify_path, normalize_path
 from prich.core.loaders import find_template_files, load_template_model, get_env_vars, _load_yaml
 from prich.core.utils import console_print, shorten_path, get_prich_dir, is_just_filename, get_cwd_dir, get_home_dir
@@ -86,7 +86,7 @@ def template_model_doctor(template_yaml: dict, model_load_error: PydanticValidat
                         "Store And Show Output: https://oleks-dev.github.io/prich/reference/template/steps/#store-and-show-output")
                     doc_items.append(
                         "Output Text Transformations: https://oleks-dev.github.io/prich/reference/template/steps/#output-text-transformations")
-                if details and details in ["llm", "pyhon", "command", "render"]:
+                if details and details in ["llm", "pyhon", "command", "pipeline", "render"]:
                     doc_items.append(
                         f"{details} step: https://oleks-dev.github.io/prich/reference/template/steps/#{details}-step")
                 doc_items.append("https://oleks-dev.github.io/prich/reference/template/steps/")
@@ -209,6 +209,12 @@ def validate_templates(template_id: str, validate_file: Path, global_only: bool,
                         else:
                             full_path = str(call_file)
                         failures_list.append(f"{len(failures_list)+1}. [red]Failed to find call {step.type} file {shorten_path(full_path)}[/red] for step #{idx} {step.name}")
+                elif isinstance(step, CommandPipelineStep):
+                    import shutil
+                    for command in step.commands:
+                        if not (Path(template.folder) / "scripts" / command.call).exists() and \
+                                not shutil.which(command.call, path=get_env_vars().get("PATH")):
+                            failures_list.append(f"{len(failures_list)+1}. [red]Failed to find pipeline command {command.call}[/red] for step #{idx} {step.name}")
             output.append(f"- {template.id} [dim]({template.source.value}) {shorten_path(str(template_file))}[/dim]: ")
             if len(failures_list) > 0:
                 failures_found = True
@@ -1,12 +1,20 @@
+import json
+import re
 import shutil
 import subprocess
+import sys
+import time
 import venv
 from pathlib import Path
 
 import click
 
 from prich.constants import PRICH_DIR_NAME
-from prich.core.utils import shorten_path, console_print
+from prich.core.utils import shorten_path, console_print, get_home_dir, get_prich_templates_dir
+
+VENV_POOL_DIR_NAME = "venvs"
+VENV_POOL_META_FILE_NAME = ".prich-venv.json"
+WHEELS_CACHE_DIR_NAME = "wheels"
 
 
 def install_python_venv(venv_folder: Path, force: bool = False, venv_type: str = ""):
@@ -22,22 +30,203 @@ def install_python_venv(venv_folder: Path, force: bool = False, venv_type: str =
         return
     console_print(f"Installing {venv_type} venv...", end="")
     try:
-        builder = venv.EnvBuilder(with_pip=True)
-        builder.create(venv_folder)
+        _create_venv(venv_folder)
     except Exception as e:
         console_print()
         raise click.ClickException(f"Failed to install {venv_type} venv: {str(e)}")
     console_print(" [green]done![/green]")
 
 
+def _create_venv(venv_folder: Path):
+    builder = venv.EnvBuilder(with_pip=True)
+    builder.create(venv_folder)
+
+
+def _run_pip(venv_folder: Path, args: list):
+    pip_cmd = venv_folder / "bin/pip"
+    if not pip_cmd.exists():
+        raise click.ClickException(f"No pip {shorten_path(str(pip_cmd))} found in venv.")
+    return subprocess.run([str(pip_cmd), *args], check=False)
+
+
 def install_template_python_dependencies(venv_folder: Path, template_folder: Path):
     src_requirements = template_folder / "scripts" / "requirements.txt"
     if src_requirements and src_requirements.exists():
         console_print("Installing dependencies:")
-        pip_cmd = venv_folder / "bin/pip"
-        if not pip_cmd.exists():
-            raise click.ClickException(f"No pip {shorten_path(str(pip_cmd))} found in venv.")
-        run_cmd = [pip_cmd, "install", "-r", str(src_requirements)]
-        subprocess.run(run_cmd, check=True)
+        started = time.perf_counter()
+        install_requirements(venv_folder, src_requirements)
+        console_print(f"[dim]Dependencies installed in {time.perf_counter() - started:.1f}s[/dim]")
     else:
         console_print("No dependencies to install.")
+
+
+def get_wheels_cache_dir() -> Path:
+    return get_home_dir() / PRICH_DIR_NAME / "cache" / WHEELS_CACHE_DIR_NAME
+
+
+def install_requirements(venv_folder: Path, requirements_file: Path):
+    """
+    Install requirements from the local wheels cache (works offline), missing wheels are built or downloaded
+    into the cache first
+    """
+    wheels_dir = get_wheels_cache_dir()
+    offline_args = ["install", "--no-index", "--find-links", str(wheels_dir), "-r", str(requirements_file)]
+    if wheels_dir.exists() and _run_pip(venv_folder, [*offline_args, "--quiet"]).returncode == 0:
+        console_print("[dim]Installed from the local wheels cache.[/dim]")
+        return
+    wheels_dir.mkdir(parents=True, exist_ok=True)
+    if _run_pip(venv_folder, ["wheel", "--wheel-dir", str(wheels_dir), "--find-links", str(wheels_dir),
+                              "-r", str(requirements_file)]).returncode != 0:
+        raise click.ClickException(f"Failed to build wheels for {shorten_path(str(requirements_file))}.")
+    if _run_pip(venv_folder, offline_args).returncode != 0:
+        raise click.ClickException(f"Failed to install {shorten_path(str(requirements_file))} dependencies.")
+
+
+def normalize_requirements(text: str) -> list[str]:
+    """ Requirements lines without comments, blank lines and spaces, package names lowercased with '-', sorted """
+    lines = set()
+    for line in text.splitlines():
+        line = re.sub(r"(^|\s)#.*$", "", line).strip()
+        if not line:
+            continue
+        if not line.startswith("-"):
+            line = re.sub(r"\s+", "", line)
+            name = re.match(r"[A-Za-z0-9._-]+", line)
+            if name:
+                line = re.sub(r"[-_.]+", "-", name.group(0)).lower() + line[name.end():]
+        lines.add(line)
+    return sorted(lines)
+
+
+def requirements_hash(requirements_file: Path | None) -> str:
+    """ Venv pool key: normalized requirements and python version """
+    import hashlib
+    text = requirements_file.read_text(encoding="utf-8") if requirements_file and requirements_file.exists() else ""
+    h = hashlib.sha256(f"{sys.implementation.name}-{sys.version_info.major}.{sys.version_info.minor}\n".encode())
+    h.update("\n".join(normalize_requirements(text)).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def get_venv_pool_dir() -> Path:
+    return get_home_dir() / PRICH_DIR_NAME / VENV_POOL_DIR_NAME
+
+
+def _venv_pool_lock(venv_hash: str):
+    from prich.core.file_lock import file_lock
+    return file_lock(get_venv_pool_dir() / f"{venv_hash}.lock",
+                     on_wait=lambda: console_print("[dim]Waiting for another prich venv install to finish...[/dim]"))
+
+
+def load_pooled_venv_meta(venv_folder: Path) -> dict | None:
+    """ Pooled venv metadata, None when the venv is not complete """
+    try:
+        return json.loads((venv_folder / VENV_POOL_META_FILE_NAME).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _save_pooled_venv_meta(venv_folder: Path, meta: dict):
+    import os
+    meta_file = venv_folder / VENV_POOL_META_FILE_NAME
+    tmp_file = meta_file.with_name(f"{meta_file.name}.{os.getpid()}.tmp")
+    tmp_file.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    os.replace(tmp_file, meta_file)
+
+
+def link_pooled_venv(link: Path, requirements_file: Path | None, force: bool = False) -> Path:
+    """
+    Link template venv (scripts/venv) to the pooled venv (~/.prich/venvs/<requirements hash>) shared by templates
+    with the same requirements, the pooled venv is built when not present (or with force).
+    """
+    from datetime import datetime, timezone
+    venv_hash = requirements_hash(requirements_file)
+    venv_folder = get_venv_pool_dir() / venv_hash
+    requirements = normalize_requirements(requirements_file.read_text(encoding="utf-8")) \
+        if requirements_file and requirements_file.exists() else []
+    with _venv_pool_lock(venv_hash):
+        meta = load_pooled_venv_meta(venv_folder)
+        # other templates linked to the venv stay linked when it is rebuilt
+        previous_links = meta.get("links", []) if meta else []
+        console_print(f"[dim]Pooled venv {shorten_path(str(venv_folder))}[/dim]")
+        if meta and not force:
+            console_print("Venv folder found.")
+            console_print("Dependencies are already installed." if requirements else "No dependencies to install.")
+        else:
+            if venv_folder.exists():
+                shutil.rmtree(venv_folder)
+            console_print("Installing isolated venv...", end="")
+            started = time.perf_counter()
+            try:
+                _create_venv(venv_folder)
+            except Exception as e:
+                console_print()
+                shutil.rmtree(venv_folder, ignore_errors=True)
+                raise click.ClickException(f"Failed to install isolated venv: {str(e)}")
+            create_s = round(time.perf_counter() - started, 1)
+            console_print(f" [green]done![/green] [dim]({create_s}s)[/dim]")
+            install_s = 0.0
+            if requirements:
+                console_print("Installing dependencies:")
+                started = time.perf_counter()
+                try:
+                    install_requirements(venv_folder, requirements_file)
+                except click.ClickException:
+                    shutil.rmtree(venv_folder, ignore_errors=True)
+                    raise
+                install_s = round(time.perf_counter() - started, 1)
+                console_print(f"[dim]Dependencies installed in {install_s}s[/dim]")
+            else:
+                console_print("No dependencies to install.")
+            meta = {"requirements": requirements, "python": f"{sys.version_info.major}.{sys.version_info.minor}",
+                    "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                    "create_seconds": create_s, "install_seconds": install_s, "links": previous_links}
+        links = {x for x in meta.get("links", []) if _is_linked(Path(x), venv_folder)}
+        if link.is_symlink() or link.is_file():
+            link.unlink()
+        elif link.exists():
+            shutil.rmtree(link)
+        link.parent.mkdir(parents=True, exist_ok=True)
+        link.symlink_to(venv_folder, target_is_directory=True)
+        links.add(str(link))
+        meta["links"] = sorted(links)
+        _save_pooled_venv_meta(venv_folder, meta)
+    return venv_folder
+
+
+def _is_linked(link: Path, venv_folder: Path) -> bool:
+    try:
+        return link.is_symlink() and link.resolve() == venv_folder.resolve()
+    except OSError:
+        return False
+
+
+def _installed_template_venv_links() -> list[Path]:
+    """ scripts/venv links of the templates installed in the local and global templates folders """
+    links = []
+    for global_only in [False, True]:
+        templates_dir = get_prich_templates_dir(global_only)
+        if templates_dir.is_dir():
+            links.extend(p / "scripts" / "venv" for p in templates_dir.iterdir() if (p / "scripts" / "venv").is_symlink())
+    return links
+
+
+def gc_pooled_venvs(dry_run: bool = False) -> list[Path]:
+    """
+    Remove pooled venvs not linked by any template venv (incomplete venvs included), returns removed venvs.
+
+    Links are taken from the pooled venvs metadata and the installed (local and global) templates venvs.
+    """
+    removed = []
+    pool_dir = get_venv_pool_dir()
+    if not pool_dir.exists():
+        return removed
+    installed_links = _installed_template_venv_links()
+    for venv_folder in sorted(p for p in pool_dir.iterdir() if p.is_dir()):
+        with _venv_pool_lock(venv_folder.name):
+            meta = load_pooled_venv_meta(venv_folder)
+            if meta and any(_is_linked(Path(x), venv_folder) for x in [*meta.get("links", []), *installed_links]):
+                continue
+            removed.append(venv_folder)
+            if not dry_run:
+                shutil.rmtree(venv_folder, ignore_errors=True)
+    return removed
@@ -2,8 +2,11 @@
 # and are not allowed to be user/defined in the template variables cli_option
 RESERVED_RUN_TEMPLATE_CLI_OPTIONS = [
     "-g", "--global", "-q", "--quiet", "-o", "--output", "-p", "--provider",
-    "-f", "--only-final-output", "-v", "--verbose"
+    "-f", "--only-final-output", "-v", "--verbose", "--record", "--replay", "--replay-timing"
 ]
 
 # .prich folder name
 PRICH_DIR_NAME = ".prich"
+
+# Remote templates repository manifest (prich-templates)
+TEMPLATES_MANIFEST_URL = "https://raw.githubusercontent.com/oleks-dev/prich-templates/main/templates/manifest.json"
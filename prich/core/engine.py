@@ -1,20 +1,33 @@
+import sys
+import time
 import click
-from typing import Dict
+from contextlib import nullcontext
+from typing import Dict, List
 
 from prich.core.template_utils import should_run_step
 from prich.core.steps.step_render_template import render_template
 from prich.core.steps.step_run_command import run_command_step
+from prich.core.steps.step_run_pipeline import run_pipeline_step
 from prich.core.steps.step_send_to_llm import send_to_llm
+from prich.core.stream_output import StreamedOutput
 
 from prich.models.template import LLMStep, PythonStep, RenderStep, \
-    CommandStep, ValidateStepOutput
+    CommandStep, CommandPipelineStep, ValidateStepOutput
 from prich.core.utils import console_print, is_quiet, is_only_final_output, \
-    is_verbose
+    is_verbose, print_plain, StreamWriter
 from prich.core.loaders import get_env_vars
+from prich.core.run_context import RunContext, get_run_context, use_run_context
+from prich.core.run_result import RunResult, StepResult
 from prich.core.variable_utils import replace_env_vars, expand_vars
 
-def validate_step_output(validate_step: ValidateStepOutput, value: str, variables: Dict[str, any]) -> bool:
+class TemplateInputError(click.ClickException):
+    """ Wrong template variables, raised before the template steps run """
+
+
+def validate_step_output(validate_step: ValidateStepOutput, value: str | StreamedOutput, variables: Dict[str, any]) -> bool:
     import re
+    if validate_step and (validate_step.match or validate_step.not_match):
+        value = str(value)
     matched = re.search(
         expand_vars([validate_step.match], variables=variables, env_vars=get_env_vars())[0],
         value
@@ -28,6 +41,15 @@ def validate_step_output(validate_step: ValidateStepOutput, value: str, variable
         return True  # validation passed
     return False
 
+def validate_step_exit_codes(validate_step: ValidateStepOutput, exit_codes: List[int], variables: Dict[str, any]) -> bool:
+    """ Pipeline commands exit codes validation (None expected exit code matches any) """
+    if len(validate_step.match_exit_codes) != len(exit_codes):
+        raise click.ClickException(f"Step validation 'match_exit_codes' should have {len(exit_codes)} exit codes (one per pipeline command).")
+    for expected, exit_code in zip(validate_step.match_exit_codes, exit_codes):
+        if expected is not None and exit_code != int(expand_vars([expected], variables=variables, env_vars=get_env_vars())[0]):
+            return False
+    return True
+
 def validate_step_exit_code(validate_step: ValidateStepOutput, exit_code: int, variables: Dict[str, any]) -> bool:
     try:
         if validate_step.match_exit_code is not None and exit_code != int(expand_vars([validate_step.match_exit_code], variables=variables, env_vars=get_env_vars())[0]):
@@ -38,11 +60,33 @@ def validate_step_exit_code(validate_step: ValidateStepOutput, exit_code: int, v
         raise click.ClickException(f"Failed to validate step exit code: {str(e)}")
     return True
 
-def run_template(template_id, **kwargs):
+def write_output(file, output: str | StreamedOutput):
+    """ Write step output into opened text file without materializing streamed output """
+    if isinstance(output, StreamedOutput):
+        output.copy_to(file)
+    else:
+        file.write(output)
+
+def run_template(template_id, run_context: RunContext = None, variables: Dict[str, any] = None, llm_providers: dict = None, **kwargs) -> RunResult:
+    """
+    Run template steps, run_context is resolved once here when not given (from the current click context).
+
+    variables - template variable values by variable name (used instead of cli option kwargs values),
+    llm_providers - provider instances cache to reuse between runs (not shared between concurrent runs),
+    returns RunResult with streamed outputs not materialized.
+    """
+    run_context = run_context or get_run_context()
+    with use_run_context(run_context):
+        return _run_template(template_id, run_context, variables, llm_providers, **kwargs)
+
+def _run_template(template_id, run_context: RunContext, input_variables: Dict[str, any] = None, llm_providers: dict = None, **kwargs) -> RunResult:
     from prich.core.loaders import get_loaded_config, get_loaded_template
 
+    run_started = time.perf_counter()
+    input_variables = input_variables or {}
+
     config, _ = get_loaded_config()
-    provider = kwargs.get('provider')
+    provider = kwargs.get('provider') or run_context.provider
     output_file = kwargs.get('output')
 
     template = get_loaded_template(template_id)
@@ -50,23 +94,31 @@ def run_template(template_id, **kwargs):
     variables = {}
     for var in template.variables:
         cli_option = var.cli_option
-        if cli_option:
+        if var.name in input_variables:
+            variables[var.name] = replace_env_vars(input_variables[var.name], get_env_vars())
+        elif cli_option:
             option_name = cli_option.lstrip("-").replace("-", "_")
             variables[var.name] = replace_env_vars(kwargs.get(option_name, var.default), get_env_vars())
         else:
             variables[var.name] = replace_env_vars(kwargs.get(var.name, var.default), get_env_vars())
         if var.required and variables.get(var.name) is None:
-            raise click.ClickException(f"Missing required variable {var.name}")
+            raise TemplateInputError(f"Missing required variable {var.name}")
 
     if template.steps:
         step_return_exit_code = None  # Used only for subprocess execute commands
+        step_exit_codes = None  # pipeline step commands exit codes
         step_idx = 0
         last_output = ""
         skip_following_steps = True  # used with validate
-        for step in template.steps:
+        if llm_providers is None:
+            llm_providers = {}  # provider instances reused between steps of the run
+        step_results = []
+        # steps are copied as they are adjusted during the run (loaded templates are shared between runs)
+        steps = [step.model_copy() for step in template.steps]
+        for step in steps:
             step_idx += 1
 
-            if not is_verbose() and step.name == template.steps[-1].name and step.output_console is None:
+            if not is_verbose() and step.name == steps[-1].name and step.output_console is None:
                 # show final step output when non-verbose execution
                 step.output_console = True
 
@@ -79,21 +131,33 @@ def run_template(template_id, **kwargs):
                 when_expression = f" (\"when\" expression \"{step.when}\" is {should_run})" if step.when else ""
                 console_print(f"[dim]{step_brief}{' - Skipped' if not should_run else ''}{when_expression if is_verbose() else ''}[/dim]")
             if not should_run:
+                step_results.append(StepResult(name=step.name, type=step.type, skipped=True))
                 continue
+            step_started = time.perf_counter()
 
             # Set output variable to None
             if step.output_variable:
                 variables[step.output_variable] = None
 
             output_var = step.output_variable
-            if isinstance(step, (PythonStep, CommandStep)):
-                step_output, step_return_exit_code = run_command_step(template, step, variables)
-            elif isinstance(step, RenderStep):
-                step_output = render_template(step, variables)
-            elif isinstance(step, LLMStep):
-                step_output = send_to_llm(template, step, provider, config, variables)
-            else:
-                raise click.ClickException(f"Step {step.type} type is not supported.")
+            # only the final step output is streamed to the run output sink
+            step_context = use_run_context(run_context.replace(output_sink=None)) \
+                if run_context.output_sink and step is not steps[-1] else nullcontext()
+            with step_context:
+                if isinstance(step, (PythonStep, CommandStep)):
+                    step_output, step_return_exit_code = run_command_step(template, step, variables)
+                elif isinstance(step, CommandPipelineStep):
+                    step_output, step_return_exit_code, step_exit_codes = run_pipeline_step(template, step, variables)
+                elif isinstance(step, RenderStep):
+                    step_output = render_template(step, variables)
+                elif isinstance(step, LLMStep):
+                    step_output = send_to_llm(template, step, provider, config, variables, llm_providers=llm_providers)
+                else:
+                    raise click.ClickException(f"Step {step.type} type is not supported.")
+
+            # Streamed output is materialized only when whole output text transformations are used
+            if isinstance(step_output, StreamedOutput) and (step.extract_variables or step.filter):
+                step_output = str(step_output)
 
             if is_verbose():
                 if step.extract_variables or step.filter:
@@ -119,22 +183,30 @@ def run_template(template_id, **kwargs):
 
             # Store last output
             last_output = step_output
+            step_results.append(StepResult(name=step.name, type=step.type, duration_ms=round((time.perf_counter() - step_started) * 1000, 1),
+                                           exit_code=step_return_exit_code if isinstance(step, (PythonStep, CommandStep, CommandPipelineStep)) else None))
 
             if output_var:
                 variables[output_var] = step_output
-            if step.output_file:
+            if step.output_file and not (isinstance(step_output, StreamedOutput) and step_output.teed_file):
                 save_to_file = step.output_file.name
                 try:
                     write_mode = step.output_file.mode[:1] if step.output_file.mode else 'w'
                     with open(save_to_file, write_mode) as step_output_file:
                         if is_verbose():
                             console_print(f"[dim]{'Save' if write_mode == 'w' else 'Append'} output to file: {save_to_file}[/dim]")
-                        step_output_file.write(step_output)
+                        write_output(step_output_file, step_output)
                 except Exception as e:
                     raise click.ClickException(f"Failed to save output to file {save_to_file}: {e}")
             # Print step output to console
             if ((step.output_console or is_verbose()) and not (isinstance(step, LLMStep))) and not is_only_final_output() and not is_quiet():
-                console_print(step_output, markup=False)
+                if isinstance(step_output, StreamedOutput):
+                    if not step_output.teed_console:
+                        with StreamWriter() as writer:
+                            for chunk in step_output.iter_chunks():
+                                writer.write(chunk)
+                else:
+                    print_plain(step_output)
             # Validate
             if step.validate_:
                 if isinstance(step.validate_, ValidateStepOutput):
@@ -143,10 +215,14 @@ def run_template(template_id, **kwargs):
                 for validate in step.validate_:
                     idx += 1
                     validated = True
-                    if isinstance(step, (PythonStep, CommandStep)) and (validate.match_exit_code is not None or validate.not_match_exit_code is not None):
+                    if isinstance(step, (PythonStep, CommandStep, CommandPipelineStep)) and (validate.match_exit_code is not None or validate.not_match_exit_code is not None):
                         validated = validate_step_exit_code(validate, step_return_exit_code, variables)
                     elif validate.match_exit_code is not None or validate.not_match_exit_code is not None:
-                        raise click.ClickException("Step validation using 'match_exitcode' and/or 'not_match_exitcode' supported only in 'python' and 'command' step types.")
+                        raise click.ClickException("Step validation using 'match_exitcode' and/or 'not_match_exitcode' supported only in 'python', 'command' and 'pipeline' step types.")
+                    if validated and validate.match_exit_codes is not None:
+                        if not isinstance(step, CommandPipelineStep):
+                            raise click.ClickException("Step validation using 'match_exit_codes' supported only in 'pipeline' step type.")
+                        validated = validate_step_exit_codes(validate, step_exit_codes, variables)
                     if validated:
                         validated = validate_step_output(validate, step_output, variables)
                     if not validated:
@@ -175,9 +251,14 @@ def run_template(template_id, **kwargs):
         # Save last step output if output file option added
         if output_file:
             with open(output_file, 'w') as final_output_file:
-                final_output_file.write(last_output)
+                write_output(final_output_file, last_output)
         # Print last step output if last option enabled
         if is_only_final_output() and not is_quiet():
-            print(last_output, flush=True)
+            if isinstance(last_output, StreamedOutput):
+                write_output(sys.stdout, last_output)
+                print(flush=True)
+            else:
+                print(last_output, flush=True)
+        return RunResult(template_id=template.id, output=last_output, variables=dict(variables), steps=step_results, duration_ms=round((time.perf_counter() - run_started) * 1000, 1))
     else:
         raise click.ClickException(f"No steps found in template {template.id}.")
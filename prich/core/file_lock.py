@@ -0,0 +1,43 @@
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+POLL_INTERVAL = 0.05
+MAX_POLL_INTERVAL = 0.5
+
+
+def lock_file(fd: int) -> bool:
+    """ Exclusive non-blocking lock of the opened file, released on close or when the process exits """
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        import msvcrt
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            return False
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except BlockingIOError:
+        return False
+
+
+@contextmanager
+def file_lock(path: Path, on_wait=None):
+    """ Hold an exclusive lock of the file (waits for other processes), on_wait is called once when the lock is busy """
+    path = Path(path)
+    os.makedirs(path.parent, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        poll_interval = POLL_INTERVAL
+        while not lock_file(fd):
+            if on_wait and poll_interval == POLL_INTERVAL:
+                on_wait()
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 1.5, MAX_POLL_INTERVAL)
+        yield
+    finally:
+        os.close(fd)
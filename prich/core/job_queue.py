@@ -0,0 +1,274 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from prich.core.run_result import RunResult
+
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BACKOFF = 10
+MAX_RETRY_BACKOFF = 600
+JOB_STATUSES = ["queued", "running", "done", "failed"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    template_id TEXT NOT NULL,
+    variables TEXT NOT NULL,
+    provider TEXT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    duration_ms REAL,
+    output TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_available ON jobs (status, available_at);
+"""
+
+
+@dataclass
+class Job:
+    """ Queued template run """
+    id: int
+    template_id: str
+    variables: Dict[str, any]
+    provider: Optional[str]
+    status: str
+    attempts: int
+    max_attempts: int
+    lease_owner: Optional[str] = None
+    output: Optional[str] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    duration_ms: Optional[float] = None
+    created_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> "Job":
+        return cls(id=row["id"], template_id=row["template_id"], variables=json.loads(row["variables"]),
+                   provider=row["provider"], status=row["status"], attempts=row["attempts"],
+                   max_attempts=row["max_attempts"], lease_owner=row["lease_owner"], output=row["output"],
+                   result=json.loads(row["result"]) if row["result"] else None, error=row["error"],
+                   duration_ms=row["duration_ms"], created_at=row["created_at"], finished_at=row["finished_at"])
+
+
+def retry_backoff(attempts: int, base: float = DEFAULT_RETRY_BACKOFF) -> float:
+    """ Exponential retry delay in seconds after the given number of failed attempts """
+    return min(base * 2 ** max(attempts - 1, 0), MAX_RETRY_BACKOFF)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+class JobQueue:
+    """
+    SQLite backed durable queue of template runs shared by several worker processes.
+
+    Jobs are leased by workers for lease_seconds (extended while running), leases of crashed workers
+    expire and the jobs are leased again.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        os.makedirs(self.path.parent, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        # connection per operation, sqlite connections can't be shared between threads
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    def submit(self, template_id: str, variables_list: List[Dict[str, any]], provider: str = None,
+               max_attempts: int = DEFAULT_MAX_ATTEMPTS) -> List[int]:
+        """ Append jobs (one per variables dict), returns their ids """
+        now = time.time()
+        ids = []
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            for variables in variables_list:
+                cursor = connection.execute(
+                    "INSERT INTO jobs (template_id, variables, provider, max_attempts, available_at, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (template_id, json.dumps(variables), provider, max_attempts, now, now))
+                ids.append(cursor.lastrowid)
+            connection.execute("COMMIT")
+        return ids
+
+    def lease(self, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> Optional[Job]:
+        """ Lease the next available job (queued or with an expired lease) """
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            # jobs of crashed workers used all attempts fail
+            connection.execute(
+                "UPDATE jobs SET status = 'failed', lease_owner = NULL, lease_expires_at = NULL, finished_at = ?, "
+                "error = 'Worker lease expired' WHERE status = 'running' AND lease_expires_at < ? AND attempts >= max_attempts",
+                (now, now))
+            row = connection.execute(
+                "SELECT * FROM jobs WHERE (status = 'queued' AND available_at <= ?) OR (status = 'running' AND lease_expires_at < ?) "
+                "ORDER BY available_at, id LIMIT 1", (now, now)).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            connection.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, lease_expires_at = ?, started_at = ? WHERE id = ?",
+                (owner, now + lease_seconds, now, row["id"]))
+            job = Job.from_row(connection.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+            connection.execute("COMMIT")
+        return job
+
+    def extend_lease(self, job_id: int, owner: str, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> bool:
+        """ Extend the job lease, returns False when the job is not leased by the owner anymore """
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (time.time() + lease_seconds, job_id, owner))
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, result: RunResult) -> bool:
+        with self._connect() as connection:
+            cursor = connection.execute(
+                "UPDATE jobs SET status = 'done', lease_owner = NULL, lease_expires_at = NULL, finished_at = ?, duration_ms = ?, "
+                "output = ?, result = ?, error = NULL WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                (time.time(), result.duration_ms, result.output,
+                 json.dumps({"variables": result.variables, "steps": [asdict(step) for step in result.steps]}, default=str),
+                 job_id, owner))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, owner: str, error: str, backoff: float = DEFAULT_RETRY_BACKOFF) -> Optional[str]:
+        """ Record failed attempt, the job is queued again with backoff until max_attempts, returns the new status """
+        now = time.time()
+        with self._connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = 'running' AND lease_owner = ?",
+                                     (job_id, owner)).fetchone()
+            if row is None:
+                connection.execute("COMMIT")
+                return None
+            status = "queued" if row["attempts"] < row["max_attempts"] else "failed"
+            connection.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires_at = NULL, available_at = ?, error = ?, "
+                "finished_at = ? WHERE id = ?",
+                (status, now + retry_backoff(row["attempts"], backoff), error, now if status == "failed" else None, job_id))
+            connection.execute("COMMIT")
+        return status
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._connect() as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job.from_row(row) if row else None
+
+    def status(self, window_seconds: float = 600) -> dict:
+        """ Jobs count by status, backlog age and throughput (done jobs per minute) in the last window_seconds """
+        now = time.time()
+        with self._connect() as connection:
+            counts = {row["status"]: row["count"] for row in
+                      connection.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")}
+            oldest_queued = connection.execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            recent = connection.execute(
+                "SELECT COUNT(*), AVG(duration_ms), MIN(finished_at) FROM jobs WHERE status = 'done' AND finished_at >= ?",
+                (now - window_seconds,)).fetchone()
+            expired_leases = connection.execute("SELECT COUNT(*) FROM jobs WHERE status = 'running' AND lease_expires_at < ?",
+                                                (now,)).fetchone()[0]
+        return {
+            "counts": {status: counts.get(status, 0) for status in JOB_STATUSES},
+            "oldest_queued_sec": round(now - oldest_queued, 1) if oldest_queued else None,
+            "done_recently": recent[0],
+            "throughput_per_min": round(recent[0] / (window_seconds / 60), 2),
+            "avg_duration_ms": round(recent[1], 1) if recent[1] is not None else None,
+            "expired_leases": expired_leases,
+        }
+
+
+def run_worker(job_queue: JobQueue, session, concurrency: int = 1, lease_seconds: float = DEFAULT_LEASE_SECONDS,
+               poll_interval: float = 1.0, retry_backoff_sec: float = DEFAULT_RETRY_BACKOFF, exit_when_empty: bool = False,
+               stop_event: threading.Event = None, on_job_done=None) -> int:
+    """
+    Process queued jobs with concurrency threads using the PrichSession, returns processed jobs count.
+
+    Job leases are extended while running, on_job_done(job, status) is called after each processed job
+    (status "lost" when the lease was lost and the job was taken by another worker, such jobs are not counted).
+    """
+    from prich.core.session import PrichError
+
+    stop_event = stop_event or threading.Event()
+    processed = 0
+    processed_lock = threading.Lock()
+    running = {}  # job id: owner
+    running_lock = threading.Lock()
+
+    def heartbeat():
+        while not stop_event.wait(max(lease_seconds / 3, 0.1)):
+            with running_lock:
+                jobs = list(running.items())
+            for job_id, owner in jobs:
+                job_queue.extend_lease(job_id, owner, lease_seconds)
+
+    def work():
+        nonlocal processed
+        owner = worker_id()
+        llm_providers = {}  # provider instances reused between jobs of this thread
+        while not stop_event.is_set():
+            job = job_queue.lease(owner, lease_seconds)
+            if job is None:
+                if exit_when_empty:
+                    return
+                stop_event.wait(poll_interval)
+                continue
+            with running_lock:
+                running[job.id] = owner
+            for llm_provider, _ in llm_providers.values():
+                llm_provider.reset()
+            try:
+                result = session.run(job.template_id, job.variables, provider=job.provider, llm_providers=llm_providers)
+                status = "done" if job_queue.complete(job.id, owner, result) else None
+            except PrichError as e:
+                status = job_queue.fail(job.id, owner, e.message, retry_backoff_sec)
+            except Exception as e:
+                status = job_queue.fail(job.id, owner, f"{type(e).__name__}: {e}", retry_backoff_sec)
+            finally:
+                with running_lock:
+                    running.pop(job.id, None)
+            if status is None:
+                # lease expired and the job was taken by another worker, its result is not recorded
+                status = "lost"
+            else:
+                with processed_lock:
+                    processed += 1
+            if on_job_done:
+                on_job_done(job, status)
+
+    heartbeat_thread = threading.Thread(target=heartbeat, daemon=True, name="prich-worker-heartbeat")
+    heartbeat_thread.start()
+    threads = [threading.Thread(target=work, daemon=True, name=f"prich-worker-{idx}") for idx in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    try:
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(0.5)
+    finally:
+        stop_event.set()
+    return processed
@@ -126,13 +126,24 @@ def load_templates() -> List[TemplateModel]:
     filtered_globals = [template for template in global_templates if template.id not in local_ids]
     return local_templates + filtered_globals
 
+def _get_session():
+    """ Session of the active run context (embedded usage), its caches are used instead of the module ones """
+    from prich.core.run_context import get_run_context
+    return get_run_context().session
+
 def get_loaded_config() -> Tuple[ConfigModel, List[Path]]:
     global _loaded_config, _loaded_config_paths
+    session = _get_session()
+    if session is not None:
+        return session.get_config()
     if _loaded_config is None:
         _loaded_config, _loaded_config_paths = load_merged_config()
     return _loaded_config, _loaded_config_paths
 
 def get_loaded_template(template_id: str) -> TemplateModel:
+    session = _get_session()
+    if session is not None:
+        return session.get_template(template_id)
     if not _loaded_templates:
         get_loaded_templates()
     if template_id not in _loaded_templates:
@@ -140,6 +151,10 @@ def get_loaded_template(template_id: str) -> TemplateModel:
     return _loaded_templates[template_id]
 
 def get_loaded_templates(tags: List[str] = None) -> List[TemplateModel]:
+    session = _get_session()
+    if session is not None:
+        templates = session.get_templates()
+        return [t for t in templates if t.has_any_tag(tags)] if tags else templates
     if not _loaded_templates:
         templates = load_templates()
         for template in templates:
@@ -153,16 +168,25 @@ def get_env_vars() -> dict[str, str]:
     Load environment variables from current os.environ + given env files,
     optionally filtered by allowed_environment_variables.
     """
-    from dotenv import dotenv_values
     from prich.core.state import _loaded_env_vars
 
+    session = _get_session()
+    if session is not None:
+        return session.get_env_vars()
     if _loaded_env_vars is not None:
         return _loaded_env_vars
 
+    config, _ = get_loaded_config()
+    _loaded_env_vars = build_env_vars(config)
+    return _loaded_env_vars
+
+def build_env_vars(config: ConfigModel) -> dict[str, str]:
+    """ Merge os.environ with config settings env files, filtered by security allowed_environment_variables """
+    from dotenv import dotenv_values
+
     # Start with a copy of current environment
     merged = dict(os.environ)
 
-    config, _ = get_loaded_config()
     env_files = config.settings.env_file if config.settings else None
     allowed_environment_variables = config.security.allowed_environment_variables if config.security else None
 
@@ -186,6 +210,4 @@ def get_env_vars() -> dict[str, str]:
         allowed_set = set(allowed_environment_variables)
         merged = {k: v for k, v in merged.items() if k in allowed_set}
 
-    _loaded_env_vars = merged
-
     return merged
\ No newline at end of file
@@ -0,0 +1,98 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+import click
+
+from prich.constants import PRICH_DIR_NAME, TEMPLATES_MANIFEST_URL
+from prich.core.utils import get_home_dir
+
+DEFAULT_MANIFEST_TTL = 300  # seconds
+MANIFEST_REQUEST_TIMEOUT = 15  # seconds
+
+
+def get_manifest_settings() -> Tuple[str, int]:
+    """ Templates manifest url and cache ttl from config settings (defaults when prich is not configured) """
+    from prich.core.loaders import get_loaded_config
+
+    try:
+        config, _ = get_loaded_config()
+    except click.ClickException:
+        return TEMPLATES_MANIFEST_URL, DEFAULT_MANIFEST_TTL
+    settings = config.settings
+    url = settings.templates_manifest_url if settings and settings.templates_manifest_url else TEMPLATES_MANIFEST_URL
+    ttl = settings.templates_manifest_ttl if settings and settings.templates_manifest_ttl is not None else DEFAULT_MANIFEST_TTL
+    return url, ttl
+
+
+class ManifestCache:
+    """
+    Local copy of remote manifests (~/.prich/cache/manifests/<url hash>.json) with ETag/Last-Modified.
+
+    Manifests fresher than ttl are used without requests, stale ones are revalidated with conditional requests,
+    the cached copy is used when the remote is not reachable.
+    """
+    def __init__(self, cache_dir: Path = None, ttl: int = DEFAULT_MANIFEST_TTL, timeout: float = MANIFEST_REQUEST_TIMEOUT):
+        self.cache_dir = Path(cache_dir) if cache_dir else get_home_dir() / PRICH_DIR_NAME / "cache" / "manifests"
+        self.ttl = ttl
+        self.timeout = timeout
+
+    def _cache_file(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]}.json"
+
+    def _load(self, url: str) -> Optional[dict]:
+        try:
+            with open(self._cache_file(url), "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            return cached if cached.get("url") == url and "content" in cached else None
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, url: str, cached: dict):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            cache_file = self._cache_file(url)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(cached, f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass  # cache is optional
+
+    def get(self, url: str, refresh: bool = False) -> Tuple[str, str]:
+        """ Manifest text and its source: cache, not_modified (revalidated), downloaded, offline or file (local mirror) """
+        import requests
+
+        if not url.startswith(("http://", "https://")):
+            path = Path(url[len("file://"):] if url.startswith("file://") else url).expanduser()
+            try:
+                return path.read_text(encoding="utf-8"), "file"
+            except OSError as e:
+                raise click.ClickException(f"Failed to read templates manifest {path}: {e}")
+
+        cached = self._load(url)
+        if cached and not refresh and time.time() - cached.get("fetched_at", 0) < self.ttl:
+            return cached["content"], "cache"
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        try:
+            response = requests.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304 and cached:
+                cached["fetched_at"] = time.time()
+                self._save(url, cached)
+                return cached["content"], "not_modified"
+            response.raise_for_status()
+        except requests.RequestException as e:
+            if cached:
+                return cached["content"], "offline"
+            raise click.ClickException(f"Failed to fetch templates manifest {url}: {e}")
+        self._save(url, {"url": url, "etag": response.headers.get("ETag"),
+                         "last_modified": response.headers.get("Last-Modified"),
+                         "fetched_at": time.time(), "content": response.text})
+        return response.text, "downloaded"
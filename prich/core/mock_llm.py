@@ -0,0 +1,248 @@
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+DEFAULT_MOCK_RESPONSE = "This is a mock LLM response generated by prich for benchmarking and offline tests."
+
+
+class MockLLMOptions:
+    """ Mock LLM server behaviour """
+    def __init__(self,
+                 models: Optional[List[str]] = None,
+                 response: Optional[str] = None,
+                 echo: bool = False,
+                 ttft_ms: float = 0,
+                 tokens_per_sec: float = 0,
+                 error_rate: float = 0,
+                 rate_limit_rate: float = 0,
+                 retry_after: int = 1,
+                 load_ms: float = 0,
+                 seed: Optional[int] = None):
+        self.models = models or ["mock"]
+        self.response = response if response is not None else DEFAULT_MOCK_RESPONSE
+        self.echo = echo
+        self.ttft_ms = ttft_ms
+        self.tokens_per_sec = tokens_per_sec
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.load_ms = load_ms
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._loaded = {}  # Ollama resident model name: expiration time (None - never)
+        self._loaded_lock = threading.Lock()
+
+    def load_model(self, model: str, keep_alive=None) -> float:
+        """ Simulate Ollama model load, return load duration in seconds """
+        keep_alive_sec = parse_keep_alive(keep_alive)
+        with self._loaded_lock:
+            expires_at = self._loaded.get(model, 0)
+            load_sec = 0 if model in self._loaded and (expires_at is None or expires_at > time.time()) else self.load_ms / 1000
+            if load_sec:
+                time.sleep(load_sec)
+            if keep_alive_sec == 0:
+                self._loaded.pop(model, None)
+            else:
+                self._loaded[model] = None if keep_alive_sec < 0 else time.time() + keep_alive_sec
+        return load_sec
+
+    def resident_models(self) -> dict:
+        with self._loaded_lock:
+            now = time.time()
+            return {model: expires_at for model, expires_at in self._loaded.items() if expires_at is None or expires_at > now}
+
+    def roll(self) -> float:
+        with self._random_lock:
+            return self._random.random()
+
+
+def split_tokens(text: str) -> List[str]:
+    """ Split text into word tokens keeping the leading spaces """
+    tokens = []
+    for idx, word in enumerate(text.split(" ")):
+        tokens.append(word if idx == 0 else f" {word}")
+    return [token for token in tokens if token]
+
+
+def parse_keep_alive(keep_alive) -> float:
+    """ Ollama keep_alive value in seconds (negative - keep forever, default 5m) """
+    if keep_alive is None or keep_alive == "":
+        return 300
+    if isinstance(keep_alive, (int, float)):
+        return float(keep_alive)
+    units = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+    for unit in ["ms", "s", "m", "h"]:
+        if keep_alive.endswith(unit):
+            return float(keep_alive[:-len(unit)]) * units[unit]
+    return float(keep_alive)
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text or "") // 4)
+
+
+class MockLLMRequestHandler(BaseHTTPRequestHandler):
+    """ OpenAI /v1/chat/completions and Ollama /api/generate, /api/tags compatible handler """
+    server_version = "prich-mock-llm"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def options(self) -> MockLLMOptions:
+        return self.server.options
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "log_requests", False):
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, data: dict, headers: dict = None):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _inject_failure(self) -> bool:
+        """ Send injected rate limit or error response, return True when sent """
+        if self.options.rate_limit_rate and self.options.roll() < self.options.rate_limit_rate:
+            self._send_json(429, {"error": {"message": "Rate limit exceeded (mock rate_limit injection)",
+                                            "type": "rate_limit_error", "code": "rate_limit_exceeded"}},
+                            headers={"Retry-After": str(self.options.retry_after)})
+            return True
+        if self.options.error_rate and self.options.roll() < self.options.error_rate:
+            self._send_json(500, {"error": {"message": "Mock server error (error injection)", "type": "server_error"}})
+            return True
+        return False
+
+    def _response_tokens(self, prompt: str) -> List[str]:
+        return split_tokens(prompt if self.options.echo else self.options.response)
+
+    def _iter_tokens(self, tokens: List[str]):
+        """ Yield tokens with configured time to first token and generation speed """
+        if self.options.ttft_ms:
+            time.sleep(self.options.ttft_ms / 1000)
+        for idx, token in enumerate(tokens):
+            if idx and self.options.tokens_per_sec:
+                time.sleep(1 / self.options.tokens_per_sec)
+            yield token
+
+    def _start_stream(self, content_type: str):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _write_chunk(self, data: str):
+        encoded = data.encode("utf-8")
+        self.wfile.write(f"{len(encoded):X}\r\n".encode("ascii") + encoded + b"\r\n")
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/api/tags":
+            self._send_json(200, {"models": [{"name": model, "model": model} for model in self.options.models]})
+        elif self.path.rstrip("/") == "/api/ps":
+            from datetime import datetime, timezone
+            self._send_json(200, {"models": [
+                {"name": model, "model": model, "size": 0, "size_vram": 0,
+                 "expires_at": datetime.fromtimestamp(expires_at, timezone.utc).isoformat() if expires_at else "2318-01-01T00:00:00Z"}
+                for model, expires_at in self.options.resident_models().items()]})
+        elif self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": model, "object": "model", "owned_by": "prich"}
+                                                             for model in self.options.models]})
+        else:
+            self._send_json(404, {"error": {"message": f"Not found: {self.path}"}})
+
+    def do_POST(self):
+        payload = self._read_json()
+        if self.path.rstrip("/") == "/v1/chat/completions":
+            if not self._inject_failure():
+                self._chat_completions(payload)
+        elif self.path.rstrip("/") == "/api/generate":
+            if not self._inject_failure():
+                self._generate(payload)
+        else:
+            self._send_json(404, {"error": {"message": f"Not found: {self.path}"}})
+
+    def _chat_completions(self, payload: dict):
+        messages = payload.get("messages") or []
+        prompt = "\n".join(str(message.get("content") or "") for message in messages if isinstance(message, dict))
+        last_user = [message for message in messages if isinstance(message, dict) and message.get("role") == "user"]
+        tokens = self._response_tokens(str(last_user[-1].get("content") or "") if last_user else prompt)
+        model = payload.get("model") or self.options.models[0]
+        created = int(time.time())
+        usage = {"prompt_tokens": estimate_tokens(prompt), "completion_tokens": len(tokens),
+                 "total_tokens": estimate_tokens(prompt) + len(tokens), "prompt_tokens_details": {"cached_tokens": 0}}
+        if not payload.get("stream"):
+            content = "".join(self._iter_tokens(tokens))
+            self._send_json(200, {"id": "chatcmpl-mock", "object": "chat.completion", "created": created, "model": model,
+                                  "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                                               "finish_reason": "stop"}],
+                                  "usage": usage})
+            return
+
+        def chunk(delta: dict, finish_reason: str = None) -> str:
+            return "data: " + json.dumps({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created,
+                                          "model": model, "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}) + "\n\n"
+
+        self._start_stream("text/event-stream")
+        self._write_chunk(chunk({"role": "assistant", "content": ""}))
+        for token in self._iter_tokens(tokens):
+            self._write_chunk(chunk({"content": token}))
+        self._write_chunk(chunk({}, finish_reason="stop"))
+        if (payload.get("stream_options") or {}).get("include_usage"):
+            self._write_chunk("data: " + json.dumps({"id": "chatcmpl-mock", "object": "chat.completion.chunk", "created": created,
+                                                     "model": model, "choices": [], "usage": usage}) + "\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self._end_stream()
+
+    def _generate(self, payload: dict):
+        prompt = str(payload.get("prompt") or "")
+        model = payload.get("model") or self.options.models[0]
+        load_duration = int(self.options.load_model(model, payload.get("keep_alive")) * 1e9)
+        if not prompt:
+            # empty prompt only loads (or unloads with keep_alive 0) the model
+            self._send_json(200, {"model": model, "response": "", "done": True,
+                                  "done_reason": "unload" if payload.get("keep_alive") == 0 else "load",
+                                  "load_duration": load_duration, "total_duration": load_duration})
+            return
+        tokens = self._response_tokens(prompt)
+        context = list(payload.get("context") or []) + list(range(estimate_tokens(prompt) + len(tokens)))
+        if not payload.get("stream", True):
+            content = "".join(self._iter_tokens(tokens))
+            self._send_json(200, {"model": model, "response": content, "done": True, "context": context,
+                                  "prompt_eval_count": estimate_tokens(prompt), "eval_count": len(tokens)})
+            return
+        self._start_stream("application/x-ndjson")
+        for token in self._iter_tokens(tokens):
+            self._write_chunk(json.dumps({"model": model, "response": token, "done": False}) + "\n")
+        self._write_chunk(json.dumps({"model": model, "response": "", "done": True, "context": context,
+                                      "prompt_eval_count": estimate_tokens(prompt), "eval_count": len(tokens)}) + "\n")
+        self._end_stream()
+
+
+def create_mock_llm_server(host: str = "127.0.0.1", port: int = 0, options: MockLLMOptions = None,
+                           log_requests: bool = False) -> ThreadingHTTPServer:
+    """ Create mock LLM server (use port 0 to pick a free port, see server.server_address) """
+    server = ThreadingHTTPServer((host, port), MockLLMRequestHandler)
+    server.daemon_threads = True
+    server.options = options or MockLLMOptions()
+    server.log_requests = log_requests
+    return server
@@ -0,0 +1,106 @@
+import atexit
+import json
+import struct
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_WORKER_MAX_CALLS = 100
+WORKER_MAIN_FILE = Path(__file__).parent / "python_worker_main.py"
+
+
+class PythonWorker:
+    """ Long-lived python process (python_worker_main.py) running scripts calls one at a time """
+    def __init__(self, python_path: str, max_calls: int = DEFAULT_WORKER_MAX_CALLS, env: dict = None):
+        self.python_path = python_path
+        self.max_calls = max_calls
+        self.calls = 0
+        self.process = subprocess.Popen([python_path, str(WORKER_MAIN_FILE)], stdin=subprocess.PIPE,
+                                        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env)
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    @property
+    def exhausted(self) -> bool:
+        return self.calls >= self.max_calls
+
+    def call(self, script: str, args: List[str], stdin: Optional[str], env: dict, cwd: str) -> Tuple[str, int]:
+        data = json.dumps({"script": script, "args": args, "stdin": stdin, "env": env, "cwd": cwd}).encode("utf-8")
+        self.calls += 1
+        self.process.stdin.write(struct.pack(">I", len(data)) + data)
+        self.process.stdin.flush()
+        header = self.process.stdout.read(4)
+        if len(header) < 4:
+            raise EOFError("python worker exited")
+        (size,) = struct.unpack(">I", header)
+        result = json.loads(self.process.stdout.read(size).decode("utf-8"))
+        return result["output"], result["exit_code"]
+
+    def stop(self):
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+
+
+class PythonWorkerPool:
+    """ Idle workers by python interpreter, parallel calls get their own workers """
+    def __init__(self):
+        self._idle: Dict[str, List[PythonWorker]] = {}
+        self._lock = threading.Lock()
+
+    def _acquire(self, python_path: str, max_calls: int, env: dict) -> PythonWorker:
+        with self._lock:
+            idle = self._idle.setdefault(python_path, [])
+            while idle:
+                worker = idle.pop()
+                if worker.alive and worker.max_calls == max_calls:
+                    return worker
+                worker.stop()
+        return PythonWorker(python_path, max_calls=max_calls, env=env)
+
+    def _release(self, worker: PythonWorker):
+        if worker.alive and not worker.exhausted:
+            with self._lock:
+                self._idle.setdefault(worker.python_path, []).append(worker)
+        else:
+            worker.stop()
+
+    def run(self, python_path: str, script: str, args: List[str], stdin: Optional[str], env: dict, cwd: str,
+            max_calls: int = DEFAULT_WORKER_MAX_CALLS) -> Tuple[str, int]:
+        """ Run script in an idle or a new worker, workers crashed or exhausted (max_calls) are replaced """
+        worker = self._acquire(python_path, max_calls, env)
+        try:
+            result = worker.call(script, args, stdin, env, cwd)
+        except (BrokenPipeError, EOFError):
+            # crashed like a script process would (ex. os._exit, segfault), the next call starts a new worker
+            worker.stop()
+            return_code = worker.process.returncode
+            return f"Python worker exited unexpectedly running {script} (exit code {return_code})\n", return_code or 1
+        except BaseException:
+            # interrupted call leaves the worker in unknown state
+            worker.process.kill()
+            worker.stop()
+            raise
+        self._release(worker)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            workers = [worker for idle in self._idle.values() for worker in idle]
+            self._idle.clear()
+        for worker in workers:
+            worker.stop()
+
+
+_worker_pool = PythonWorkerPool()
+atexit.register(_worker_pool.shutdown)
+
+
+def get_python_worker_pool() -> PythonWorkerPool:
+    return _worker_pool
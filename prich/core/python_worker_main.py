@@ -0,0 +1,115 @@
+"""
+Python worker process main loop, started with the template venv python (only standard library is used).
+
+Reads calls from stdin and writes results to the original stdout fd, both framed as 4 bytes big-endian length and
+json. Each call runs the script as __main__ with its own argv, environment, working directory, stdin and captured
+stdout/stderr (fd 1 and 2 go to a temporary file during the call, so subprocesses and C extensions output is
+captured in order with the script prints). Script code objects are cached (by path and mtime) and modules imported by scripts stay loaded.
+"""
+import io
+import json
+import os
+import struct
+import sys
+import tempfile
+import traceback
+
+_code_cache = {}
+
+
+def _read_message(stream):
+    header = stream.read(4)
+    if len(header) < 4:
+        return None
+    (size,) = struct.unpack(">I", header)
+    return json.loads(stream.read(size).decode("utf-8"))
+
+
+def _write_message(stream, message: dict):
+    data = json.dumps(message).encode("utf-8")
+    stream.write(struct.pack(">I", len(data)) + data)
+    stream.flush()
+
+
+def _get_code(script: str):
+    from importlib.machinery import SourceFileLoader
+    mtime = os.stat(script).st_mtime_ns
+    cached = _code_cache.get(script)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    # uses and writes __pycache__ bytecode like imported modules
+    code = SourceFileLoader("__main__", script).get_code("__main__")
+    _code_cache[script] = (mtime, code)
+    return code
+
+
+def _run_call(call: dict) -> dict:
+    script = call["script"]
+    capture = tempfile.TemporaryFile()
+    saved_fds = os.dup(1), os.dup(2)
+    # write_through keeps the script prints in order with the fd level writes
+    output = io.TextIOWrapper(open(1, "wb", closefd=False), encoding="utf-8", errors="backslashreplace",
+                              write_through=True)
+    base_path = list(sys.path)
+    base_env = dict(os.environ)
+    base_cwd = os.getcwd()
+    saved_streams = sys.stdin, sys.stdout, sys.stderr, sys.argv
+    exit_code = 0
+    try:
+        os.environ.clear()
+        os.environ.update(call.get("env") or base_env)
+        os.chdir(call.get("cwd") or base_cwd)
+        sys.path[0:0] = [os.path.dirname(script)]
+        sys.argv = [script, *call.get("args", [])]
+        sys.stdin = io.StringIO(call.get("stdin") or "")
+        os.dup2(capture.fileno(), 1)
+        os.dup2(capture.fileno(), 2)
+        sys.stdout = sys.stderr = output
+        namespace = {"__name__": "__main__", "__file__": script, "__builtins__": __builtins__}
+        try:
+            exec(_get_code(script), namespace)
+        except SystemExit as e:
+            if e.code is None:
+                exit_code = 0
+            elif isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                output.write(f"{e.code}\n")
+                exit_code = 1
+        except BaseException:
+            traceback.print_exc(file=output)
+            exit_code = 1
+    finally:
+        output.flush()
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in saved_fds:
+            os.close(fd)
+        sys.stdin, sys.stdout, sys.stderr, sys.argv = saved_streams
+        sys.path[:] = base_path
+        os.environ.clear()
+        os.environ.update(base_env)
+        os.chdir(base_cwd)
+    with capture:
+        capture.seek(0)
+        return {"output": capture.read().decode("utf-8", errors="replace"), "exit_code": exit_code}
+
+
+def main():
+    # keep the protocol streams away from fd level reads and writes (subprocesses, C extensions)
+    results = os.fdopen(os.dup(1), "wb")
+    calls = os.fdopen(os.dup(0), "rb")
+    os.dup2(2, 1)
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.path[:] = [p for p in sys.path if p != os.path.dirname(os.path.abspath(__file__))]
+    while True:
+        call = _read_message(calls)
+        if call is None:
+            break
+        _write_message(results, _run_call(call))
+
+
+if __name__ == "__main__":
+    main()
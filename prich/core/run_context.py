@@ -0,0 +1,96 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from functools import wraps
+from typing import Any, Callable, Optional
+
+import click
+
+GLOBAL_ONLY_PARAMS = ["global_only", "global_init", "global_install"]
+
+
+@dataclass(frozen=True)
+class RunContext:
+    """
+    Run flags resolved once (at the CLI boundary or by an embedding application).
+
+    console - rich console used for printing (prich default console when not set),
+    silent - console printing disabled (ex. background threads running concurrently),
+    session - PrichSession with its own config, templates and env caches (embedded usage),
+    output_sink - callback receiving streamed chunks of the final step output (ex. server streaming responses),
+    record_dir/replay_dir - folder to record provider responses into/replay them from (cassettes),
+    replay_timing - replay responses with the recorded stream timing (instant by default).
+    """
+    verbose: bool = False
+    quiet: bool = False
+    only_final_output: bool = False
+    global_only: bool = False
+    local_only: bool = False
+    provider: Optional[str] = None
+    silent: bool = False
+    console: Any = field(default=None, compare=False, repr=False)
+    session: Any = field(default=None, compare=False, repr=False)
+    output_sink: Optional[Callable[[str], None]] = field(default=None, compare=False, repr=False)
+    record_dir: Optional[str] = None
+    replay_dir: Optional[str] = None
+    replay_timing: bool = False
+
+    @property
+    def print_enabled(self) -> bool:
+        return not self.silent and not self.quiet and not self.only_final_output
+
+    def replace(self, **changes) -> "RunContext":
+        return replace(self, **changes)
+
+    @classmethod
+    def from_click(cls, ctx: click.Context = None, **overrides) -> "RunContext":
+        """ Build run context from click context params (current click context by default) """
+        from prich.core.utils import is_piped
+
+        ctx = ctx or click.get_current_context(silent=True)
+        params = ctx.params if ctx else {}
+        values = dict(
+            verbose=bool(params.get("verbose")),
+            quiet=bool(params.get("quiet")),
+            only_final_output=bool(params.get("only_final_output")) or is_piped(),
+            global_only=any(params.get(name) for name in GLOBAL_ONLY_PARAMS),
+            local_only=bool(params.get("local_only")),
+            provider=params.get("provider"),
+            record_dir=params.get("record"),
+            replay_dir=params.get("replay"),
+            replay_timing=bool(params.get("replay_timing")),
+        )
+        values.update(overrides)
+        return cls(**values)
+
+
+_run_context: ContextVar[Optional[RunContext]] = ContextVar("prich_run_context", default=None)
+
+
+def get_run_context() -> RunContext:
+    """ Get active run context, falls back to the one built from the current click context """
+    run_context = _run_context.get()
+    if run_context is None:
+        return RunContext.from_click()
+    return run_context
+
+
+@contextmanager
+def use_run_context(run_context: RunContext):
+    """ Activate run context in the current thread (or asyncio task) """
+    token = _run_context.set(run_context)
+    try:
+        yield run_context
+    finally:
+        _run_context.reset(token)
+
+
+def with_run_context(func: Callable, run_context: RunContext = None) -> Callable:
+    """ Wrap callable to run with the current (or given) run context, used for functions executed in other threads """
+    run_context = run_context or get_run_context()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        with use_run_context(run_context):
+            return func(*args, **kwargs)
+    return wrapper
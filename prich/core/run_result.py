@@ -0,0 +1,35 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class StepResult:
+    """ Template step execution summary """
+    name: str
+    type: str
+    skipped: bool = False
+    duration_ms: Optional[float] = None
+    exit_code: Optional[int] = None  # only python and command steps
+
+
+@dataclass
+class RunResult:
+    """
+    Template run result: final output (last step output), all variables and per-step timings.
+
+    Streamed step outputs are kept as StreamedOutput (not read into memory), use materialize() to get text values.
+    """
+    template_id: str
+    output: Any
+    variables: Dict[str, Any] = field(default_factory=dict)
+    steps: List[StepResult] = field(default_factory=list)
+    duration_ms: Optional[float] = None
+
+    def materialize(self) -> "RunResult":
+        """ Run result with streamed outputs converted to text (ex. to serialize it) """
+        from dataclasses import replace
+        from prich.core.stream_output import StreamedOutput
+
+        def to_text(value):
+            return str(value) if isinstance(value, StreamedOutput) else value
+        return replace(self, output=to_text(self.output), variables={name: to_text(value) for name, value in self.variables.items()})
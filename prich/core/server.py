@@ -0,0 +1,288 @@
+import json
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from prich.core.session import PrichSession, PrichError
+
+# request latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+RUN_PATH_PATTERN = re.compile(r"^/templates/([^/]+)/run$")
+
+
+class ServerMetrics:
+    """ Request counters and latency histograms per template (Prometheus text format) """
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._requests = {}  # (template id, status code): count
+        self._latency = {}  # template id: [bucket counts..., +Inf count], sum
+        self.rejected = 0
+
+    def observe(self, template_id: str, status: int, duration_sec: float):
+        with self._lock:
+            self._requests[(template_id, status)] = self._requests.get((template_id, status), 0) + 1
+            counts, total = self._latency.get(template_id, ([0] * (len(self.buckets) + 1), 0.0))
+            for idx, bucket in enumerate(self.buckets):
+                if duration_sec <= bucket:
+                    counts[idx] += 1
+            counts[-1] += 1
+            self._latency[template_id] = (counts, total + duration_sec)
+            if status == 429:
+                self.rejected += 1
+
+    def render(self, gauges: Dict[str, float] = None) -> str:
+        lines = ["# TYPE prich_requests_total counter"]
+        with self._lock:
+            for (template_id, status), count in sorted(self._requests.items()):
+                lines.append(f'prich_requests_total{{template="{template_id}",status="{status}"}} {count}')
+            lines.append("# TYPE prich_rejected_requests_total counter")
+            lines.append(f"prich_rejected_requests_total {self.rejected}")
+            lines.append("# TYPE prich_request_duration_seconds histogram")
+            for template_id, (counts, total) in sorted(self._latency.items()):
+                for bucket, count in zip(list(self.buckets) + ["+Inf"], counts):
+                    lines.append(f'prich_request_duration_seconds_bucket{{template="{template_id}",le="{bucket}"}} {count}')
+                lines.append(f'prich_request_duration_seconds_sum{{template="{template_id}"}} {round(total, 6)}')
+                lines.append(f'prich_request_duration_seconds_count{{template="{template_id}"}} {counts[-1]}')
+        for name, value in (gauges or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class RunScheduler:
+    """
+    Worker pool running template requests.
+
+    Up to workers + queue_size requests are admitted (others should be rejected), requests of a template
+    over its concurrency limit wait for a free slot. Each worker thread keeps its own provider instances
+    reused between its runs (warm clients and models).
+    """
+    def __init__(self, workers: int = 4, queue_size: int = 16, template_limits: Dict[str, int] = None,
+                 default_template_limit: int = None):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.template_limits = template_limits or {}
+        self.default_template_limit = default_template_limit or workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prich-serve")
+        self._lock = threading.Lock()
+        self._template_slots = {}
+        self._worker_state = threading.local()
+        self.pending = 0
+        self.running = 0
+
+    def admit(self) -> bool:
+        with self._lock:
+            if self.pending >= self.workers + self.queue_size:
+                return False
+            self.pending += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.pending -= 1
+
+    def _template_slot(self, template_id: str) -> threading.Semaphore:
+        with self._lock:
+            if template_id not in self._template_slots:
+                limit = self.template_limits.get(template_id, self.default_template_limit)
+                self._template_slots[template_id] = threading.BoundedSemaphore(limit)
+            return self._template_slots[template_id]
+
+    def _run_in_worker(self, run: Callable[[dict], any]):
+        llm_providers = self._worker_state.__dict__.setdefault("llm_providers", {})
+        for llm_provider, _ in llm_providers.values():
+            llm_provider.reset()
+        with self._lock:
+            self.running += 1
+        try:
+            return run(llm_providers)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    def submit(self, template_id: str, run: Callable[[dict], any]) -> Future:
+        """ Wait for the template slot and submit run (called with the worker provider instances cache) """
+        slot = self._template_slot(template_id)
+        slot.acquire()
+        try:
+            future = self.executor.submit(self._run_in_worker, run)
+        except Exception:
+            slot.release()
+            raise
+        future.add_done_callback(lambda _: slot.release())
+        return future
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PrichRequestHandler(BaseHTTPRequestHandler):
+    """ Templates HTTP API: POST /templates/{id}/run, GET /templates, /metrics, /health """
+    server_version = "prich-serve"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def session(self) -> PrichSession:
+        return self.server.session
+
+    @property
+    def scheduler(self) -> RunScheduler:
+        return self.server.scheduler
+
+    def log_message(self, format, *args):
+        if getattr(self.server, "log_requests", False):
+            super().log_message(format, *args)
+
+    def _send_body(self, status: int, body: bytes, content_type: str, headers: dict = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: dict, headers: dict = None):
+        self._send_body(status, json.dumps(data, default=str).encode("utf-8"), "application/json", headers)
+
+    def _write_event(self, event: str, data: dict):
+        encoded = f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n".encode("utf-8")
+        self.wfile.write(f"{len(encoded):X}\r\n".encode("ascii") + encoded + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        path = urlparse(self.path).path.rstrip("/")
+        if path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif path == "/metrics":
+            gauges = {"prich_requests_pending": self.scheduler.pending, "prich_requests_running": self.scheduler.running}
+            self._send_body(200, self.server.metrics.render(gauges).encode("utf-8"), "text/plain; version=0.0.4")
+        elif path == "/templates":
+            self._send_json(200, {"templates": [
+                {"id": template.id, "name": template.name, "description": template.description,
+                 "variables": [variable.name for variable in template.variables or []]}
+                for template in self.session.get_templates()]})
+        else:
+            self._send_json(404, {"error": f"Not found: {path}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        match = RUN_PATH_PATTERN.match(url.path.rstrip("/"))
+        if not match:
+            self._send_json(404, {"error": f"Not found: {url.path}"})
+            return
+        template_id = match.group(1)
+        started = time.monotonic()
+        status = self._run(template_id, parse_qs(url.query))
+        self.server.metrics.observe(template_id, status, time.monotonic() - started)
+
+    def _read_variables(self) -> Optional[dict]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            variables = json.loads(self.rfile.read(length))
+        except ValueError:
+            return None
+        return variables if isinstance(variables, dict) else None
+
+    def _error_status(self, error: Exception) -> Tuple[int, dict]:
+        """
+        Failed run response status and headers: 400 for wrong variables (before the run), 503 with Retry-After for
+        provider rate limits, 502 for failures during the run (ex. provider errors), 500 for unexpected errors
+        """
+        import math
+        if isinstance(error, PrichError):
+            if error.kind == "input":
+                return 400, {}
+            if error.kind == "rate_limit":
+                retry_after = error.retry_after if error.retry_after is not None else self.server.retry_after
+                return 503, {"Retry-After": str(math.ceil(retry_after))}
+            if error.kind == "run":
+                return 502, {}
+        return 500, {}
+
+    def _run(self, template_id: str, query: dict) -> int:
+        """ Run template request, returns response status code """
+        variables = self._read_variables()
+        if variables is None:
+            self._send_json(400, {"error": "Request body should be a JSON object with template variables"})
+            return 400
+        try:
+            self.session.get_template(template_id)
+        except PrichError as e:
+            self._send_json(404, {"error": e.message})
+            return 404
+        if not self.scheduler.admit():
+            self._send_json(429, {"error": "Too many requests, queue is full"},
+                            headers={"Retry-After": str(self.server.retry_after)})
+            return 429
+        try:
+            stream = query.get("stream", [""])[0].lower() in ["1", "true"] or \
+                     "text/event-stream" in (self.headers.get("Accept") or "")
+            provider = query.get("provider", [None])[0]
+            chunks = queue.Queue() if stream else None
+            future = self.scheduler.submit(template_id, lambda llm_providers: self.session.run(
+                template_id, variables, provider=provider, output_sink=chunks.put if stream else None,
+                llm_providers=llm_providers))
+            if stream:
+                return self._stream_response(future, chunks)
+            try:
+                result = future.result()
+            except Exception as e:
+                status, headers = self._error_status(e)
+                self._send_json(status, {"error": e.message if isinstance(e, PrichError) else str(e)}, headers=headers)
+                return status
+            self._send_json(200, asdict(result))
+            return 200
+        finally:
+            self.scheduler.release()
+
+    def _stream_response(self, future: Future, chunks: queue.Queue) -> int:
+        """ Send final step output chunks as server-sent events, followed by the result (or error) event """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            while not (future.done() and chunks.empty()):
+                try:
+                    self._write_event("chunk", {"text": chunks.get(timeout=0.05)})
+                except queue.Empty:
+                    pass
+            try:
+                self._write_event("result", asdict(future.result()))
+                status = 200
+            except Exception as e:
+                # response status is already sent, the error status is passed in the event
+                status, headers = self._error_status(e)
+                self._write_event("error", {"error": e.message if isinstance(e, PrichError) else str(e), "status": status,
+                                            **({"retry_after": int(headers["Retry-After"])} if "Retry-After" in headers else {})})
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+            return status
+        except (BrokenPipeError, ConnectionResetError):
+            # client is gone, the run result is dropped
+            future.exception()
+            return 499
+
+
+def create_prich_server(session: PrichSession, host: str = "127.0.0.1", port: int = 0, scheduler: RunScheduler = None,
+                        retry_after: int = 1, log_requests: bool = False) -> ThreadingHTTPServer:
+    """ Create templates HTTP server (use port 0 to pick a free port, see server.server_address) """
+    server = ThreadingHTTPServer((host, port), PrichRequestHandler)
+    server.daemon_threads = True
+    server.session = session
+    server.scheduler = scheduler or RunScheduler()
+    server.metrics = ServerMetrics()
+    server.retry_after = retry_after
+    server.log_requests = log_requests
+    return server
@@ -0,0 +1,150 @@
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import click
+
+from prich.constants import PRICH_DIR_NAME
+from prich.core.run_context import RunContext, use_run_context
+from prich.core.run_result import RunResult
+from prich.models.config import ConfigModel
+from prich.models.template import TemplateModel
+
+
+class PrichError(click.ClickException):
+    """
+    prich session error (config/template loading or template run failure).
+
+    kind - "input" (wrong template variables), "run" (template run failure), "rate_limit" (provider rate limit,
+    retry_after seconds when known) or "error" (config/template loading).
+    """
+    def __init__(self, message: str, kind: str = "error", retry_after: float = None):
+        super().__init__(message)
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+class PrichSession:
+    """
+    Embeddable prich session with its own config, templates and env variables caches.
+
+    config_paths - config.yaml files merged in order (global+local prich configs by default),
+    template_roots - folders with templates (ex. ~/.prich/templates or a project folder with .prich/templates),
+                     later roots override templates with the same id (global+local prich templates by default),
+    run_context - run flags (quiet by default, nothing is printed).
+    Loaded config and templates are shared between runs, the session is safe to use from many threads.
+    """
+    def __init__(self, config_paths: List[str | Path] = None, template_roots: List[str | Path] = None,
+                 run_context: RunContext = None):
+        self.config_paths = [Path(path) for path in config_paths] if config_paths is not None else None
+        self.template_roots = [Path(path) for path in template_roots] if template_roots is not None else None
+        self.run_context = (run_context or RunContext(quiet=True)).replace(session=self)
+        self.jinja_env = {}
+        self._config: Optional[Tuple[ConfigModel, List[Path]]] = None
+        self._templates: Optional[Dict[str, TemplateModel]] = None
+        self._env_vars: Optional[Dict[str, str]] = None
+        self._lock = threading.RLock()
+
+    def _load_config(self) -> Tuple[ConfigModel, List[Path]]:
+        from prich.core.loaders import load_config_model, load_merged_config
+        from prich.models.utils import recursive_update
+
+        if self.config_paths is None:
+            return load_merged_config()
+        result = None
+        for config_path in self.config_paths:
+            config, _ = load_config_model(config_path)
+            if config is None:
+                raise PrichError(f"Failed to load config {config_path}, check if file exists and is correct.")
+            result = config if result is None else ConfigModel(**recursive_update(result, config).model_dump(exclude_none=True))
+        if result is None or not result.providers:
+            raise PrichError(f"No providers config found. Check config files: {[str(path) for path in self.config_paths]}")
+        return result, self.config_paths
+
+    def _load_templates(self) -> Dict[str, TemplateModel]:
+        from prich.core.loaders import load_templates, load_template_model
+
+        if self.template_roots is None:
+            return {template.id: template for template in load_templates()}
+        templates = {}
+        for root in self.template_roots:
+            templates_dir = root / PRICH_DIR_NAME / "templates" if (root / PRICH_DIR_NAME / "templates").is_dir() else root
+            if not templates_dir.is_dir():
+                raise PrichError(f"Templates folder {templates_dir} not found.")
+            for template_dir in sorted(templates_dir.iterdir()):
+                template_file = template_dir / f"{template_dir.name}.yaml"
+                if template_file.is_file():
+                    template = load_template_model(template_file)
+                    templates[template.id] = template
+        return templates
+
+    def get_config(self) -> Tuple[ConfigModel, List[Path]]:
+        config = self._config
+        if config is None:
+            with self._lock, use_run_context(self.run_context):
+                if self._config is None:
+                    self._config = self._load_config()
+                config = self._config
+        return config
+
+    def _get_templates(self) -> Dict[str, TemplateModel]:
+        templates = self._templates
+        if templates is None:
+            with self._lock, use_run_context(self.run_context):
+                if self._templates is None:
+                    self._templates = self._load_templates()
+                templates = self._templates
+        return templates
+
+    def get_templates(self) -> List[TemplateModel]:
+        return list(self._get_templates().values())
+
+    def get_template(self, template_id: str) -> TemplateModel:
+        templates = self._get_templates()
+        if template_id not in templates:
+            raise PrichError(f"Template {template_id} not found.")
+        return templates[template_id]
+
+    def get_env_vars(self) -> Dict[str, str]:
+        from prich.core.loaders import build_env_vars
+
+        env_vars = self._env_vars
+        if env_vars is None:
+            config, _ = self.get_config()
+            with self._lock:
+                if self._env_vars is None:
+                    self._env_vars = build_env_vars(config)
+                env_vars = self._env_vars
+        return env_vars
+
+    def reload(self):
+        """ Drop loaded config, templates and env variables (loaded again on the next use) """
+        with self._lock:
+            self._config = None
+            self._templates = None
+            self._env_vars = None
+            self.jinja_env = {}
+
+    def run(self, template_id: str, variables: Dict[str, any] = None, provider: str = None,
+            output_sink: Callable[[str], None] = None, llm_providers: dict = None) -> RunResult:
+        """
+        Run template with variables (by variable name), provider overrides the template/config one.
+
+        output_sink - callback receiving streamed chunks of the final step output,
+        llm_providers - provider instances cache reused between runs of one thread (warm clients and models),
+        returns RunResult with text output and variables.
+        """
+        from prich.core.engine import run_template, TemplateInputError
+        from prich.llm_providers.llm_provider_interface import ProviderRateLimitError
+
+        run_context = self.run_context.replace(provider=provider or self.run_context.provider, output_sink=output_sink)
+        try:
+            return run_template(template_id, run_context=run_context, variables=variables or {}, llm_providers=llm_providers).materialize()
+        except PrichError:
+            raise
+        except TemplateInputError as e:
+            raise PrichError(e.message, kind="input") from e
+        except ProviderRateLimitError as e:
+            raise PrichError(e.message, kind="rate_limit", retry_after=e.retry_after) from e
+        except click.ClickException as e:
+            raise PrichError(e.message, kind="run") from e
@@ -0,0 +1,139 @@
+import io
+import sys
+import threading
+import traceback
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click
+
+from prich.core.stream_output import StreamedOutput
+
+# loaded scripts modules by path: (mtime, module)
+_loaded_scripts = {}
+# sys.argv/path and os.environ are process wide, in process scripts run one at a time
+_in_process_lock = threading.RLock()
+# stdin/stdout/stderr of the in process script call running in the current thread
+_script_streams: ContextVar[Dict[str, io.StringIO] | None] = ContextVar("prich_script_streams", default=None)
+
+
+class _ThreadRoutedStream:
+    """ sys.stdin/stdout/stderr proxy, the in process script call thread uses its own streams, others the original one """
+    def __init__(self, name: str, original):
+        self._name = name
+        self._original = original
+
+    def _target(self):
+        streams = _script_streams.get()
+        return streams[self._name] if streams else self._original
+
+    def __getattr__(self, item):
+        return getattr(self._target(), item)
+
+    def __iter__(self):
+        return iter(self._target())
+
+
+def _install_stream_proxies():
+    """ Replace sys.stdin/stdout/stderr with thread routed proxies (once, again when replaced by someone else) """
+    for name in ("stdin", "stdout", "stderr"):
+        stream = getattr(sys, name)
+        if not isinstance(stream, _ThreadRoutedStream):
+            setattr(sys, name, _ThreadRoutedStream(name, stream))
+
+
+class _ScriptVariables(dict):
+    """ Variables passed to run(variables), streamed outputs are read as text when accessed """
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, StreamedOutput):
+            value = str(value)
+            super().__setitem__(key, value)
+        return value
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def copy(self):
+        return dict(self.items())
+
+
+def _load_script(script_path: Path):
+    """ Import script as a module (not __main__), reloaded when the file is changed """
+    import importlib.util
+
+    mtime = script_path.stat().st_mtime_ns
+    loaded = _loaded_scripts.get(str(script_path))
+    if loaded and loaded[0] == mtime:
+        return loaded[1]
+    module_name = f"prich_script_{abs(hash(str(script_path)))}_{script_path.stem}"
+    spec = importlib.util.spec_from_file_location(module_name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _loaded_scripts[str(script_path)] = (mtime, module)
+    return module
+
+
+def run_python_in_process(script_path: Path, args: List[str], stdin: str | None, variables: Dict[str, any],
+                          env_vars: Dict[str, str] = None) -> Tuple[str, int]:
+    """
+    Run python script in prich process calling its run(variables) -> str or main(argv) -> int function.
+
+    Variables are passed as python objects (streamed outputs are read as text when accessed), stdout and stderr
+    writes of the calling thread are captured, run() result is appended to the captured output.
+    env_vars are set in os.environ during the call.
+    """
+    import os
+
+    output = io.StringIO()
+    exit_code = 0
+    with _in_process_lock:
+        saved = sys.argv, list(sys.path)
+        saved_env = {name: os.environ.get(name) for name in env_vars or {}}
+        _install_stream_proxies()
+        streams_token = _script_streams.set({"stdin": io.StringIO(stdin or ""), "stdout": output, "stderr": output})
+        try:
+            os.environ.update(env_vars or {})
+            sys.path.insert(0, str(script_path.parent))
+            sys.argv = [str(script_path), *args]
+            try:
+                module = _load_script(script_path)
+            except Exception as e:
+                raise click.ClickException(f"Failed to load python script {script_path}: {type(e).__name__}: {e}")
+            run, main = getattr(module, "run", None), getattr(module, "main", None)
+            if not callable(run) and not callable(main):
+                raise click.ClickException(f"Python script {script_path} should define run(variables) or main(argv) function to run in_process.")
+            try:
+                if callable(run):
+                    result = run(_ScriptVariables(variables))
+                    if result is not None:
+                        output.write(str(result))
+                else:
+                    result = main(args)
+                    exit_code = result if isinstance(result, int) else 0
+            except SystemExit as e:
+                if isinstance(e.code, int) or e.code is None:
+                    exit_code = e.code or 0
+                else:
+                    output.write(f"{e.code}\n")
+                    exit_code = 1
+            except Exception:
+                traceback.print_exc(file=output)
+                exit_code = 1
+        finally:
+            _script_streams.reset(streams_token)
+            sys.argv = saved[0]
+            sys.path[:] = saved[1]
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    return output.getvalue(), exit_code
@@ -1,14 +1,293 @@
+import re
 from pathlib import Path
 from typing import Dict, Tuple
 
 import click
 from prich.core.loaders import get_env_vars
-from prich.core.utils import get_prich_dir, is_just_filename, is_verbose, console_print, is_quiet, is_only_final_output
-from prich.models.template import TemplateModel, PythonStep, CommandStep
+from prich.core.stream_output import StreamedOutput, LineFilter
+from prich.core.utils import get_prich_dir, is_just_filename, is_verbose, console_print, is_quiet, is_only_final_output, \
+    is_print_enabled
+from prich.models.template import TemplateModel, PythonStep, CommandStep, CommandPipelineStep, RLimitsModel
 from prich.core.variable_utils import expand_vars
 
 
-def run_command_step(template: TemplateModel, step: PythonStep | CommandStep, variables: Dict[str, any]) -> Tuple[str, int]:
+def get_stdin_source(step: PythonStep | CommandStep | CommandPipelineStep, variables: Dict[str, any]) -> StreamedOutput | str | None:
+    """ Prepare stdin data, streamed variable is passed as is when stdin is just a single variable reference """
+    if step.stdin is None:
+        return None
+    single_var = re.fullmatch(r"\s*\{\{\s*([A-Za-z0-9_]+)\s*\}\}\s*", step.stdin)
+    if single_var and isinstance(variables.get(single_var.group(1)), StreamedOutput):
+        return variables.get(single_var.group(1))
+    return expand_vars([step.stdin], variables=variables, env_vars=get_env_vars())[0]
+
+
+def feed_stdin(pipe, source: StreamedOutput | str):
+    try:
+        if isinstance(source, StreamedOutput):
+            for chunk in source.iter_bytes():
+                pipe.write(chunk)
+        else:
+            pipe.write(source.encode("utf-8"))
+    except BrokenPipeError:
+        pass  # process stopped reading its input
+    finally:
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
+
+
+def _run_streamed(cmd: list, step: PythonStep | CommandStep, stdin_source, env: dict) -> Tuple[StreamedOutput, int]:
+    """ Run command reading its output by chunks, tee output to the step output file and console """
+    import codecs
+    import subprocess
+    import sys
+    import threading
+
+    stream_options = step.output_stream
+    output = StreamedOutput(spool_max_size=stream_options.spool_max_size, chunk_size=stream_options.chunk_size)
+    line_filter = LineFilter(stream_options.line_match, stream_options.line_not_match) \
+        if stream_options.line_match or stream_options.line_not_match else None
+    tee_console = (step.output_console or is_verbose()) and is_print_enabled()
+    tee_file = None
+    if step.output_file and step.output_file.name and not step.filter:
+        write_mode = step.output_file.mode[:1] if step.output_file.mode else 'w'
+        try:
+            tee_file = open(step.output_file.name, write_mode)
+        except Exception as e:
+            raise click.ClickException(f"Failed to save output to file {step.output_file.name}: {e}")
+        if is_verbose():
+            console_print(f"[dim]{'Save' if write_mode == 'w' else 'Append'} output to file: {step.output_file.name}[/dim]")
+
+    decoder = codecs.getincrementaldecoder(output.encoding)(errors="replace")
+
+    def handle_text(text: str):
+        if line_filter:
+            text = line_filter.feed(text) if text is not None else line_filter.flush()
+            if text:
+                output.write(text.encode(output.encoding))
+        if text:
+            if tee_file:
+                tee_file.write(text)
+            if tee_console:
+                sys.stdout.write(text)
+                sys.stdout.flush()
+
+    timer = None
+    timed_out = threading.Event()
+    process = None
+    popen_kwargs = _process_limits_kwargs(step)
+    try:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   stdin=subprocess.PIPE if stdin_source is not None else None, env=env,
+                                   **popen_kwargs)
+        if step.timeout:
+            timer = threading.Timer(step.timeout, lambda: (timed_out.set(), _kill_process_group(process)))
+            timer.daemon = True
+            timer.start()
+        stdin_thread = None
+        if stdin_source is not None:
+            stdin_thread = threading.Thread(target=feed_stdin, args=(process.stdin, stdin_source), daemon=True)
+            stdin_thread.start()
+        while True:
+            chunk = process.stdout.read1(output.chunk_size)
+            if not chunk:
+                break
+            if not line_filter:
+                output.write(chunk)
+            handle_text(decoder.decode(chunk))
+        handle_text(decoder.decode(b"", final=True))
+        if line_filter:
+            handle_text(None)
+        process.stdout.close()
+        return_code = process.wait()
+        if stdin_thread:
+            stdin_thread.join()
+    except BaseException:
+        # read loop failed (tee write error, interrupt): don't leave the process running or the spool file open
+        if process is not None and process.poll() is None:
+            if popen_kwargs.get("start_new_session"):
+                _kill_process_group(process)
+            else:
+                process.kill()
+            process.wait()
+        output.close()
+        raise
+    finally:
+        if timer:
+            timer.cancel()
+        if tee_file:
+            tee_file.close()
+    if timed_out.is_set():
+        output.close()
+        raise click.ClickException(f"Step '{step.name}' timed out after {step.timeout:g} seconds")
+    output.teed_file = tee_file is not None
+    output.teed_console = tee_console
+    return output, return_code
+
+
+def _rlimits_preexec(rlimits: RLimitsModel):
+    """ preexec_fn setting the process resource limits (not above the current hard limits) """
+    try:
+        import resource
+    except ImportError:
+        raise click.ClickException("Step rlimits are not supported on this platform.")
+    limits = []
+    for name, value in [("RLIMIT_CPU", rlimits.cpu_seconds), ("RLIMIT_AS", rlimits.address_space_bytes),
+                        ("RLIMIT_NOFILE", rlimits.open_files)]:
+        if value is None:
+            continue
+        limit = getattr(resource, name)
+        _, hard = resource.getrlimit(limit)
+        limits.append((limit, value if hard == resource.RLIM_INFINITY else min(value, hard)))
+
+    def preexec():
+        for limit, value in limits:
+            resource.setrlimit(limit, (value, value))
+    return preexec
+
+
+def _process_limits_kwargs(step: PythonStep | CommandStep) -> dict:
+    """ Popen kwargs for limited steps: own process group (killed as a whole) and rlimits """
+    kwargs = {}
+    if step.timeout or step.max_output_bytes or step.rlimits:
+        kwargs["start_new_session"] = True
+    if step.rlimits:
+        kwargs["preexec_fn"] = _rlimits_preexec(step.rlimits)
+    return kwargs
+
+
+def _kill_process_group(process):
+    """ Kill the process with its child processes (process group leader started with start_new_session) """
+    import os
+    import signal
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (AttributeError, ProcessLookupError, PermissionError):
+        try:
+            process.kill()
+        except OSError:
+            pass
+
+
+def _run_limited(cmd: list, step: PythonStep | CommandStep, stdin_source, env: dict, variables: Dict[str, any]) -> Tuple[str, int]:
+    """
+    Run command with timeout, max_output_bytes and rlimits, stdout and stderr (stderr_variable) are decoded
+    incrementally while they are read
+    """
+    import codecs
+    import subprocess
+    import threading
+
+    limit = step.max_output_bytes
+    exceeded = threading.Event()
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                               stderr=subprocess.PIPE if step.stderr_variable else subprocess.STDOUT,
+                               stdin=subprocess.PIPE if stdin_source is not None else None, env=env,
+                               **_process_limits_kwargs(step))
+
+    def capture(pipe, parts: list):
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        size = 0
+        while chunk := pipe.read1(64 * 1024):
+            if limit is not None and size + len(chunk) > limit:
+                chunk = chunk[:limit - size]
+                if not exceeded.is_set():
+                    exceeded.set()
+                    if step.on_max_output == "error":
+                        _kill_process_group(process)
+            size += len(chunk)
+            if chunk:
+                parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+        pipe.close()
+
+    stdout_parts, stderr_parts = [], []
+    threads = [threading.Thread(target=capture, args=(process.stdout, stdout_parts), daemon=True)]
+    if step.stderr_variable:
+        threads.append(threading.Thread(target=capture, args=(process.stderr, stderr_parts), daemon=True))
+    if stdin_source is not None:
+        threads.append(threading.Thread(target=feed_stdin, args=(process.stdin, stdin_source), daemon=True))
+    for thread in threads:
+        thread.start()
+    timed_out = False
+    try:
+        return_code = process.wait(timeout=step.timeout)
+    except subprocess.TimeoutExpired:
+        timed_out = True
+        _kill_process_group(process)
+        return_code = process.wait()
+    except BaseException:
+        _kill_process_group(process)
+        process.wait()
+        raise
+    for thread in threads:
+        thread.join()
+
+    if timed_out:
+        raise click.ClickException(f"Step '{step.name}' timed out after {step.timeout:g} seconds")
+    if exceeded.is_set():
+        if step.on_max_output == "error":
+            raise click.ClickException(f"Step '{step.name}' output exceeded max_output_bytes ({limit} bytes)")
+        if not is_quiet():
+            console_print(f"[yellow]Step '{step.name}' output truncated to {limit} bytes.[/yellow]")
+    if step.stderr_variable:
+        variables[step.stderr_variable] = "".join(stderr_parts)
+    return "".join(stdout_parts), return_code
+
+
+def resolve_command_call(template_dir: Path, call: str) -> str:
+    """ Command file from the template scripts folder when present, otherwise the call as is (ex. from PATH) """
+    if is_just_filename(call) and (template_dir / "scripts" / call).exists():
+        return str(template_dir / "scripts" / call)
+    return call
+
+
+def get_step_env(step: PythonStep | CommandStep | CommandPipelineStep, variables: Dict[str, any]) -> Dict[str, str]:
+    """ Step env_vars with rendered values """
+    if not step.env_vars:
+        return {}
+    names = list(step.env_vars.keys())
+    values = expand_vars(list(step.env_vars.values()), variables=variables, env_vars=get_env_vars())
+    return {name: str(value) if value is not None else "" for name, value in zip(names, values)}
+
+
+def _write_vars_file(step: PythonStep | CommandStep, variables: Dict[str, any]) -> Path:
+    """ Write selected variables (streamed outputs as text) to a private temporary json file, removed after the step """
+    import json
+    import os
+    import tempfile
+
+    names = step.vars_file.variables if step.vars_file.variables is not None else list(variables.keys())
+    missing = [name for name in names if name not in variables]
+    if missing:
+        raise click.ClickException(f"Step '{step.name}' vars_file variables are not defined: {', '.join(missing)}")
+    fd, path = tempfile.mkstemp(prefix="prich-vars-", suffix=f".{step.vars_file.format}")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({name: str(variables[name]) if isinstance(variables[name], StreamedOutput) else variables[name]
+                       for name in names}, f, default=str)
+    except Exception:
+        os.unlink(path)
+        raise
+    return Path(path)
+
+
+def _run_in_worker(cmd: list, step: PythonStep, stdin_source, env: dict) -> Tuple[str, int]:
+    """ Run python script in a warm worker process of the python interpreter """
+    import os
+    from prich.core.python_worker import get_python_worker_pool, DEFAULT_WORKER_MAX_CALLS
+
+    python_path, script, args = cmd[0], cmd[1], cmd[2:]
+    if os.sep not in python_path:
+        import shutil
+        python_path = shutil.which(python_path) or python_path
+    return get_python_worker_pool().run(python_path, script, args, str(stdin_source) if stdin_source is not None else None,
+                                        env=dict(env) if env is not None else dict(os.environ), cwd=os.getcwd(),
+                                        max_calls=step.worker.max_calls or DEFAULT_WORKER_MAX_CALLS)
+
+
+def run_command_step(template: TemplateModel, step: PythonStep | CommandStep, variables: Dict[str, any]) -> Tuple[str | StreamedOutput, int]:
     import subprocess
     from rich.console import Console
     console = Console()
@@ -40,25 +319,55 @@ def run_command_step(template: TemplateModel, step: PythonStep | CommandStep, va
         else:
             raise click.ClickException(f"Python script venv {template.venv} is not supported.")
     elif isinstance(step, CommandStep) and step.type == "command":
-        if is_just_filename(method) and (template_dir / "scripts" / method).exists():
-            cmd = [str(template_dir / "scripts" / method)]
-        else:
-            cmd = [method]
+        cmd = [resolve_command_call(template_dir, method)]
     else:
         raise click.ClickException(f"Template command step type {step.type} is not supported.")
 
     # Inputs / Variables List
     expanded_args = expand_vars(step.args, variables=variables, env_vars=get_env_vars())
     [cmd.append(arg) for arg in expanded_args if arg is not None and arg != ""]
+    stdin_source = get_stdin_source(step, variables)
+    step_env = get_step_env(step, variables)
+    vars_file = _write_vars_file(step, variables) if step.vars_file else None
+    if vars_file:
+        step_env[step.vars_file.env_var] = str(vars_file)
+    env = {**get_env_vars(), **step_env} if step_env else get_env_vars()
 
     try:
+        if isinstance(step, PythonStep) and step.in_process:
+            from prich.core.steps.step_python_in_process import run_python_in_process
+            if template.venv:
+                raise click.ClickException(f"Python step in_process is supported only in templates without venv, {template.id} template uses {template.venv} venv.")
+            if is_verbose():
+                console_print(f"[dim]Execute {step.type} in process [green]{' '.join(cmd[1:])}[/green][/dim]")
+            return run_python_in_process(method_path, cmd[2:], str(stdin_source) if stdin_source is not None else None,
+                                         variables, env_vars=step_env)
+
         if is_verbose():
             console_print(f"[dim]Execute {step.type} [green]{' '.join(cmd)}[/green][/dim]")
+        if step.output_stream:
+            return _run_streamed(cmd, step, stdin_source, env)
+        if isinstance(step, PythonStep) and step.worker:
+            if not is_quiet() and not is_only_final_output():
+                with console.status("Processing..."):
+                    return _run_in_worker(cmd, step, stdin_source, env)
+            return _run_in_worker(cmd, step, stdin_source, env)
+        if step.timeout or step.max_output_bytes or step.rlimits or step.stderr_variable:
+            if not is_quiet() and not is_only_final_output():
+                with console.status("Processing..."):
+                    return _run_limited(cmd, step, stdin_source, env, variables)
+            return _run_limited(cmd, step, stdin_source, env, variables)
+        run_kwargs = {"input": str(stdin_source)} if stdin_source is not None else {}
         if not is_quiet() and not is_only_final_output():
             with console.status("Processing..."):
-                result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, env=get_env_vars())
+                result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, env=env, **run_kwargs)
         else:
-            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, env=get_env_vars())
+            result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, check=False, env=env, **run_kwargs)
         return result.stdout, result.returncode
+    except click.ClickException:
+        raise
     except Exception as e:
         raise click.ClickException(f"Unexpected error in {method}: {str(e)}")
+    finally:
+        if vars_file:
+            vars_file.unlink(missing_ok=True)
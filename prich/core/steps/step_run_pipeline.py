@@ -0,0 +1,94 @@
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click
+
+from prich.core.loaders import get_env_vars
+from prich.core.steps.step_run_command import resolve_command_call, get_stdin_source, get_step_env, feed_stdin
+from prich.core.utils import is_verbose, console_print, is_quiet, is_only_final_output
+from prich.core.variable_utils import expand_vars
+from prich.models.template import TemplateModel, CommandPipelineStep
+
+
+def pipeline_exit_code(exit_codes: List[int]) -> int:
+    """ Pipeline exit code like shell with pipefail: the last non-zero command exit code """
+    return next((code for code in reversed(exit_codes) if code != 0), 0)
+
+
+def _run_pipeline(cmds: List[List[str]], stdin_source, env: dict) -> Tuple[str, List[int], str]:
+    """ Start commands connected by OS pipes, returns the last command stdout, exit codes and commands stderr """
+    processes = []
+    stdin_thread = None
+    with tempfile.TemporaryFile() as stderr_file:
+        try:
+            previous_stdout = None
+            for idx, cmd in enumerate(cmds):
+                if idx == 0:
+                    stdin = subprocess.PIPE if stdin_source is not None else None
+                else:
+                    stdin = previous_stdout
+                process = subprocess.Popen(cmd, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr_file, env=env)
+                processes.append(process)
+                if previous_stdout is not None:
+                    # only the next command reads it, so the previous one gets SIGPIPE when the next one exits
+                    previous_stdout.close()
+                previous_stdout = process.stdout
+            if stdin_source is not None:
+                stdin_thread = threading.Thread(target=feed_stdin, args=(processes[0].stdin, stdin_source), daemon=True)
+                stdin_thread.start()
+            output = processes[-1].stdout.read()
+            processes[-1].stdout.close()
+            exit_codes = [process.wait() for process in processes]
+            if stdin_thread:
+                stdin_thread.join()
+        except BaseException:
+            for process in processes:
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+            raise
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode("utf-8", errors="replace")
+    return output.decode("utf-8", errors="replace"), exit_codes, stderr
+
+
+def run_pipeline_step(template: TemplateModel, step: CommandPipelineStep, variables: Dict[str, any]) -> Tuple[str, int, List[int]]:
+    """ Run pipeline step commands without shell, returns the last command output, pipeline exit code and commands exit codes """
+    from rich.console import Console
+    from rich.markup import escape
+
+    try:
+        template_dir = Path(template.folder)
+    except Exception as e:
+        raise click.ClickException(f"Template folder was not detected properly: {e}")
+
+    cmds = []
+    for command in step.commands:
+        expanded_args = expand_vars(command.args, variables=variables, env_vars=get_env_vars())
+        cmds.append([resolve_command_call(template_dir, command.call),
+                     *[arg for arg in expanded_args if arg is not None and arg != ""]])
+    stdin_source = get_stdin_source(step, variables)
+    step_env = get_step_env(step, variables)
+    env = {**get_env_vars(), **step_env} if step_env else get_env_vars()
+
+    if is_verbose():
+        console_print(f"[dim]Execute pipeline [green]{escape(' | '.join(' '.join(cmd) for cmd in cmds))}[/green][/dim]")
+    try:
+        if not is_quiet() and not is_only_final_output():
+            with Console().status("Processing..."):
+                output, exit_codes, stderr = _run_pipeline(cmds, stdin_source, env)
+        else:
+            output, exit_codes, stderr = _run_pipeline(cmds, stdin_source, env)
+    except FileNotFoundError as e:
+        raise click.ClickException(f"Pipeline command not found: {e.filename}")
+    except Exception as e:
+        raise click.ClickException(f"Unexpected error in pipeline: {str(e)}")
+    exit_code = pipeline_exit_code(exit_codes)
+    if is_verbose():
+        console_print(f"[dim]Pipeline exit codes: {exit_codes}[/dim]")
+    if stderr and (is_verbose() or exit_code != 0) and not is_quiet():
+        console_print(f"[dim]{escape(stderr.rstrip())}[/dim]")
+    return output, exit_code, exit_codes
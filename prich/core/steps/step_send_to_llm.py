@@ -1,14 +1,236 @@
+import threading
+
 import click
 
-from prich.core.template_utils import render_prompt, render_prompt_fields
-from prich.core.utils import is_verbose, console_print, is_quiet, is_only_final_output
-from prich.models.config import ConfigModel
+from prich.core.template_utils import render_prompt, render_prompt_fields, render_template_text
+from prich.core.utils import is_verbose, console_print, is_quiet, is_only_final_output, is_print_enabled, quiet_thread, \
+    print_plain
+from prich.llm_providers.llm_provider_interface import ProviderRateLimitError
+from prich.models.config import ConfigModel, ProviderConfig
+from prich.models.config_providers import ProviderGroupModel
 from prich.models.template import TemplateModel, LLMStep
 
+DEFAULT_CHUNK_RESERVE_TOKENS = 1024
+DEFAULT_CHUNK_OVERLAP_TOKENS = 100
+DEFAULT_CHUNK_MAX_CONCURRENCY = 4
+
+# provider instances caches could be used by threads (chunks, provider group members)
+_llm_providers_lock = threading.Lock()
 
-def send_to_llm(template: TemplateModel, step: LLMStep, provider: str|None, config: ConfigModel, variables: dict) -> str:
+def _get_provider_instance(provider_name: str, provider_config: ProviderConfig, llm_providers: dict = None):
+    """ Get LLM provider instance, reused from the run-scoped cache when available (wrapped to record/replay cassettes) """
+    from prich.core.run_context import get_run_context
+    from prich.llm_providers.cassette_provider import CassetteProvider
     from prich.llm_providers.get_llm_provider import get_llm_provider
 
+    run_context = get_run_context()
+    if run_context.replay_dir:
+        # provider is not called when replaying responses
+        return CassetteProvider(provider_name, provider_config, None, run_context.replay_dir, replay=True,
+                                replay_timing=run_context.replay_timing)
+    with _llm_providers_lock:
+        cached = llm_providers.get(provider_name) if llm_providers is not None else None
+        if cached:
+            llm_provider, show_response = cached
+            llm_provider.show_response = show_response
+        else:
+            llm_provider = get_llm_provider(provider_name, provider_config)
+            if llm_providers is not None:
+                llm_providers[provider_name] = (llm_provider, llm_provider.show_response)
+    if run_context.record_dir:
+        llm_provider = CassetteProvider(provider_name, provider_config, llm_provider, run_context.record_dir)
+    return llm_provider
+
+
+def _get_prompt_text(step: LLMStep) -> str:
+    """ Full rendered prompt text """
+    prompt_lines = []
+    if step.rendered_prompt:
+        prompt_lines.append(step.rendered_prompt)
+    else:
+        if step.rendered_instructions:
+            prompt_lines.append(step.rendered_instructions)
+        if step.rendered_input:
+            prompt_lines.append(step.rendered_input)
+    return '\n'.join(prompt_lines)
+
+
+def _check_prompt_budget(step: LLMStep, provider_name: str, provider_config: ProviderConfig, prompt_text: str):
+    """ Check rendered prompt size against the provider context_tokens """
+    from prich.core.tokenizer import get_tokenizer
+
+    if not provider_config.context_tokens:
+        return
+    tokenizer = get_tokenizer(provider_config)
+    prompt_tokens = tokenizer.count(prompt_text)
+    if prompt_tokens > provider_config.context_tokens:
+        raise click.ClickException(f"Prompt of step {step.name} has {prompt_tokens} tokens ({tokenizer.name}), it exceeds provider {provider_name} context_tokens {provider_config.context_tokens}. Use llm step 'chunking' to split the input.")
+
+
+def _reset_providers(llm_providers: dict | None):
+    """ Drop conversation state of cached provider instances """
+    with _llm_providers_lock:
+        cached = list((llm_providers or {}).values())
+    for llm_provider, _ in cached:
+        llm_provider.reset()
+
+
+def _send_chunked(template: TemplateModel, step: LLMStep, provider: str | None, provider_name: str, provider_config: ProviderConfig, config: ConfigModel, variables: dict, llm_providers: dict = None) -> str | None:
+    """ Split oversized step input into chunks sent separately (map) and combine their outputs (reduce), returns None when input fits """
+    from concurrent.futures import ThreadPoolExecutor
+    from prich.core.run_context import with_run_context
+    from prich.core.tokenizer import get_tokenizer
+
+    chunking = step.chunking
+    tokenizer = get_tokenizer(provider_config)
+    if chunking.variable:
+        if chunking.variable not in variables:
+            raise click.ClickException(f"Chunking variable {chunking.variable} is not found in step {step.name}.")
+        text = str(variables.get(chunking.variable) or "")
+        map_input = step.input
+    else:
+        text = render_template_text(step.input, variables)
+        map_input = "{{ chunk }}"
+    if chunking.chunk_tokens:
+        chunk_tokens = chunking.chunk_tokens
+    elif provider_config.context_tokens:
+        empty_chunk_variables = {**variables, "chunk": "", "chunk_index": 0, "chunks_count": 0,
+                                 **({chunking.variable: ""} if chunking.variable else {})}
+        prompt_tokens = tokenizer.count(render_template_text(step.instructions, empty_chunk_variables)) + \
+                        tokenizer.count(render_template_text(map_input, empty_chunk_variables))
+        reserve_tokens = chunking.reserve_tokens if chunking.reserve_tokens is not None else \
+            min(DEFAULT_CHUNK_RESERVE_TOKENS, provider_config.context_tokens // 4)
+        chunk_tokens = provider_config.context_tokens - prompt_tokens - reserve_tokens
+        if chunk_tokens <= 0:
+            raise click.ClickException(f"Step {step.name} prompt without input chunk ({prompt_tokens} tokens) and reserve_tokens ({reserve_tokens}) don't fit provider {provider_name} context_tokens {provider_config.context_tokens}.")
+    else:
+        # input size limit is unknown, sending the whole input could be silently truncated by the model
+        raise click.ClickException(f"Step {step.name} chunking requires chunking chunk_tokens or provider {provider_name} context_tokens.")
+    if tokenizer.count(text) <= chunk_tokens:
+        return None
+
+    overlap_tokens = chunking.overlap_tokens if chunking.overlap_tokens is not None else DEFAULT_CHUNK_OVERLAP_TOKENS
+    chunks = tokenizer.split(text, chunk_tokens, overlap_tokens)
+    # local models process prompts one by one
+    max_concurrency = 1 if provider_config.provider_type == "mlx_local" else \
+        chunking.max_concurrency or DEFAULT_CHUNK_MAX_CONCURRENCY
+    if is_verbose():
+        console_print(f"[dim]Split step {step.name} input into {len(chunks)} chunks of up to {chunk_tokens} tokens ({tokenizer.name}), concurrency {max_concurrency}[/dim]")
+
+    thread_providers = threading.local()
+
+    def get_chunk_providers() -> dict | None:
+        # concurrent chunks use provider instances of their worker thread (instances keep state like reused context
+        # and show_response), sequential chunks (local models) reuse the run instances
+        if max_concurrency == 1:
+            return llm_providers
+        if not hasattr(thread_providers, "cache"):
+            thread_providers.cache = {}
+        return thread_providers.cache
+
+    def send_chunk(index: int, chunk: str) -> str:
+        chunk_step = step.model_copy(update={"name": f"{step.name} [chunk {index}/{len(chunks)}]", "input": map_input,
+                                             "chunking": None, "output_console": False})
+        chunk_variables = {**variables, "chunk": chunk, "chunk_index": index, "chunks_count": len(chunks)}
+        if chunking.variable:
+            chunk_variables[chunking.variable] = chunk
+        chunk_providers = get_chunk_providers()
+        # each chunk is sent without context left by previous prompts
+        _reset_providers(chunk_providers)
+        with quiet_thread():
+            return send_to_llm(template, chunk_step, provider, config, chunk_variables, llm_providers=chunk_providers)
+
+    if is_print_enabled():
+        from rich.console import Console
+        status = Console().status(f"Processing {len(chunks)} chunks...")
+    else:
+        from contextlib import nullcontext
+        status = nullcontext()
+    with status, ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        chunk_outputs = list(executor.map(with_run_context(lambda args: send_chunk(*args)), enumerate(chunks, 1)))
+
+    if chunking.reduce:
+        if max_concurrency == 1:
+            _reset_providers(llm_providers)
+        reduce_step = step.model_copy(update={"name": f"{step.name} [reduce]", "input": chunking.reduce, "chunking": None})
+        return send_to_llm(template, reduce_step, provider, config, {**variables, "chunk_outputs": chunk_outputs}, llm_providers=llm_providers)
+    step_output = "\n\n".join(chunk_outputs)
+    if (is_verbose() or step.output_console) and is_print_enabled():
+        print_plain(step_output)
+    return step_output
+
+
+def _send_prompt(llm_provider, provider_name: str, provider_config: ProviderConfig, prompt_fields: dict) -> str:
+    """ Send prompt holding a cross-process provider slot when provider max_concurrency is set """
+    if not provider_config.max_concurrency:
+        return llm_provider.send_prompt(**prompt_fields)
+    from prich.llm_providers.provider_group import ProviderStatsStore
+    from prich.llm_providers.provider_slots import ProviderSlot
+
+    with ProviderSlot(provider_name, provider_config.max_concurrency) as slot:
+        if is_verbose():
+            console_print(f"[dim]Provider {provider_name} slot wait {slot.wait_ms} ms (max_concurrency {provider_config.max_concurrency})[/dim]")
+        stats = ProviderStatsStore()
+        stats.record_slot_wait(provider_name, slot.wait_ms)
+        stats.save()
+        return llm_provider.send_prompt(**prompt_fields)
+
+
+def _send_member_prompt(llm_provider, provider_name: str, provider_config: ProviderConfig, prompt_fields: dict) -> str:
+    return provider_config.postprocess_filter(_send_prompt(llm_provider, provider_name, provider_config, prompt_fields))
+
+
+def _send_to_provider_group(step: LLMStep, group_name: str, group: ProviderGroupModel, config: ConfigModel, variables: dict, llm_providers: dict = None) -> str:
+    """ Send LLM step prompt to provider group members using the group strategy """
+    from functools import partial
+    from prich.llm_providers.provider_group import ProviderStatsStore, send_to_provider_group
+
+    calls = {}
+    for member_name in group.providers:
+        member = config.providers.get(member_name)
+        if not member:
+            raise click.ClickException(f"Provider {member_name} (group {group_name} member) configuration not found. Check your config.yaml file.")
+        if isinstance(member, ProviderGroupModel):
+            raise click.ClickException(f"Provider group {group_name} member {member_name} should not be a provider group.")
+        # member providers could use different prompt modes
+        step.rendered_prompt = step.rendered_instructions = step.rendered_input = None
+        if member.mode:
+            render_prompt(config, step, variables, member.mode)
+        else:
+            render_prompt_fields(step, variables)
+        if not step.rendered_prompt and not step.rendered_input:
+            raise click.ClickException(f"Prompt is empty in step {step.name}.")
+        _check_prompt_budget(step, member_name, member, _get_prompt_text(step))
+        llm_provider = _get_provider_instance(member_name, member, llm_providers)
+        # members could run concurrently, the response is printed once when received
+        llm_provider.show_response = False
+        calls[member_name] = partial(_send_member_prompt, llm_provider, member_name, member,
+                                     {"prompt": step.rendered_prompt, "instructions": step.rendered_instructions, "input_": step.rendered_input})
+
+    if is_verbose():
+        console_print(f"[dim]Sending prompt to LLM provider group ([green]{group_name}[/green], {group.strategy}): {', '.join(group.providers)}[/dim]")
+    try:
+        if not is_quiet() and not is_only_final_output() and is_print_enabled():
+            from rich.console import Console
+            console = Console()
+            with console.status("Thinking..."):
+                member_name, response, latency_ms = send_to_provider_group(group_name, group, calls, ProviderStatsStore())
+        else:
+            member_name, response, latency_ms = send_to_provider_group(group_name, group, calls, ProviderStatsStore())
+        step_output = group.postprocess_filter(response)
+    except ProviderRateLimitError as e:
+        raise ProviderRateLimitError(f"Failed to get LLM response: {e.message}", retry_after=e.retry_after)
+    except Exception as e:
+        raise click.ClickException(f"Failed to get LLM response: {str(e)}")
+    if is_verbose():
+        console_print(f"[dim]LLM Response ([green]{member_name}[/green], {latency_ms} ms):[/dim]")
+    if (is_verbose() or step.output_console) and not is_quiet():
+        print_plain(step_output)
+    return step_output
+
+
+def send_to_llm(template: TemplateModel, step: LLMStep, provider: str|None, config: ConfigModel, variables: dict, llm_providers: dict = None) -> str:
+    """ Send LLM step prompt, llm_providers is an optional run-scoped cache of provider instances reused between steps """
     if not step.input:
         raise click.ClickException("llm step must define at least 'input' field.")
     # Use Provider from arg overload
@@ -28,6 +250,12 @@ def send_to_llm(template: TemplateModel, step: LLMStep, provider: str|None, conf
         raise click.ClickException(f"Provider {f'{selected_provider_name} ' if selected_provider_name else ''}configuration not found. Check your config.yaml file.")
     if is_verbose():
         console_print(f"Selected LLM provider: {selected_provider_name}")
+    if step.chunking:
+        chunked_output = _send_chunked(template, step, provider, selected_provider_name, selected_provider, config, variables, llm_providers)
+        if chunked_output is not None:
+            return chunked_output
+    if isinstance(selected_provider, ProviderGroupModel):
+        return _send_to_provider_group(step, selected_provider_name, selected_provider, config, variables, llm_providers)
 
     if selected_provider.mode:
         render_prompt(config, step, variables, selected_provider.mode)
@@ -35,47 +263,33 @@ def send_to_llm(template: TemplateModel, step: LLMStep, provider: str|None, conf
         render_prompt_fields(step, variables)
     if not step.rendered_prompt and not step.rendered_input:
         raise click.ClickException(f"Prompt is empty in step {step.name}.")
+    prompt_full = _get_prompt_text(step)
+    _check_prompt_budget(step, selected_provider_name, selected_provider, prompt_full)
 
-    llm_provider = get_llm_provider(selected_provider_name, selected_provider)
+    llm_provider = _get_provider_instance(selected_provider_name, selected_provider, llm_providers)
     if ((not step.output_console and not is_verbose()) or is_quiet()) and llm_provider.show_response:
         # Override show response when quiet mode
         llm_provider.show_response = False
 
-    # prompt lines
-    prompt_lines = []
-    if step.rendered_prompt:
-        prompt_lines.append(step.rendered_prompt)
-    else:
-        if step.rendered_instructions:
-            prompt_lines.append(step.rendered_instructions)
-        if step.rendered_input:
-            prompt_lines.append(step.rendered_input)
-    prompt_full = '\n'.join(prompt_lines)
-
     if is_verbose():
         console_print(f"[dim]Sending prompt to LLM ([green]{llm_provider.name}[/green]), {len(prompt_full)} chars[/dim]")
-        console_print(prompt_full, markup=False)
+        print_plain(prompt_full)
         console_print()
         console_print("[dim]LLM Response:[/dim]")
+    prompt_fields = {"prompt": step.rendered_prompt, "instructions": step.rendered_instructions, "input_": step.rendered_input}
     try:
-        if not is_quiet() and not is_only_final_output() and not llm_provider.show_response:
+        if not is_quiet() and not is_only_final_output() and is_print_enabled() and not llm_provider.show_response:
             from rich.console import Console
             console = Console()
             with console.status("Thinking..."):
-                response = llm_provider.send_prompt(
-                    prompt=step.rendered_prompt,
-                    instructions=step.rendered_instructions,
-                    input_=step.rendered_input
-                )
+                response = _send_prompt(llm_provider, selected_provider_name, selected_provider, prompt_fields)
         else:
-            response = llm_provider.send_prompt(
-                prompt=step.rendered_prompt,
-                instructions=step.rendered_instructions,
-                input_=step.rendered_input
-            )
+            response = _send_prompt(llm_provider, selected_provider_name, selected_provider, prompt_fields)
         step_output = selected_provider.postprocess_filter(response)
         if (is_verbose() or step.output_console) and not llm_provider.show_response and not is_quiet():
-            console_print(step_output, markup=False)
+            print_plain(step_output)
+    except ProviderRateLimitError as e:
+        raise ProviderRateLimitError(f"Failed to get LLM response: {e.message}", retry_after=e.retry_after)
     except Exception as e:
         raise click.ClickException(f"Failed to get LLM response: {str(e)}")
     return step_output
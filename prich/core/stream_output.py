@@ -0,0 +1,134 @@
+import codecs
+import re
+import tempfile
+from typing import IO, Iterator, Iterable, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+DEFAULT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+class StreamedOutput:
+    """
+    Step output captured as a stream of chunks.
+
+    Data is kept in memory up to `spool_max_size` bytes and spooled to a temporary file afterwards,
+    the full text is materialized only when it is requested as a string (ex. by a jinja template).
+    """
+    def __init__(self, spool_max_size: int = None, chunk_size: int = None, encoding: str = "utf-8"):
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        self.encoding = encoding
+        self.size = 0
+        self.teed_file = False
+        self.teed_console = False
+        self._spool = tempfile.SpooledTemporaryFile(max_size=spool_max_size or DEFAULT_SPOOL_MAX_SIZE, mode="w+b")
+        self._text = None
+
+    @classmethod
+    def from_text(cls, text: str, **kwargs) -> "StreamedOutput":
+        output = cls(**kwargs)
+        output.write(text.encode(output.encoding))
+        return output
+
+    def write(self, data: bytes):
+        self._text = None
+        self._spool.seek(0, 2)
+        self._spool.write(data)
+        self.size += len(data)
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """ Iterate over stored raw bytes chunks """
+        self._spool.seek(0)
+        while True:
+            chunk = self._spool.read(self.chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def iter_chunks(self) -> Iterator[str]:
+        """ Iterate over stored text chunks (decoded incrementally) """
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        for chunk in self.iter_bytes():
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+    def iter_lines(self) -> Iterator[str]:
+        """ Iterate over stored text lines (with line endings) """
+        return iter_text_lines(self.iter_chunks())
+
+    def copy_to(self, file: IO[str]):
+        """ Write stored text into an opened text file """
+        for chunk in self.iter_chunks():
+            file.write(chunk)
+
+    def close(self):
+        self._spool.close()
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = "".join(self.iter_chunks())
+        return self._text
+
+    def __bool__(self) -> bool:
+        return self.size > 0
+
+    def __len__(self) -> int:
+        return len(str(self))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, StreamedOutput):
+            return str(self) == str(other)
+        if isinstance(other, str):
+            return str(self) == other
+        return NotImplemented
+
+    __hash__ = None
+
+
+def iter_text_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """ Re-split text chunks into lines (with line endings), the last line could be without a line ending """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        lines = buffer.splitlines(keepends=True)
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            buffer = lines.pop()
+        else:
+            buffer = ""
+        for line in lines:
+            yield line
+    if buffer:
+        yield buffer
+
+
+class LineFilter:
+    """ Incremental line filter applied to the decoded output text chunks """
+    def __init__(self, match: Optional[str] = None, not_match: Optional[str] = None):
+        self.match = re.compile(match) if match else None
+        self.not_match = re.compile(not_match) if not_match else None
+        self._buffer = ""
+
+    def _keep(self, line: str) -> bool:
+        if self.match and not self.match.search(line):
+            return False
+        if self.not_match and self.not_match.search(line):
+            return False
+        return True
+
+    def feed(self, text: str) -> str:
+        """ Feed text chunk and return filtered complete lines """
+        self._buffer += text
+        lines = self._buffer.splitlines(keepends=True)
+        if lines and not lines[-1].endswith(("\n", "\r")):
+            self._buffer = lines.pop()
+        else:
+            self._buffer = ""
+        return "".join(line for line in lines if self._keep(line))
+
+    def flush(self) -> str:
+        """ Return filtered remaining incomplete line """
+        line, self._buffer = self._buffer, ""
+        return line if line and self._keep(line) else ""
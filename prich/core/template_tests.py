@@ -0,0 +1,166 @@
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional
+from xml.sax.saxutils import quoteattr, escape
+
+import click
+from pydantic import ValidationError as PydanticValidationError
+
+from prich.llm_providers.llm_provider_interface import LLMProvider
+from prich.models.template import TemplateModel
+from prich.models.template_test import TemplateTestCaseModel
+
+TESTS_FOLDER_NAME = "tests"
+
+
+@dataclass
+class TemplateTestCase:
+    """ Loaded test case of a template """
+    template_id: str
+    name: str
+    file: Path
+    case: TemplateTestCaseModel
+
+
+@dataclass
+class TemplateTestResult:
+    """ Test case run result, status is passed, failed (expectations not met) or error (template run failure) """
+    template_id: str
+    name: str
+    file: str
+    status: str
+    duration_ms: float
+    failures: List[str] = field(default_factory=list)
+    output: Optional[str] = None
+
+
+class MockResponseProvider(LLMProvider):
+    """ Provider responding with test case mock responses (in order of the LLM calls, the last one repeats) """
+    def __init__(self, name: str, responses: List[str], lock: threading.Lock):
+        self.name = name
+        self.mode = None
+        self.show_response = False
+        self.responses = responses
+        self.lock = lock
+
+    def send_prompt(self, prompt: str = None, instructions: str = None, input_: str = None) -> str:
+        with self.lock:
+            return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+def load_template_tests(template: TemplateModel) -> List[TemplateTestCase]:
+    """ Load test cases from the template folder tests/*.yaml files (a case or a list of cases per file) """
+    from prich.core.loaders import _load_yaml
+
+    if not template.folder:
+        return []
+    tests = []
+    for test_file in sorted((Path(template.folder) / TESTS_FOLDER_NAME).glob("*.yaml")):
+        try:
+            test_yaml = _load_yaml(test_file)
+            cases = test_yaml if isinstance(test_yaml, list) else [test_yaml]
+            for idx, case_yaml in enumerate(cases):
+                case = TemplateTestCaseModel(**case_yaml)
+                name = case.name or (test_file.stem if len(cases) == 1 else f"{test_file.stem}[{idx + 1}]")
+                tests.append(TemplateTestCase(template_id=template.id, name=name, file=test_file, case=case))
+        except (PydanticValidationError, click.ClickException, TypeError, ValueError) as e:
+            message = e.message if isinstance(e, click.ClickException) else str(e)
+            raise click.ClickException(f"Failed to load template {template.id} test file {test_file}: {message}")
+    return tests
+
+
+def check_expectations(case: TemplateTestCaseModel, output: str, variables: dict) -> List[str]:
+    """ Compare run output and variables with the case expectations, returns failures """
+    failures = []
+    if case.expected_output is not None and output.strip() != case.expected_output.strip():
+        failures.append(f"Output {output.strip()!r} doesn't match expected {case.expected_output.strip()!r}")
+    for text in case.expected_output_contains or []:
+        if text not in output:
+            failures.append(f"Output doesn't contain {text!r}")
+    if case.expected_output_regex and not re.search(case.expected_output_regex, output, re.MULTILINE):
+        failures.append(f"Output doesn't match regex {case.expected_output_regex!r}")
+    for name, expected in (case.expected_variables or {}).items():
+        if name not in variables:
+            failures.append(f"Variable {name} is not set")
+        elif variables[name] != expected and str(variables[name]) != str(expected):
+            failures.append(f"Variable {name} value {variables[name]!r} doesn't match expected {expected!r}")
+    return failures
+
+
+def run_template_test(session, test: TemplateTestCase) -> TemplateTestResult:
+    """ Run test case template through the engine with the session (loaded templates and jinja caches are shared) """
+    from prich.core.engine import run_template
+
+    case = test.case
+    run_context = session.run_context.replace(provider=case.provider or session.run_context.provider)
+    llm_providers = {}
+    if case.replay:
+        replay_dir = Path(case.replay) if Path(case.replay).is_absolute() else test.file.parent / case.replay
+        run_context = run_context.replace(replay_dir=str(replay_dir), record_dir=None)
+    elif case.mock_response is not None:
+        config, _ = session.get_config()
+        responses = [case.mock_response] if isinstance(case.mock_response, str) else list(case.mock_response)
+        lock = threading.Lock()
+        llm_providers = {name: (MockResponseProvider(name, responses, lock), False) for name in config.providers}
+    started = time.perf_counter()
+    try:
+        result = run_template(test.template_id, run_context=run_context, variables=case.variables or {},
+                              llm_providers=llm_providers)
+    except click.ClickException as e:
+        return TemplateTestResult(template_id=test.template_id, name=test.name, file=str(test.file), status="error",
+                                  duration_ms=round((time.perf_counter() - started) * 1000, 1), failures=[e.message])
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    result = result.materialize()
+    failures = check_expectations(case, result.output, result.variables)
+    return TemplateTestResult(template_id=test.template_id, name=test.name, file=str(test.file),
+                              status="failed" if failures else "passed", duration_ms=duration_ms, failures=failures,
+                              output=result.output)
+
+
+def run_template_tests(session, tests: List[TemplateTestCase], jobs: int = 4,
+                       on_result: Callable[[TemplateTestResult], None] = None) -> List[TemplateTestResult]:
+    """ Run test cases in parallel (jobs threads), returns results in the cases order """
+    def run(test: TemplateTestCase) -> TemplateTestResult:
+        try:
+            result = run_template_test(session, test)
+        except Exception as e:
+            result = TemplateTestResult(template_id=test.template_id, name=test.name, file=str(test.file), status="error",
+                                        duration_ms=0.0, failures=[f"{type(e).__name__}: {e}"])
+        if on_result:
+            on_result(result)
+        return result
+
+    with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="prich-test") as executor:
+        return list(executor.map(run, tests))
+
+
+def junit_report(results: List[TemplateTestResult]) -> str:
+    """ JUnit XML report with a test suite per template """
+    suites = {}
+    for result in results:
+        suites.setdefault(result.template_id, []).append(result)
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             f'<testsuites name="prich" tests="{len(results)}" '
+             f'failures="{sum(1 for r in results if r.status == "failed")}" '
+             f'errors="{sum(1 for r in results if r.status == "error")}" '
+             f'time="{sum(r.duration_ms for r in results) / 1000:.3f}">']
+    for template_id, suite_results in suites.items():
+        lines.append(f'  <testsuite name={quoteattr(template_id)} tests="{len(suite_results)}" '
+                     f'failures="{sum(1 for r in suite_results if r.status == "failed")}" '
+                     f'errors="{sum(1 for r in suite_results if r.status == "error")}" '
+                     f'time="{sum(r.duration_ms for r in suite_results) / 1000:.3f}">')
+        for result in suite_results:
+            lines.append(f'    <testcase classname={quoteattr(template_id)} name={quoteattr(result.name)} '
+                         f'file={quoteattr(result.file)} time="{result.duration_ms / 1000:.3f}">')
+            if result.status != "passed":
+                tag = "failure" if result.status == "failed" else "error"
+                lines.append(f'      <{tag} message={quoteattr(result.failures[0] if result.failures else "")}>'
+                             f'{escape(chr(10).join(result.failures))}</{tag}>')
+            lines.append('    </testcase>')
+        lines.append('  </testsuite>')
+    lines.append('</testsuites>')
+    return "\n".join(lines) + "\n"
@@ -33,8 +33,12 @@ def get_jinja_env(name: str, conditional_expression_only: bool = False):
         lines = _read_file_contents(filename).split('\n')
         return '\n'.join([f"{i+1} {line}" for i, line in enumerate(lines)])
 
+    from prich.core.run_context import get_run_context
+
+    session = get_run_context().session
+    jinja_envs = session.jinja_env if session is not None else _jinja_env
     env_name = f"{name}{'_cond' if conditional_expression_only else ''}"
-    if not _jinja_env.get(env_name):
+    if not jinja_envs.get(env_name):
         if conditional_expression_only:
             env = Environment(undefined=StrictUndefined)
             env.filters.clear()
@@ -56,8 +60,8 @@ def get_jinja_env(name: str, conditional_expression_only: bool = False):
             "split": lambda _sep, _max_split: str.split(_sep, _max_split),
             "bool": lambda x: bool(x),
         })
-        _jinja_env[env_name] = env
-    return _jinja_env[env_name]
+        jinja_envs[env_name] = env
+    return jinja_envs[env_name]
 
 
 def render_template_text(template_text: str, variables: dict, jinja_env_name: str = "default"):
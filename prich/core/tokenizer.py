@@ -0,0 +1,97 @@
+from typing import List
+
+import click
+
+# average characters per token used for the estimate
+CHARS_PER_TOKEN = 4
+DEFAULT_TIKTOKEN_ENCODING = "o200k_base"
+
+
+class Tokenizer:
+    """ Fast char based tokens count estimate """
+    name = "estimate"
+
+    def __init__(self, chars_per_token: int = CHARS_PER_TOKEN):
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return -(-len(text or "") // self.chars_per_token)
+
+    def split(self, text: str, chunk_tokens: int, overlap_tokens: int = 0) -> List[str]:
+        """ Split text into chunks up to chunk_tokens each, preferring to cut at line ends """
+        chunk_size = chunk_tokens * self.chars_per_token
+        overlap_size = min(overlap_tokens * self.chars_per_token, chunk_size // 2)
+        chunks = []
+        start = 0
+        while start < len(text):
+            end = min(start + chunk_size, len(text))
+            if end < len(text):
+                line_end = text.rfind("\n", start + chunk_size // 2, end)
+                if line_end != -1:
+                    end = line_end + 1
+            chunks.append(text[start:end])
+            if end >= len(text):
+                break
+            next_start = max(end - overlap_size, start + 1)
+            if overlap_size:
+                # overlap whole lines when possible
+                line_start = text.find("\n", next_start, end - 1)
+                if line_start != -1:
+                    next_start = line_start + 1
+            start = next_start
+        return chunks
+
+
+class TiktokenTokenizer(Tokenizer):
+    """ Exact tokens count using tiktoken encoding """
+    name = "tiktoken"
+
+    def __init__(self, model: str = None):
+        super().__init__()
+        import tiktoken
+        try:
+            self.encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_TIKTOKEN_ENCODING)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding(DEFAULT_TIKTOKEN_ENCODING)
+
+    def count(self, text: str) -> int:
+        return len(self.encoding.encode(text or "", disallowed_special=()))
+
+    def split(self, text: str, chunk_tokens: int, overlap_tokens: int = 0) -> List[str]:
+        tokens = self.encoding.encode(text or "", disallowed_special=())
+        overlap_tokens = min(overlap_tokens, chunk_tokens // 2)
+        chunks = []
+        start = 0
+        while start < len(tokens):
+            end = min(start + chunk_tokens, len(tokens))
+            chunks.append(self.encoding.decode(tokens[start:end]))
+            if end >= len(tokens):
+                break
+            start = max(end - overlap_tokens, start + 1)
+        return chunks
+
+
+def is_tiktoken_available() -> bool:
+    try:
+        import tiktoken  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def get_tokenizer(provider) -> Tokenizer:
+    """ Get provider tokenizer: exact tiktoken one for openai providers when installed, char based estimate otherwise """
+    from prich.core.optional_imports import ensure_optional_dep
+
+    tokenizer = getattr(provider, "tokenizer", None)
+    if tokenizer == "estimate":
+        return Tokenizer()
+    if tokenizer == "tiktoken":
+        try:
+            ensure_optional_dep("tiktoken")
+        except RuntimeError as e:
+            raise click.ClickException(str(e))
+    elif not (provider.provider_type == "openai" and is_tiktoken_available()):
+        return Tokenizer()
+    model = (getattr(provider, "options", None) or {}).get("model")
+    return TiktokenTokenizer(model)
@@ -1,65 +1,55 @@
 import os
 import re
-import click
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from rich.console import Console
 from prich.constants import PRICH_DIR_NAME
+from prich.core.run_context import get_run_context, use_run_context
 
 console = Console()
 
+# plain texts of this size and over are written directly to stdout, without rich layout
+LARGE_OUTPUT_CHARS = 256 * 1024
+# max console refreshes per second for streamed chunks
+STREAM_WRITER_FPS = 30
+
 def should_use_global_only() -> bool:
     """ Should only global config/templates used? """
-    try:
-        global_only_options = ["global_only", "global_init", "global_install"]
-        for global_ in global_only_options:
-            if click.get_current_context().params.get(global_):
-                return True
-    except:
-        pass
-    return False
+    return get_run_context().global_only
 
 def should_use_local_only() -> bool:
     """ Should only local config/templates used? """
-    try:
-        if click.get_current_context().params.get("local_only"):
-            return True
-    except:
-        pass
-    return False
+    return get_run_context().local_only
 
 def is_verbose() -> bool:
     """ Is Verbose mode enabled? """
-    try:
-        if click.get_current_context().params.get("verbose"):
-            return True
-    except:
-        pass
-    return False
+    return get_run_context().verbose
 
 def is_quiet() -> bool:
     """ Is Quiet mode enabled? """
-    try:
-        if click.get_current_context().params.get("quiet"):
-            return True
-    except:
-        pass
-    return False
+    return get_run_context().quiet
 
 def is_only_final_output() -> bool:
     """ Show only output of the last step? """
-    if is_piped():
-        return True
-    try:
-        if click.get_current_context().params.get("only_final_output"):
-            return True
-    except:
-        pass
-    return False
+    return get_run_context().only_final_output
 
 def is_print_enabled() -> bool:
     """ Is printing to the console is enabled """
+    if get_run_context().silent:
+        return False
     return not is_quiet() and not is_only_final_output()
 
+def get_console() -> Console:
+    """ Console of the active run context """
+    return get_run_context().console or console
+
+@contextmanager
+def quiet_thread():
+    """ Disable console printing in the current thread (used for background work running concurrently) """
+    with use_run_context(get_run_context().replace(silent=True, output_sink=None)):
+        yield
+
 def is_piped() -> bool:
     """ Check if prich executed with a piped command (should work only when not executed from pytest) """
     # TODO: revisit, we need to allow executions from templates for example
@@ -69,7 +59,70 @@ def is_piped() -> bool:
 def console_print(message: str = "", end: str = "\n", markup = None, flush: bool = None):
     """ Print to console wrapper """
     if is_print_enabled():
-        console.print(message, end=end, markup=markup, crop=False)
+        get_console().print(message, end=end, markup=markup, crop=False)
+
+def print_plain(text: str = "", end: str = "\n"):
+    """ Print text without markup, large texts are written directly to stdout without rich layout """
+    if not is_print_enabled():
+        return
+    text = str(text)
+    output_console = get_console()
+    if len(text) >= LARGE_OUTPUT_CHARS:
+        output_console.file.write(text)
+        output_console.file.write(end)
+        output_console.file.flush()
+    else:
+        output_console.print(text, end=end, markup=False, crop=False)
+
+class StreamWriter:
+    """
+    Buffered console writer for streamed text chunks (ex. LLM response tokens).
+
+    Output flags are resolved once on creation, chunks are written as is (no markup/rich layout)
+    and flushed at most `fps` times per second. Chunks are also passed to the run context output_sink when set.
+    """
+    def __init__(self, enabled: bool = None, fps: int = STREAM_WRITER_FPS, file=None):
+        self.enabled = (enabled is None or enabled) and is_print_enabled()
+        self.interval = 1 / fps if fps else 0
+        self._file = file
+        self._console = get_console()
+        self._sink = get_run_context().output_sink
+        self._buffer = []
+        self._last_flush = 0.0
+
+    @property
+    def file(self):
+        return self._file or self._console.file
+
+    def write(self, text: str):
+        if text and self._sink:
+            self._sink(text)
+        if not self.enabled or not text:
+            return
+        self._buffer.append(text)
+        now = time.monotonic()
+        if now - self._last_flush >= self.interval:
+            self.flush(now)
+
+    def flush(self, now: float = None):
+        if self._buffer:
+            self.file.write("".join(self._buffer))
+            self._buffer.clear()
+            self.file.flush()
+        self._last_flush = now or time.monotonic()
+
+    def close(self, end: str = "\n"):
+        """ Flush buffered chunks and finish the output line """
+        self.flush()
+        if self.enabled and end:
+            self.file.write(end)
+            self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close(end="" if exc_type else "\n")
 
 def is_valid_template_id(template_id) -> bool:
     """ Validate Name Pattern: lowercase letters, numbers, hyphen, optional underscores, and no other characters"""
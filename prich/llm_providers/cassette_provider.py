@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+import click
+
+from prich.core.run_context import get_run_context, use_run_context
+from prich.core.utils import StreamWriter
+from prich.llm_providers.llm_provider_interface import LLMProvider
+from prich.models.config import ProviderConfig
+
+
+def get_provider_model_name(provider: ProviderConfig) -> str | None:
+    """ Model name of the provider config (ollama model, mlx_local model path or openai options model) """
+    return getattr(provider, "model", None) or getattr(provider, "model_path", None) or \
+        (getattr(provider, "options", None) or {}).get("model")
+
+
+class CassetteProvider(LLMProvider):
+    """
+    Records provider responses (with stream chunks timing) into cassette files or replays them.
+
+    Cassette file is <dir>/<provider name>/<request hash>.json, the request hash covers provider type,
+    model and the rendered prompt fields. In replay mode the wrapped provider is not used (inner is None).
+    """
+    def __init__(self, name: str, provider: ProviderConfig, inner: LLMProvider | None, cassette_dir: str | Path,
+                 replay: bool = False, replay_timing: bool = False):
+        self.name = name
+        self.provider = provider
+        self.mode = provider.mode
+        self.inner = inner
+        self.cassette_dir = Path(cassette_dir)
+        self.replay = replay
+        self.replay_timing = replay_timing
+        # echo and stdin_consumer providers don't stream their responses
+        self._show_response = inner.show_response if inner is not None else \
+            provider.provider_type not in ["echo", "stdin_consumer"]
+
+    @property
+    def show_response(self) -> bool:
+        return self.inner.show_response if self.inner is not None else self._show_response
+
+    @show_response.setter
+    def show_response(self, value: bool):
+        if self.inner is not None:
+            self.inner.show_response = value
+        self._show_response = value
+
+    def request_key(self, prompt: str = None, instructions: str = None, input_: str = None) -> dict:
+        return {"provider_type": self.provider.provider_type, "model": get_provider_model_name(self.provider),
+                "prompt": prompt, "instructions": instructions, "input": input_}
+
+    def cassette_path(self, request: dict) -> Path:
+        request_hash = hashlib.sha256(json.dumps(request, sort_keys=True).encode("utf-8")).hexdigest()[:32]
+        return self.cassette_dir / re.sub(r"[^A-Za-z0-9_.-]", "_", self.name) / f"{request_hash}.json"
+
+    def send_prompt(self, prompt: str = None, instructions: str = None, input_: str = None) -> str:
+        request = self.request_key(prompt, instructions, input_)
+        path = self.cassette_path(request)
+        if self.replay:
+            return self._replay(path)
+        return self._record(path, request, prompt, instructions, input_)
+
+    def _record(self, path: Path, request: dict, prompt: str, instructions: str, input_: str) -> str:
+        run_context = get_run_context()
+        chunks = []
+        started = time.monotonic()
+
+        def record_chunk(text: str):
+            chunks.append([round((time.monotonic() - started) * 1000, 1), text])
+            if run_context.output_sink:
+                run_context.output_sink(text)
+
+        with use_run_context(run_context.replace(output_sink=record_chunk)):
+            response = self.inner.send_prompt(prompt=prompt, instructions=instructions, input_=input_)
+        cassette = {
+            "provider": self.name,
+            "request": request,
+            "response": response,
+            "chunks": chunks,
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+        }
+        try:
+            os.makedirs(path.parent, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(cassette, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            raise click.ClickException(f"Failed to save cassette {path}: {e}")
+        return response
+
+    def _replay(self, path: Path) -> str:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                cassette = json.load(f)
+        except FileNotFoundError:
+            raise click.ClickException(f"No recorded response of provider {self.name} for this prompt in {self.cassette_dir} ({path.name}), record it with --record.")
+        except (OSError, ValueError) as e:
+            raise click.ClickException(f"Failed to load cassette {path}: {e}")
+        response = cassette.get("response") or ""
+        chunks = cassette.get("chunks") or [[cassette.get("duration_ms") or 0, response]]
+        started = time.monotonic()
+        with StreamWriter(enabled=self.show_response) as writer:
+            for offset_ms, text in chunks:
+                if self.replay_timing:
+                    delay = offset_ms / 1000 - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+                writer.write(text)
+        if self.replay_timing:
+            # wait for the end of the recorded response
+            delay = (cassette.get("duration_ms") or 0) / 1000 - (time.monotonic() - started)
+            if delay > 0:
+                time.sleep(delay)
+        return response
+
+    def reset(self):
+        if self.inner is not None:
+            self.inner.reset()
+
+    def warmup(self, keep_alive: str | int = None) -> dict | None:
+        return self.inner.warmup(keep_alive) if self.inner is not None else None
+
+    def status(self) -> dict | None:
+        return self.inner.status() if self.inner is not None else None
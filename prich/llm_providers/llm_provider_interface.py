@@ -1,5 +1,23 @@
 from abc import ABC, abstractmethod
 
+import click
+
+
+class ProviderRateLimitError(click.ClickException):
+    """ Provider rejected the request with a rate limit, retry_after - seconds to wait (when sent by the provider) """
+    def __init__(self, message: str, retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value) -> float | None:
+    """ Retry-After header seconds (HTTP date values are not used) """
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
 class LLMProvider(ABC):
     """LLM Provider Interface"""
     name: str
@@ -10,3 +28,15 @@ class LLMProvider(ABC):
     def send_prompt(self, prompt: str = None, instructions: str = None, input_: str = None) -> str:
         """Send a prompt to the LLM and return the response. Use prompt with full model prompt template and system/user when model supports field templates."""
         pass
+
+    def warmup(self, keep_alive: str | int = None) -> dict | None:
+        """Preload provider model and return details like load_ms, None when not supported by the provider."""
+        return None
+
+    def reset(self):
+        """Drop conversation state kept between prompts (ex. reused context) before the instance is reused by another run."""
+        pass
+
+    def status(self) -> dict | None:
+        """Return provider model status like resident and expires_at, None when not supported by the provider."""
+        return None
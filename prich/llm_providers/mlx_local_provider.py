@@ -2,7 +2,7 @@ import os
 import click
 from pathlib import Path
 
-from prich.core.utils import console_print, is_print_enabled
+from prich.core.utils import is_print_enabled, StreamWriter
 from prich.models.config_providers import MLXLocalProviderModel
 from prich.llm_providers.llm_provider_interface import LLMProvider
 from prich.llm_providers.base_optional_provider import LazyOptionalProvider
@@ -14,6 +14,15 @@ os.environ["TOKENIZERS_PARALLELISM"] = "false"
 console = Console()
 
 
+def _common_prefix_length(first: list, second: list) -> int:
+    length = 0
+    for a, b in zip(first, second):
+        if a != b:
+            break
+        length += 1
+    return length
+
+
 class MLXLocalProvider(LLMProvider, LazyOptionalProvider):
     def __init__(self, 
                  name: str,
@@ -26,6 +35,8 @@ class MLXLocalProvider(LLMProvider, LazyOptionalProvider):
         self.tokenizer = None
         self.client = None
         self.show_response = True
+        self.prompt_cache = None
+        self.cached_tokens = []  # tokens already processed into the prompt cache
 
     def _ensure_client(self):
         if self.client:
@@ -36,6 +47,10 @@ class MLXLocalProvider(LLMProvider, LazyOptionalProvider):
         self.make_sampler = self._lazy_import_from("mlx_lm.sample_utils", "make_sampler", pip_name="mlx")
         self.generate = self._lazy_import_from("mlx_lm.generate", "generate", pip_name="mlx")
         self.stream_generate = self._lazy_import_from("mlx_lm.generate", "stream_generate", pip_name="mlx")
+        if self.provider.prompt_cache:
+            self.make_prompt_cache = self._lazy_import_from("mlx_lm.models.cache", "make_prompt_cache", pip_name="mlx")
+            self.can_trim_prompt_cache = self._lazy_import_from("mlx_lm.models.cache", "can_trim_prompt_cache", pip_name="mlx")
+            self.trim_prompt_cache = self._lazy_import_from("mlx_lm.models.cache", "trim_prompt_cache", pip_name="mlx")
 
         try:
             model_identifier = Path(os.path.expanduser(self.provider.model_path))
@@ -46,6 +61,38 @@ class MLXLocalProvider(LLMProvider, LazyOptionalProvider):
 
         self.client = True
 
+    def warmup(self, keep_alive: str | int = None) -> dict:
+        """ Load model files (mlx_local runs in the prich process, it only warms up the OS file cache) """
+        import time
+        started = time.monotonic()
+        self._ensure_client()
+        load_ms = round((time.monotonic() - started) * 1000, 1)
+        return {"load_ms": load_ms, "duration_ms": load_ms}
+
+    def status(self) -> dict:
+        """ mlx_local model is loaded in-process by each run """
+        model_path = Path(os.path.expanduser(self.provider.model_path))
+        return {"resident": self.client is not None, "details": f"in-process, model path {'found' if model_path.exists() else 'not found'}"}
+
+    def _prepare_cached_prompt(self, prompt: str) -> list:
+        """ Reuse prompt cache for the common prefix with the previous prompt, return tokens left to process """
+        add_special_tokens = self.tokenizer.bos_token is None or not prompt.startswith(self.tokenizer.bos_token)
+        tokens = list(self.tokenizer.encode(prompt, add_special_tokens=add_special_tokens))
+        if self.prompt_cache is None:
+            self.prompt_cache = self.make_prompt_cache(self.model)
+            self.cached_tokens = []
+        # at least one token should be processed to generate the response
+        prefix_length = min(_common_prefix_length(self.cached_tokens, tokens), max(len(tokens) - 1, 0))
+        trim_length = len(self.cached_tokens) - prefix_length
+        if trim_length > 0:
+            if self.can_trim_prompt_cache(self.prompt_cache):
+                self.trim_prompt_cache(self.prompt_cache, trim_length)
+            else:
+                self.prompt_cache = self.make_prompt_cache(self.model)
+                prefix_length = 0
+        self.cached_tokens = tokens[:]
+        return tokens[prefix_length:]
+
     def send_prompt(self, prompt: str = None, instructions: str = None, input_: str = None) -> str:
         if instructions or input_:
             raise click.ClickException("mxl_local provider requires provider mode")
@@ -59,23 +106,37 @@ class MLXLocalProvider(LLMProvider, LazyOptionalProvider):
                 min_tokens_to_keep=self.provider.min_tokens_to_keep if self.provider.min_tokens_to_keep is not None else 1,
                 top_k=self.provider.top_k if self.provider.top_k is not None else 0
             )
+            generate_kwargs = {}
+            if self.provider.prompt_cache:
+                prompt = self._prepare_cached_prompt(prompt)
+                generate_kwargs["prompt_cache"] = self.prompt_cache
             status = console.status("Thinking...") if is_print_enabled() else nullcontext()
+            writer = StreamWriter(enabled=self.show_response)
             with status:
                 for response in self.stream_generate(
                     model=self.model,
                     tokenizer=self.tokenizer,
                     prompt=prompt,
                     max_tokens=self.provider.max_tokens if self.provider.max_tokens is not None else 512,
-                    sampler=sampler
+                    sampler=sampler,
+                    **generate_kwargs
                 ):
                     if not isinstance(status, nullcontext) and status._live.is_started:
                         status.stop()
                     text.append(response.text)
-                    if self.show_response:
-                        console_print(response.text, end='')
-                if self.show_response:
-                    console_print()
+                    if self.provider.prompt_cache:
+                        self.cached_tokens.append(response.token)
+                    writer.write(response.text)
+                writer.close()
                 return ''.join(text).strip()
         except Exception as e:
+            # cache state is unknown after a failure
+            self.prompt_cache = None
             raise click.ClickException(f"mlx_local provider error: {str(e)}")
+        finally:
+            if self.prompt_cache is not None:
+                # the last generated token is not always evaluated into the cache
+                cache_offset = getattr(self.prompt_cache[0], "offset", None) if self.prompt_cache else None
+                if cache_offset is not None:
+                    self.cached_tokens = self.cached_tokens[:cache_offset]
     
\ No newline at end of file
@@ -6,9 +6,10 @@ from requests import JSONDecodeError as RequestsJSONDecodeError
 from rich.console import Console
 from contextlib import nullcontext
 
-from prich.core.utils import console_print, is_print_enabled
+from prich.core.run_context import get_run_context
+from prich.core.utils import is_print_enabled, print_plain, StreamWriter
 from prich.models.config_providers import OllamaProviderModel
-from prich.llm_providers.llm_provider_interface import LLMProvider
+from prich.llm_providers.llm_provider_interface import LLMProvider, ProviderRateLimitError, parse_retry_after
 from prich.llm_providers.base_optional_provider import LazyOptionalProvider
 
 console = Console()
@@ -25,7 +26,9 @@ class OllamaProvider(LLMProvider, LazyOptionalProvider):
         self.client_url = f"{self.base_url}/api/generate"
         self.show_response = True
         self.health_url = f"{self.base_url}/api/tags"
+        self.ps_url = f"{self.base_url}/api/ps"
         self.requests = None
+        self.context = None  # context returned by the last response, used with reuse_context
 
     def _get_models(self):
         resp = self.requests.get(self.health_url, timeout=2)
@@ -41,15 +44,23 @@ class OllamaProvider(LLMProvider, LazyOptionalProvider):
     def _get_generate(self, payload):
         resp = self.requests.post(self.client_url, json=payload)
         resp.raise_for_status()
-        return resp.json().get("response", "")
+        data = resp.json()
+        if data.get("context"):
+            self.context = data.get("context")
+        return data.get("response", "")
 
     def _ensure_client(self):
+        if self.requests is not None:
+            # server and model were already checked by this provider instance
+            return
         # Ensure 'requests' library is available
-        self.requests = self._lazy_import("requests", pip_name="requests")
+        requests = self._lazy_import("requests", pip_name="requests")
+        self.requests = requests
         # Check Ollama server
         try:
             models = self._get_models()
-        except self.requests.RequestException:
+        except requests.RequestException:
+            self.requests = None
             raise click.ClickException(
                 f"Cannot connect to Ollama at {self.base_url}. "
                 "Is Ollama running? Start it with: `ollama serve`"
@@ -58,11 +69,54 @@ class OllamaProvider(LLMProvider, LazyOptionalProvider):
         # Check if model is installed
         models = [m.get("name") for m in models]
         if self.provider.model not in models:
+            self.requests = None
             raise click.ClickException(
                 f"Model '{self.provider.model}' is not installed on Ollama. "
                 f"Install it with: 'ollama pull {self.provider.model}'"
             )
 
+    def warmup(self, keep_alive: str | int = None) -> dict:
+        """ Load model with an empty prompt request, it stays loaded for keep_alive """
+        import time
+        self._ensure_client()
+        payload = {"model": self.provider.model}
+        keep_alive = keep_alive if keep_alive is not None else self.provider.keep_alive
+        if keep_alive is not None:
+            payload["keep_alive"] = keep_alive
+        started = time.monotonic()
+        try:
+            resp = self.requests.post(self.client_url, json=payload)
+            resp.raise_for_status()
+            data = resp.json()
+        except self.requests.RequestException as e:
+            raise click.ClickException(f"Ollama provider request error: {str(e)}")
+        return {
+            "load_ms": round(data.get("load_duration", 0) / 1e6, 1),
+            "duration_ms": round((time.monotonic() - started) * 1000, 1),
+            "keep_alive": keep_alive,
+        }
+
+    def reset(self):
+        """ Drop the reused context, the client session is kept """
+        self.context = None
+
+    def status(self) -> dict:
+        """ Model residency reported by the Ollama server """
+        requests = self._lazy_import("requests", pip_name="requests")
+        try:
+            resp = requests.get(self.ps_url, timeout=2)
+            resp.raise_for_status()
+            running = resp.json().get("models", [])
+        except requests.RequestException:
+            raise click.ClickException(
+                f"Cannot connect to Ollama at {self.base_url}. "
+                "Is Ollama running? Start it with: `ollama serve`"
+            )
+        model = next((m for m in running if self.provider.model in [m.get("name"), m.get("model")]), None)
+        if not model:
+            return {"resident": False}
+        return {"resident": True, "expires_at": model.get("expires_at"), "size_vram": model.get("size_vram")}
+
     def send_prompt(self, prompt: str = None, instructions: str = None, input_: str = None) -> str:
         self._ensure_client()
         text = []
@@ -79,18 +133,25 @@ class OllamaProvider(LLMProvider, LazyOptionalProvider):
             }
             if instructions:
                 payload['system'] = instructions
-            if is_print_enabled() and self.provider.stream is not None:
+            # stream when the response is printed or consumed by the run output sink
+            if (is_print_enabled() or get_run_context().output_sink is not None) and self.provider.stream is not None:
                 payload["stream"] = self.provider.stream
             else:
                 payload["stream"] = False
             if self.provider.think is not None:
                 payload["think"] = self.provider.think
+            if self.provider.keep_alive is not None:
+                payload["keep_alive"] = self.provider.keep_alive
+            if self.provider.reuse_context and self.context:
+                # continue from the previous prompt of the run, so the already evaluated prefix is not processed again
+                payload["context"] = self.context
 
             status = console.status("Thinking...") if is_print_enabled() else nullcontext()
 
             with status:
                 if payload.get("stream"):
                     # Streaming mode
+                    writer = StreamWriter(enabled=self.show_response)
                     with self._get_stream_generate(payload=payload) as response_lines:
                         for line in response_lines:
                             if not line:
@@ -99,30 +160,35 @@ class OllamaProvider(LLMProvider, LazyOptionalProvider):
                             if "response" in data:
                                 chunk = data["response"]
                                 text.append(chunk)
-                                if self.show_response and is_print_enabled():
+                                if writer.enabled:
                                     if self.provider.think and status._live.is_started and not chunk:
                                         if status.status != f"{self.provider.model} Thinking...":
                                             status.update(status=f"{self.provider.model} Thinking...")
                                     if not isinstance(status, nullcontext) and status._live.is_started and chunk:
                                         status.stop()
-                                    console_print(chunk, end='')
+                                writer.write(chunk)
                             if data.get("done", False):
+                                if data.get("context"):
+                                    self.context = data.get("context")
                                 break
 
-                        if self.show_response and is_print_enabled():
-                            console_print()
+                        writer.close()
                 else:
                     output = self._get_generate(payload=payload)
                     text.append(output)
                     if self.show_response and is_print_enabled():
                         if not isinstance(status, nullcontext):
                             status.stop()
-                        console_print(output)
+                        print_plain(output)
 
             return ''.join(text)
         except (JSONDecodeError or RequestsJSONDecodeError) as e:
             raise click.ClickException(f"Ollama provider JSON parsing error: {str(e)}")
         except self.requests.RequestException as e:
+            response = getattr(e, "response", None)
+            if response is not None and response.status_code == 429:
+                raise ProviderRateLimitError(f"Ollama provider rate limit exceeded: {str(e)}",
+                                             retry_after=parse_retry_after(response.headers.get("Retry-After")))
             raise click.ClickException(f"Ollama provider request error: {str(e)}")
         except Exception as e:
             raise click.ClickException(f"Ollama provider error: {str(e)}")
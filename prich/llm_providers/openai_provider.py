@@ -5,12 +5,36 @@ import click
 from json import JSONDecodeError
 from contextlib import nullcontext
 from prich.constants import PRICH_DIR_NAME
-from prich.core.utils import console, console_print, is_print_enabled
+from prich.core.utils import console, console_print, is_print_enabled, is_verbose, print_plain, StreamWriter
 from prich.core.variable_utils import replace_env_vars
 from prich.models.config_providers import OpenAIProviderModel
-from prich.llm_providers.llm_provider_interface import LLMProvider
+from prich.llm_providers.llm_provider_interface import LLMProvider, ProviderRateLimitError, parse_retry_after
 from prich.llm_providers.base_optional_provider import LazyOptionalProvider
 
+STABLE_MESSAGE_ROLES = ["system", "developer"]
+
+
+def cache_friendly_messages(messages: list) -> list:
+    """ Reorder messages keeping stable instructions first, each message with a deterministic key order """
+    if not isinstance(messages, list):
+        return messages
+    ordered = [m for m in messages if isinstance(m, dict) and m.get("role") in STABLE_MESSAGE_ROLES] + \
+              [m for m in messages if not (isinstance(m, dict) and m.get("role") in STABLE_MESSAGE_ROLES)]
+    key_order = ["role", "content"]
+    return [{key: message[key] for key in sorted(message, key=lambda k: (key_order.index(k) if k in key_order else len(key_order), k))}
+            if isinstance(message, dict) else message for message in ordered]
+
+
+def format_usage(usage) -> str | None:
+    """ Usage summary including cached prompt tokens when reported """
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached_tokens = getattr(details, "cached_tokens", None) if details is not None else None
+    return f"Usage: prompt tokens {getattr(usage, 'prompt_tokens', None)}, " \
+           f"cached tokens {cached_tokens if cached_tokens is not None else 0}, " \
+           f"completion tokens {getattr(usage, 'completion_tokens', None)}"
+
 
 class OpenAIProvider(LLMProvider, LazyOptionalProvider):
     def __init__(self, 
@@ -22,6 +46,7 @@ class OpenAIProvider(LLMProvider, LazyOptionalProvider):
         self.provider = provider
         self.client = None
         self.show_response = True
+        self.last_usage = None
 
     def _ensure_client(self):
         if self.client:
@@ -35,6 +60,7 @@ class OpenAIProvider(LLMProvider, LazyOptionalProvider):
 
     def _get_completion(self, **options) -> str:
         response = self.client.chat.completions.create(**options)
+        self.last_usage = getattr(response, "usage", None)
         return response.choices[0].message.content
 
     @contextlib.contextmanager
@@ -56,41 +82,54 @@ class OpenAIProvider(LLMProvider, LazyOptionalProvider):
                 if instructions:
                     messages.append({"role": "system", "content": instructions})
                 messages.append({"role": "user", "content": input_})
-            options = self.provider.options if self.provider.options is not None else {}
+            options = dict(self.provider.options) if self.provider.options is not None else {}
+            if self.provider.cache_friendly:
+                messages = cache_friendly_messages(messages)
             options['messages'] = messages
+            if self.provider.prompt_cache_key:
+                # sent as extra body to keep compatibility with older client versions and compatible servers
+                options['extra_body'] = {**options.get('extra_body', {}), "prompt_cache_key": self.provider.prompt_cache_key}
+            if options.get('stream') and is_verbose() and 'stream_options' not in options:
+                options['stream_options'] = {"include_usage": True}
+            self.last_usage = None
 
             status = console.status("Thinking...") if is_print_enabled() else nullcontext()
 
             with status:
                 if options.get('stream'):
                     # Streaming mode
+                    writer = StreamWriter(enabled=self.show_response)
                     with self._get_stream_completion_chunks(**options) as response:
                         for chunk in response:
                             if not chunk:
                                 continue
-                            if chunk.choices and chunk.choices[0].delta:
+                            if getattr(chunk, "usage", None):
+                                self.last_usage = chunk.usage
+                            if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content is not None:
                                 text.append(chunk.choices[0].delta.content)
-                                if self.show_response:
-                                    if not isinstance(status, nullcontext) and status._live.is_started and chunk:
-                                        status.stop()
-                                    console_print(text[-1], end='')
-                        if self.show_response:
-                            console_print()
+                                if self.show_response and not isinstance(status, nullcontext) and status._live.is_started:
+                                    status.stop()
+                                writer.write(text[-1])
+                        writer.close()
                 else:
                     # Non-streaming mode
                     output = self._get_completion(**options)
                     if self.show_response:
                         if not isinstance(status, nullcontext):
                             status.stop()
-                        console_print(output)
+                        print_plain(output)
                     text.append(output)
 
+            if is_verbose() and self.last_usage is not None:
+                console_print(f"[dim]{format_usage(self.last_usage)}[/dim]")
             return ''.join(text)
         except Exception as e:
             if isinstance(e, JSONDecodeError):
                 raise click.ClickException(f"Failed to decode prompt JSON '{prompt}': {str(e)}")
             if "rate_limit" in str(e).lower():
-                raise click.ClickException("Rate limit exceeded. Please try again later.")
+                headers = getattr(getattr(e, "response", None), "headers", None) or {}
+                raise ProviderRateLimitError("Rate limit exceeded. Please try again later.",
+                                             retry_after=parse_retry_after(headers.get("retry-after")))
             elif "authentication" in str(e).lower():
                 raise click.ClickException(f"Invalid API key. Check {PRICH_DIR_NAME}/config.yaml.")
             raise click.ClickException(f"OpenAI error: {str(e)}")
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Tuple
+
+import click
+
+from prich.constants import PRICH_DIR_NAME
+from prich.core.run_context import with_run_context
+from prich.core.utils import get_home_dir, quiet_thread
+from prich.llm_providers.llm_provider_interface import ProviderRateLimitError
+from prich.models.config_providers import ProviderGroupModel
+
+DEFAULT_HEDGE_AFTER_MS = 2000
+# weight of the latest observed latency in the smoothed value
+LATENCY_SMOOTHING = 0.3
+
+
+class ProviderStatsStore:
+    """
+    Local store of observed provider latencies and slot waits (smoothed), consecutive failures and model load times.
+
+    Updates are recorded in memory and applied on save() to the current file content under a file lock,
+    so concurrent prich runs don't overwrite each other's stats.
+    """
+    def __init__(self, path: Path = None):
+        self.path = Path(path) if path else get_home_dir() / PRICH_DIR_NAME / "provider_stats.json"
+        self._stats = None
+        self._updates = []  # (provider name, update function) not saved yet
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def load(self) -> dict:
+        if self._stats is None:
+            self._stats = self._read()
+        return self._stats
+
+    def get(self, provider_name: str) -> dict:
+        return self.load().get(provider_name, {})
+
+    def _update(self, provider_name: str, update: Callable[[dict], None]):
+        update(self.load().setdefault(provider_name, {}))
+        self._updates.append((provider_name, update))
+
+    def record_success(self, provider_name: str, latency_ms: float):
+        def update(stats: dict):
+            previous = stats.get("latency_ms")
+            stats["latency_ms"] = round(latency_ms if previous is None else
+                                        previous + LATENCY_SMOOTHING * (latency_ms - previous), 1)
+            stats["count"] = stats.get("count", 0) + 1
+            stats["failures"] = 0
+        self._update(provider_name, update)
+
+    def record_failure(self, provider_name: str):
+        def update(stats: dict):
+            stats["failures"] = stats.get("failures", 0) + 1
+        self._update(provider_name, update)
+
+    def record_slot_wait(self, provider_name: str, wait_ms: float):
+        def update(stats: dict):
+            previous = stats.get("slot_wait_ms")
+            stats["slot_wait_ms"] = round(wait_ms if previous is None else
+                                          previous + LATENCY_SMOOTHING * (wait_ms - previous), 1)
+            stats["slot_waits"] = stats.get("slot_waits", 0) + 1
+        self._update(provider_name, update)
+
+    def record_load(self, provider_name: str, load_ms: float):
+        from datetime import datetime, timezone
+        loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+        def update(stats: dict):
+            stats["load_ms"] = load_ms
+            stats["loaded_at"] = loaded_at
+        self._update(provider_name, update)
+
+    def order(self, provider_names: list) -> list:
+        """ Order providers by observed latency, not measured providers first and recently failed ones last """
+        def sort_key(provider_name):
+            stats = self.get(provider_name)
+            return stats.get("failures", 0) > 0, stats.get("latency_ms", 0)
+        return sorted(provider_names, key=sort_key)
+
+    def save(self):
+        """ Apply recorded updates to the current stats file (read-modify-write under lock, atomic replace) """
+        from prich.core.file_lock import file_lock
+
+        if not self._updates:
+            return
+        try:
+            with file_lock(self.path.with_suffix(".lock")):
+                stats = self._read()
+                for provider_name, update in self._updates:
+                    update(stats.setdefault(provider_name, {}))
+                # unique temp file per writer
+                tmp_path = self.path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(stats, f, indent=2)
+                os.replace(tmp_path, self.path)
+            self._stats = stats
+            self._updates = []
+        except OSError:
+            pass  # stats are optional
+
+
+def _call_quiet(call: Callable[[], str]) -> Tuple[str, float]:
+    started = time.monotonic()
+    with quiet_thread():
+        response = call()
+    return response, (time.monotonic() - started) * 1000
+
+
+def _start_member_call(thread_name: str, call: Callable[[], str]):
+    """
+    Run member call in a daemon thread, returns its future. Timed out and hedge-losing calls are abandoned,
+    daemon threads are not joined at exit (unlike executor threads), so a hung request doesn't keep prich running.
+    """
+    from concurrent.futures import Future
+
+    future = Future()
+
+    def target():
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(call())
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=target, name=thread_name, daemon=True).start()
+    return future
+
+
+def send_to_provider_group(group_name: str, group: ProviderGroupModel, calls: Dict[str, Callable[[], str]],
+                           stats: ProviderStatsStore) -> Tuple[str, str, float]:
+    """
+    Send prompt using provider group strategy.
+
+    calls - member provider name to the callable sending prompt to it (in group order),
+    returns the answered member name, its response and latency in ms.
+    """
+    from concurrent.futures import wait, FIRST_COMPLETED
+
+    members = list(calls.keys())
+    if group.strategy in ["latency", "hedged"]:
+        members = stats.order(members)
+    hedge_after = (group.hedge_after_ms if group.hedge_after_ms is not None else DEFAULT_HEDGE_AFTER_MS) / 1000
+    errors = {}
+    rate_limits = {}  # rate limited member name: retry after seconds
+    pending = {}  # future: (member name, start time)
+    last_started = None
+
+    def start_next():
+        nonlocal last_started
+        member_name = members.pop(0)
+        last_started = time.monotonic()
+        call = with_run_context(_call_quiet)
+        future = _start_member_call(f"prich-{group_name}-{member_name}", lambda: call(calls[member_name]))
+        pending[future] = (member_name, last_started)
+
+    try:
+        if members:
+            start_next()
+        while pending:
+            deadlines = []
+            if group.timeout is not None:
+                deadlines.append(min(started for _, started in pending.values()) + group.timeout)
+            if group.strategy == "hedged" and members:
+                deadlines.append(last_started + hedge_after)
+            wait_timeout = max(min(deadlines) - time.monotonic(), 0) if deadlines else None
+            done, _ = wait(list(pending.keys()), timeout=wait_timeout, return_when=FIRST_COMPLETED)
+            failed = False
+            for future in done:
+                member_name, _ = pending.pop(future)
+                try:
+                    response, latency_ms = future.result()
+                except Exception as e:
+                    stats.record_failure(member_name)
+                    errors[member_name] = str(e)
+                    if isinstance(e, ProviderRateLimitError):
+                        rate_limits[member_name] = e.retry_after
+                    failed = True
+                    continue
+                stats.record_success(member_name, latency_ms)
+                return member_name, response, round(latency_ms, 1)
+            now = time.monotonic()
+            if group.timeout is not None:
+                for future, (member_name, started) in list(pending.items()):
+                    if now - started >= group.timeout:
+                        pending.pop(future)
+                        stats.record_failure(member_name)
+                        errors[member_name] = f"timed out after {group.timeout}s"
+                        failed = True
+            if members and (not pending or failed or (group.strategy == "hedged" and now - last_started >= hedge_after)):
+                start_next()
+    finally:
+        # slower requests still running are abandoned, their responses are ignored
+        stats.save()
+    details = "; ".join(f"{name}: {error}" for name, error in errors.items())
+    message = f"All providers of group {group_name} failed{f' ({details})' if details else ''}"
+    if errors and len(rate_limits) == len(errors):
+        retry_after = [value for value in rate_limits.values() if value is not None]
+        raise ProviderRateLimitError(message, retry_after=min(retry_after) if retry_after else None)
+    raise click.ClickException(message)
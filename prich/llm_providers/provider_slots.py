@@ -0,0 +1,58 @@
+import os
+import re
+import time
+from pathlib import Path
+
+from prich.constants import PRICH_DIR_NAME
+from prich.core.file_lock import lock_file, POLL_INTERVAL, MAX_POLL_INTERVAL
+from prich.core.utils import get_home_dir
+
+class ProviderSlot:
+    """
+    Cross-process provider concurrency slot.
+
+    One of max_concurrency lock files (~/.prich/locks/<provider>.<idx>.lock) is held with an exclusive file lock
+    while the prompt is sent, so independent prich processes on the host share the provider limit.
+    Slots of crashed processes are freed by the OS.
+    """
+    def __init__(self, provider_name: str, max_concurrency: int, lock_dir: Path = None):
+        self.provider_name = provider_name
+        self.max_concurrency = max_concurrency
+        self.lock_dir = Path(lock_dir) if lock_dir else get_home_dir() / PRICH_DIR_NAME / "locks"
+        self._fd = None
+        self.wait_ms = 0.0
+
+    def _slot_path(self, idx: int) -> Path:
+        return self.lock_dir / f"{re.sub(r'[^A-Za-z0-9_.-]', '_', self.provider_name)}.{idx}.lock"
+
+    def try_acquire(self) -> bool:
+        os.makedirs(self.lock_dir, exist_ok=True)
+        for idx in range(self.max_concurrency):
+            fd = os.open(self._slot_path(idx), os.O_RDWR | os.O_CREAT, 0o644)
+            if lock_file(fd):
+                self._fd = fd
+                return True
+            os.close(fd)
+        return False
+
+    def acquire(self) -> float:
+        """ Wait for a free slot, returns the wait time in ms """
+        started = time.monotonic()
+        poll_interval = POLL_INTERVAL
+        while not self.try_acquire():
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 1.5, MAX_POLL_INTERVAL)
+        self.wait_ms = round((time.monotonic() - started) * 1000, 1)
+        return self.wait_ms
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
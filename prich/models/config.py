@@ -6,7 +6,8 @@ from pydantic import BaseModel, Field, field_validator, TypeAdapter, ConfigDict
 from prich.constants import PRICH_DIR_NAME
 from prich.core.utils import get_cwd_dir, get_home_dir
 from prich.models.file_scope import FileScope
-from prich.models.config_providers import EchoProviderModel, OpenAIProviderModel, MLXLocalProviderModel, STDINConsumerProviderModel, OllamaProviderModel
+from prich.models.config_providers import EchoProviderModel, OpenAIProviderModel, MLXLocalProviderModel, STDINConsumerProviderModel, OllamaProviderModel, \
+    ProviderGroupModel
 from prich.version import CONFIG_SCHEMA_VERSION
 
 ProviderConfig = Annotated[
@@ -15,7 +16,8 @@ ProviderConfig = Annotated[
         OpenAIProviderModel,
         MLXLocalProviderModel,
         OllamaProviderModel,
-        STDINConsumerProviderModel
+        STDINConsumerProviderModel,
+        ProviderGroupModel
     ],
     Field(discriminator='provider_type')
 ]
@@ -32,6 +34,8 @@ class SettingsConfig(BaseModel):
     provider_assignments: Optional[Dict[str, str]] = None
     editor: Optional[str] = None
     env_file: Optional[str | List[str]] = None
+    templates_manifest_url: Optional[str] = None
+    templates_manifest_ttl: Optional[int] = Field(default=None, ge=0)
 
 
 class ProviderModeModel(BaseModel):
@@ -9,6 +9,13 @@ class BaseProviderModel(BaseModel):
 
     mode: Optional[str] = None
 
+    # model context window size, prompts over it are chunked (when the llm step has chunking) or rejected
+    context_tokens: Optional[int] = None
+    # tokens count method: "estimate" (char based) or "tiktoken", by default tiktoken is used for openai when installed
+    tokenizer: Optional[Literal["estimate", "tiktoken"]] = None
+    # max prompts sent to the provider at once by all prich processes of the host (waiting for a free slot)
+    max_concurrency: Optional[int] = Field(default=None, ge=1)
+
     # transforms
     filter: Optional[TextFilterModel] = None
 
@@ -30,6 +37,9 @@ class OpenAIProviderModel(BaseProviderModel):
     provider_type: Literal["openai"]
     configuration: dict
     options: dict
+    # Assemble messages with stable content first for server-side prompt prefix caching
+    cache_friendly: Optional[bool] = None
+    prompt_cache_key: Optional[str] = None
 
 
 class MLXLocalProviderModel(BaseProviderModel):
@@ -59,6 +69,8 @@ class MLXLocalProviderModel(BaseProviderModel):
     # The top k tokens ranked by probability to constrain
     #           the sampling to.
     top_k: Optional[int] = None
+    # Keep the prompt cache between prompts of a run, so the shared prompt prefix is processed only once
+    prompt_cache: Optional[bool] = None
 
 class STDINConsumerProviderModel(BaseProviderModel):
     provider_type: Literal["stdin_consumer"]
@@ -76,3 +88,18 @@ class OllamaProviderModel(BaseProviderModel):
     raw: Optional[bool] = None
     format: Optional[dict | str] = None
     think: Optional[bool] = None
+    keep_alive: Optional[str | int] = None
+    reuse_context: Optional[bool] = None
+
+
+class ProviderGroupModel(BaseProviderModel):
+    provider_type: Literal["group"]
+    # member provider names
+    providers: List[str]
+    # failover - try members in order, next on error/timeout
+    # latency - try members ordered by observed latency (with failover)
+    # hedged - send to the next member when the previous has not answered within hedge_after_ms
+    strategy: Literal["failover", "latency", "hedged"] = "failover"
+    hedge_after_ms: Optional[int] = None
+    # member request timeout in seconds
+    timeout: Optional[float] = None
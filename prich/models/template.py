@@ -1,7 +1,7 @@
 import re
 import click
 from pydantic import BaseModel, Field, model_validator, ConfigDict, field_validator
-from typing import List, Optional, Literal, Annotated, Union
+from typing import Dict, List, Optional, Literal, Annotated, Union
 from prich.models.text_filter_model import TextFilterModel
 from prich.models.file_scope import FileScope
 from prich.constants import RESERVED_RUN_TEMPLATE_CLI_OPTIONS
@@ -33,6 +33,8 @@ class ValidateStepOutput(BaseModel):
     # Validations for command executions
     match_exit_code: Optional[str | int] = None
     not_match_exit_code: Optional[str | int] = None
+    # pipeline step exit code of each command (null matches any exit code)
+    match_exit_codes: Optional[List[str | int | None]] = None
 
     # Action
     on_fail: Optional[Literal["error", "warn", "skip", "continue"]] = "error"
@@ -69,6 +71,61 @@ class OutputFileModel(BaseModel):
     mode: Optional[Literal["write", "append"] | None] = None
 
 
+class OutputStreamModel(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    # bytes read from the process output at once
+    chunk_size: Optional[int] = None
+    # bytes kept in memory before spooling output to a temporary file
+    spool_max_size: Optional[int] = None
+    # keep only output lines matching / not matching regex (applied incrementally)
+    line_match: Optional[str] = None
+    line_not_match: Optional[str] = None
+
+
+class VarsFileModel(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    format: Literal["json"] = "json"
+    # variables written to the file (all variables by default)
+    variables: Optional[List[str]] = None
+    # environment variable with the file path passed to the process
+    env_var: str = "PRICH_VARS_FILE"
+
+
+class RLimitsModel(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    # process CPU time (seconds)
+    cpu_seconds: Optional[int] = Field(default=None, ge=1)
+    # process virtual memory (bytes)
+    address_space_bytes: Optional[int] = Field(default=None, ge=1)
+    # open file descriptors
+    open_files: Optional[int] = Field(default=None, ge=1)
+
+
+class PythonWorkerModel(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    # calls executed by one worker process before it is restarted
+    max_calls: Optional[int] = Field(default=None, ge=1)
+
+
+class ChunkingModel(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
+    # variable with the text to split (by default the whole rendered input is split)
+    variable: Optional[str] = None
+    # max tokens of the split text per chunk (by default fits the provider context_tokens)
+    chunk_tokens: Optional[int] = Field(default=None, gt=0)
+    overlap_tokens: Optional[int] = Field(default=None, ge=0)
+    # tokens kept free for the response when chunk_tokens is calculated
+    reserve_tokens: Optional[int] = Field(default=None, ge=0)
+    max_concurrency: Optional[int] = Field(default=None, gt=0)
+    # reduce prompt input (jinja2 template string with chunk_outputs list), chunk outputs are joined when not set
+    reduce: Optional[str] = None
+
+
 class BaseStepModel(BaseModel):
     model_config = ConfigDict(extra='forbid')
 
@@ -124,31 +181,139 @@ class LLMStep(BaseStepModel):
     instructions: Optional[str] = None
     input: Optional[str] = None
 
+    # split oversized input into chunks processed separately and combine the results
+    chunking: Optional[bool | ChunkingModel | None] = None
+
     # These fields are injected at runtime
     rendered_instructions: Optional[str] = Field(default=None, exclude=True)
     rendered_input: Optional[str] = Field(default=None, exclude=True)
     rendered_prompt: Optional[str] = Field(default=None, exclude=True)
 
+    # normalize chunking
+    @field_validator("chunking")
+    def normalize_chunking(cls, v):
+        if v is None or v is False:
+            return None
+        if v is True:
+            return ChunkingModel()
+        return v
 
-class PythonStep(BaseStepModel):
-    type: Literal["python"]
+
+class BaseCommandStepModel(BaseStepModel):
     call: str
     args: list[str] = []
 
+    # text sent to the process stdin (jinja2 template string)
+    stdin: Optional[str] = None
+
+    # stream process output instead of buffering it
+    output_stream: Optional[bool | OutputStreamModel | None] = None
+
+    # environment variables set for the process (values are jinja2 template strings)
+    env_vars: Optional[Dict[str, str]] = None
+
+    # write variables to a temporary file once and pass its path in an environment variable
+    vars_file: Optional[Literal["json"] | VarsFileModel | None] = None
+
+    # stop the process (and its child processes) after timeout seconds
+    timeout: Optional[float] = Field(default=None, gt=0)
+    # captured output size limit, longer output is truncated or fails the step
+    max_output_bytes: Optional[int] = Field(default=None, ge=1)
+    on_max_output: Optional[Literal["truncate", "error"]] = "truncate"
+    # process resource limits
+    rlimits: Optional[RLimitsModel] = None
+    # capture stderr separately into the variable (merged into the output by default)
+    stderr_variable: Optional[str] = None
 
-class CommandStep(BaseStepModel):
+    @field_validator("stderr_variable")
+    def check_stderr_variable(cls, v):
+        if v is not None and not is_valid_variable_name(v):
+            raise ValueError(f"Invalid stderr_variable name '{v}', it should contain only upper and lowercase letters, underscores, and numbers")
+        return v
+
+    @model_validator(mode="after")
+    def check_output_stream_limits(self):
+        if self.output_stream and (self.max_output_bytes or self.stderr_variable):
+            raise ValueError("max_output_bytes and stderr_variable are not supported together with output_stream")
+        return self
+
+    # normalize vars_file
+    @field_validator("vars_file")
+    def normalize_vars_file(cls, v):
+        if isinstance(v, str):
+            return VarsFileModel(format=v)
+        return v
+
+    # normalize output_stream
+    @field_validator("output_stream")
+    def normalize_output_stream(cls, v):
+        if v is None or v is False:
+            return None
+        if v is True:
+            return OutputStreamModel()
+        return v
+
+
+class PythonStep(BaseCommandStepModel):
+    type: Literal["python"]
+
+    # run the script in a long-lived python worker process (script code and imported modules are kept loaded)
+    worker: Optional[bool | PythonWorkerModel | None] = None
+
+    # run the script in prich python process calling its run(variables) or main(argv) function (templates without venv)
+    in_process: Optional[bool] = False
+
+    # normalize worker
+    @field_validator("worker")
+    def normalize_worker(cls, v):
+        if v is None or v is False:
+            return None
+        if v is True:
+            return PythonWorkerModel()
+        return v
+
+    @model_validator(mode="after")
+    def check_worker_output_stream(self):
+        if self.worker and self.output_stream:
+            raise ValueError("Python step worker is not supported together with output_stream")
+        if self.in_process and (self.worker or self.output_stream):
+            raise ValueError("Python step in_process is not supported together with worker or output_stream")
+        if (self.worker or self.in_process) and (self.timeout or self.max_output_bytes or self.rlimits or self.stderr_variable):
+            raise ValueError("Python step timeout, max_output_bytes, rlimits and stderr_variable are not supported together with worker or in_process")
+        return self
+
+
+class CommandStep(BaseCommandStepModel):
     type: Literal["command"]
+
+
+class PipelineCommandModel(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+
     call: str
     args: list[str] = []
 
 
+class CommandPipelineStep(BaseStepModel):
+    type: Literal["pipeline"]
+
+    # commands connected by OS pipes (stdout of a command is stdin of the next one)
+    commands: List[PipelineCommandModel] = Field(min_length=1)
+
+    # text sent to the first command stdin (jinja2 template string)
+    stdin: Optional[str] = None
+
+    # environment variables set for the commands (values are jinja2 template strings)
+    env_vars: Optional[Dict[str, str]] = None
+
+
 class RenderStep(BaseStepModel):
     type: Literal["render"]
     template: str
 
 
 PipelineStep = Annotated[
-    Union[PythonStep, CommandStep, LLMStep, RenderStep],
+    Union[PythonStep, CommandStep, CommandPipelineStep, LLMStep, RenderStep],
     Field(discriminator="type")
 ]
 
@@ -187,6 +352,8 @@ class TemplateModel(BaseModel):
             if step.name in seen:
                 raise click.ClickException(f"Duplicate {self.id} template step name (#{idx}): '{step.name}'")
             seen.add(step.name)
+            if isinstance(step, PythonStep) and step.in_process and self.venv:
+                raise click.ClickException(f"Step '{step.name}' in_process is supported only in templates without venv ({self.id} template uses {self.venv} venv)")
         # validate variable names
         variable_default_value_type_error = False
         for variable in self.variables:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Literal
+from typing import Dict, List, Literal, Optional
 
 
 class TemplateRepoItem(BaseModel):
@@ -12,6 +12,7 @@ class TemplateRepoItem(BaseModel):
     files: list
     folder_checksum: str
     tags: list[str]
+    file_checksums: Optional[Dict[str, str]] = None  # sha256 of files, used to download only changed files on update
 
 
 class TemplatesRepoManifest(BaseModel):
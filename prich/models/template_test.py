@@ -0,0 +1,30 @@
+from typing import Any, Dict, List, Optional, Union
+
+import click
+from pydantic import BaseModel, ConfigDict, model_validator
+
+
+class TemplateTestCaseModel(BaseModel):
+    """ Template test case (template folder tests/*.yaml) """
+    model_config = ConfigDict(extra='forbid')
+    name: Optional[str] = None
+    description: Optional[str] = None
+    variables: Optional[Dict[str, Any]] = {}
+
+    # LLM steps responses: config provider override, mocked responses (used in order, the last one repeats)
+    # or cassettes folder with recorded responses (relative to the test file folder)
+    provider: Optional[str] = None
+    mock_response: Optional[Union[str, List[str]]] = None
+    replay: Optional[str] = None
+
+    # Expectations
+    expected_output: Optional[str] = None
+    expected_output_contains: Optional[List[str]] = None
+    expected_output_regex: Optional[str] = None
+    expected_variables: Optional[Dict[str, Any]] = None
+
+    @model_validator(mode="after")
+    def validate_responses_source(self) -> "TemplateTestCaseModel":
+        if self.mock_response is not None and self.replay:
+            raise click.ClickException(f"Test case {self.name or ''} should use only one of 'mock_response' or 'replay'.")
+        return self
@@ -0,0 +1,17 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class TemplateLockItem(BaseModel):
+    model_config = ConfigDict(extra='forbid')
+    id: str
+    version: str
+    folder_checksum: str
+
+
+class TemplatesLockModel(BaseModel):
+    """ Remote templates pinned by .prich/templates.lock (used by 'prich sync') """
+    model_config = ConfigDict(extra='forbid')
+    schema_version: Literal["1.0"] = "1.0"
+    templates: List[TemplateLockItem] = []
@@ -0,0 +1,33 @@
+import pytest
+
+from tests.fixtures.config import CONFIG_YAML
+
+TEMPLATE_YAML = """
+schema_version: "1.0"
+id: greet
+name: Greet
+version: "1.0"
+variables:
+  - name: name
+    type: str
+    cli_option: --user-name
+    required: true
+steps:
+  - name: Render greeting
+    type: render
+    template: "Hello {{ name }}"
+    output_variable: greeting
+  - name: Ask
+    type: llm
+    input: "{{ greeting }}!"
+"""
+
+
+@pytest.fixture
+def session_paths(tmp_path):
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(CONFIG_YAML)
+    templates_dir = tmp_path / "templates"
+    (templates_dir / "greet").mkdir(parents=True)
+    (templates_dir / "greet" / "greet.yaml").write_text(TEMPLATE_YAML)
+    return config_file, templates_dir
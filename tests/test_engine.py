@@ -408,6 +408,25 @@ def test_validate_step_output(mock_paths, basic_config, case):
         if case.get("expected_result") is not None:
             assert actual == case.get("expected_result")
 
+get_validate_step_exit_codes_CASES = [
+    {"id": "all_match", "expected": [0, 0], "exit_codes": [0, 0], "expected_result": True},
+    {"id": "any_exit_code", "expected": [None, 0], "exit_codes": [141, 0], "expected_result": True},
+    {"id": "variable_exit_code", "expected": [0, "{{ code }}"], "exit_codes": [0, 1], "variables": {"code": 1}, "expected_result": True},
+    {"id": "not_match", "expected": [0, 0], "exit_codes": [0, 1], "expected_result": False},
+    {"id": "wrong_count", "expected": [0], "exit_codes": [0, 1],
+     "expected_exception_message": "should have 2 exit codes"},
+]
+@pytest.mark.parametrize("case", get_validate_step_exit_codes_CASES, ids=[c["id"] for c in get_validate_step_exit_codes_CASES])
+def test_validate_step_exit_codes(mock_paths, case):
+    from prich.core.engine import validate_step_exit_codes
+    validate = ValidateStepOutput(match_exit_codes=case["expected"])
+    if case.get("expected_exception_message"):
+        with pytest.raises(click.ClickException, match=case["expected_exception_message"]):
+            validate_step_exit_codes(validate, case["exit_codes"], case.get("variables", {}))
+    else:
+        assert validate_step_exit_codes(validate, case["exit_codes"], case.get("variables", {})) == case["expected_result"]
+
+
 get_run_command_step_CASES = [
     {"id": "python_step_file_not_found",
      "template": generate_template(template_id="test-template"),
@@ -522,4 +541,39 @@ def test_create_dynamic_command(basic_config, template):
         cli_option="--filelist"
     ))
     actual = create_dynamic_command(basic_config, template)
-    assert actual
\ No newline at end of file
+    assert actual
+
+get_run_context_CASES = [
+    {"id": "run_context_default", "params": {}, "expected": {"verbose": False, "quiet": False, "global_only": False, "print_enabled": True}},
+    {"id": "run_context_verbose", "params": {"verbose": True, "provider": "llm"}, "expected": {"verbose": True, "provider": "llm", "print_enabled": True}},
+    {"id": "run_context_quiet", "params": {"quiet": True}, "expected": {"quiet": True, "print_enabled": False}},
+    {"id": "run_context_global_init", "params": {"global_init": True}, "expected": {"global_only": True, "local_only": False}},
+    {"id": "run_context_local", "params": {"local_only": True}, "expected": {"global_only": False, "local_only": True}},
+]
+
+
+@pytest.mark.parametrize("case", get_run_context_CASES, ids=[c["id"] for c in get_run_context_CASES])
+def test_run_context(case):
+    from concurrent.futures import ThreadPoolExecutor
+    from prich.core.run_context import RunContext, use_run_context, with_run_context
+    from prich.core import utils
+
+    ctx = click.Context(click.Command("test"))
+    ctx.params = case.get("params")
+    run_context = RunContext.from_click(ctx)
+    for name, value in case.get("expected").items():
+        assert getattr(run_context, name) == value
+
+    def flags():
+        return utils.is_verbose(), utils.is_quiet(), utils.should_use_global_only(), utils.should_use_local_only(), utils.is_print_enabled()
+
+    expected_flags = (run_context.verbose, run_context.quiet, run_context.global_only, run_context.local_only, run_context.print_enabled)
+    with use_run_context(run_context):
+        assert flags() == expected_flags
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # resolved flags are passed to worker threads explicitly
+            assert executor.submit(with_run_context(flags)).result() == expected_flags
+        with utils.quiet_thread():
+            assert not utils.is_print_enabled()
+            assert utils.is_verbose() == run_context.verbose
+    assert flags() == (False, False, False, False, True)
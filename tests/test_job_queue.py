@@ -0,0 +1,121 @@
+import time
+
+import pytest
+from click.testing import CliRunner
+
+from prich.core.job_queue import JobQueue, run_worker, retry_backoff
+from prich.core.run_result import RunResult
+from prich.core.session import PrichSession
+from tests.fixtures.session import session_paths  # noqa: F401
+
+
+def test_job_queue_lease_complete(tmp_path):
+    job_queue = JobQueue(tmp_path / "queue.db")
+    ids = job_queue.submit("greet", [{"name": "A"}, {"name": "B"}])
+    job = job_queue.lease("worker1")
+    assert job.id == ids[0] and job.variables == {"name": "A"} and job.attempts == 1
+    assert job_queue.lease("worker2").id == ids[1]
+    assert job_queue.lease("worker2") is None
+    # only the lease owner completes the job
+    assert not job_queue.complete(job.id, "worker2", RunResult(template_id="greet", output="x"))
+    assert job_queue.complete(job.id, "worker1", RunResult(template_id="greet", output="Hello A", duration_ms=5))
+    done = job_queue.get(job.id)
+    assert done.status == "done" and done.output == "Hello A"
+    assert job_queue.status().get("counts") == {"queued": 0, "running": 1, "done": 1, "failed": 0}
+
+
+def test_job_queue_expired_lease(tmp_path):
+    job_queue = JobQueue(tmp_path / "queue.db")
+    job_id = job_queue.submit("greet", [{}], max_attempts=2)[0]
+    assert job_queue.lease("crashed", lease_seconds=0.1).id == job_id
+    assert job_queue.lease("worker2") is None
+    time.sleep(0.2)
+    assert job_queue.status().get("expired_leases") == 1
+    job = job_queue.lease("worker2", lease_seconds=0.1)
+    assert job.id == job_id and job.attempts == 2
+    assert not job_queue.extend_lease(job_id, "crashed")
+    time.sleep(0.2)
+    # all attempts used by crashed workers
+    assert job_queue.lease("worker3") is None
+    assert job_queue.get(job_id).status == "failed"
+
+
+def test_job_queue_retry_backoff(tmp_path):
+    job_queue = JobQueue(tmp_path / "queue.db")
+    job_id = job_queue.submit("greet", [{}], max_attempts=2)[0]
+    job_queue.lease("worker1")
+    assert job_queue.fail(job_id, "worker1", "error 1", backoff=0.1) == "queued"
+    assert job_queue.lease("worker1") is None  # waiting for backoff
+    time.sleep(0.15)
+    job_queue.lease("worker1")
+    assert job_queue.fail(job_id, "worker1", "error 2", backoff=0.1) == "failed"
+    assert job_queue.get(job_id).error == "error 2"
+    assert [retry_backoff(attempts) for attempts in [1, 2, 3, 10]] == [10, 20, 40, 600]
+
+
+def test_run_worker(tmp_path, session_paths):  # noqa: F811
+    config_file, templates_dir = session_paths
+    job_queue = JobQueue(tmp_path / "queue.db")
+    job_queue.submit("greet", [{"name": f"user{idx}"} for idx in range(6)] + [{}], max_attempts=2)
+    session = PrichSession(config_paths=[config_file], template_roots=[templates_dir])
+    statuses = []
+    processed = run_worker(job_queue, session, concurrency=3, retry_backoff_sec=0, exit_when_empty=True,
+                           on_job_done=lambda job, status: statuses.append(status))
+    assert processed == 8  # missing variable job attempted twice
+    assert sorted(statuses) == ["done"] * 6 + ["failed", "queued"]
+    assert job_queue.get(1).result.get("variables").get("greeting") == "Hello user0"
+    assert job_queue.get(7).error == "Missing required variable name"
+
+
+def test_run_worker_lost_lease(tmp_path):
+    job_queue = JobQueue(tmp_path / "queue.db")
+    job_id = job_queue.submit("greet", [{}])[0]
+
+    class Session:
+        def run(self, template_id, variables, **kwargs):
+            # lease expired during the run and the job was taken by another worker
+            with job_queue._connect() as connection:
+                connection.execute("UPDATE jobs SET lease_owner = 'worker2' WHERE id = ?", (job_id,))
+            return RunResult(template_id=template_id, output="late")
+
+    statuses = []
+    processed = run_worker(job_queue, Session(), exit_when_empty=True, on_job_done=lambda job, status: statuses.append(status))
+    assert processed == 0
+    assert statuses == ["lost"]
+    job = job_queue.get(job_id)
+    assert job.status == "running" and job.output is None
+
+
+get_queue_cli_CASES = [
+    {"id": "submit_vars",
+     "args": ["submit", "greet", "--var", "name=Alice", "--vars", '{"lang": "en"}'],
+     "expected_output": "Job 1 submitted (greet)",
+     "expected_variables": [{"lang": "en", "name": "Alice"}],
+     },
+    {"id": "submit_from_file",
+     "args": ["submit", "greet", "--from-file", "-", "--var", "lang=en"],
+     "input": '{"name": "A"}\n\n{"name": "B"}\n',
+     "expected_output": "2 jobs submitted (greet, ids 1-2)",
+     "expected_variables": [{"name": "A", "lang": "en"}, {"name": "B", "lang": "en"}],
+     },
+    {"id": "submit_wrong_var",
+     "args": ["submit", "greet", "--var", "name"],
+     "expected_output": "Wrong variable 'name', use NAME=VALUE format.",
+     },
+    {"id": "status",
+     "args": ["status"],
+     "expected_output": "- queued: 0 - running: 0 - done: 0 - failed: 0 Throughput (last 10 min): 0.0 jobs/min, 0 done",
+     },
+]
+
+
+@pytest.mark.parametrize("case", get_queue_cli_CASES, ids=[c["id"] for c in get_queue_cli_CASES])
+def test_queue_cli(tmp_path, case):
+    from prich.cli.queue import queue_group
+
+    db = tmp_path / "queue.db"
+    result = CliRunner().invoke(queue_group, case.get("args") + ["--db", str(db)], input=case.get("input"))
+    assert case.get("expected_output") in " ".join(result.output.split())
+    if case.get("expected_variables"):
+        job_queue = JobQueue(db)
+        assert [job_queue.get(idx + 1).variables for idx in range(len(case.get("expected_variables")))] == case.get("expected_variables")
@@ -0,0 +1,82 @@
+import time
+import pytest
+import click
+import requests
+
+from prich.core.manifest_cache import ManifestCache
+
+MANIFEST_URL = "https://example.com/manifest.json"
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, text: str = "", headers: dict = None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error")
+
+
+get_manifest_cache_CASES = [
+    {"id": "no_cache_download", "cached": None, "response": FakeResponse(200, "new", {"ETag": '"v2"'}),
+     "expected": ("new", "downloaded"), "expected_requests": 1, "expected_etag": '"v2"'},
+    {"id": "fresh_cache", "cached": {"etag": '"v1"', "age": 10}, "response": FakeResponse(200, "new"),
+     "expected": ("old", "cache"), "expected_requests": 0},
+    {"id": "fresh_cache_refresh", "cached": {"etag": '"v1"', "age": 10}, "refresh": True,
+     "response": FakeResponse(304), "expected": ("old", "not_modified"), "expected_requests": 1,
+     "expected_headers": {"If-None-Match": '"v1"'}},
+    {"id": "stale_not_modified", "cached": {"etag": '"v1"', "last_modified": "Mon, 01 Jan 2024 00:00:00 GMT", "age": 1000},
+     "response": FakeResponse(304), "expected": ("old", "not_modified"), "expected_requests": 1,
+     "expected_headers": {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}},
+    {"id": "stale_changed", "cached": {"etag": '"v1"', "age": 1000}, "response": FakeResponse(200, "new", {"ETag": '"v2"'}),
+     "expected": ("new", "downloaded"), "expected_requests": 1, "expected_etag": '"v2"'},
+    {"id": "stale_offline", "cached": {"etag": '"v1"', "age": 1000}, "response": requests.ConnectionError("offline"),
+     "expected": ("old", "offline"), "expected_requests": 1},
+    {"id": "no_cache_offline", "cached": None, "response": requests.ConnectionError("offline"),
+     "expected_exception": "Failed to fetch templates manifest"},
+    {"id": "no_cache_not_found", "cached": None, "response": FakeResponse(404),
+     "expected_exception": "404 Error"},
+]
+
+
+@pytest.mark.parametrize("case", get_manifest_cache_CASES, ids=[c["id"] for c in get_manifest_cache_CASES])
+def test_manifest_cache(tmp_path, monkeypatch, case):
+    requests_made = []
+
+    def fake_get(url, headers=None, timeout=None):
+        requests_made.append(headers)
+        assert timeout
+        if isinstance(case["response"], Exception):
+            raise case["response"]
+        return case["response"]
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    cache = ManifestCache(cache_dir=tmp_path, ttl=300)
+    if case["cached"]:
+        cache._save(MANIFEST_URL, {"url": MANIFEST_URL, "etag": case["cached"].get("etag"),
+                                   "last_modified": case["cached"].get("last_modified"),
+                                   "fetched_at": time.time() - case["cached"]["age"], "content": "old"})
+    if case.get("expected_exception"):
+        with pytest.raises(click.ClickException, match=case["expected_exception"]):
+            cache.get(MANIFEST_URL)
+        return
+    assert cache.get(MANIFEST_URL, refresh=case.get("refresh", False)) == case["expected"]
+    assert len(requests_made) == case["expected_requests"]
+    if case.get("expected_headers"):
+        assert requests_made[0] == case["expected_headers"]
+    if case.get("expected_etag"):
+        assert cache._load(MANIFEST_URL)["etag"] == case["expected_etag"]
+    # revalidated or downloaded manifest is fresh again
+    assert cache.get(MANIFEST_URL)[1] == "cache" or case["expected"][1] == "offline"
+
+
+def test_manifest_cache_local_mirror(tmp_path):
+    manifest_file = tmp_path / "manifest.json"
+    manifest_file.write_text("{}")
+    cache = ManifestCache(cache_dir=tmp_path / "cache")
+    assert cache.get(str(manifest_file)) == ("{}", "file")
+    assert cache.get(f"file://{manifest_file}") == ("{}", "file")
+    with pytest.raises(click.ClickException, match="Failed to read templates manifest"):
+        cache.get(str(tmp_path / "missing.json"))
@@ -0,0 +1,58 @@
+import threading
+import click
+import pytest
+
+from prich.core.mock_llm import MockLLMOptions, create_mock_llm_server
+from prich.llm_providers.ollama_provider import OllamaProvider
+from prich.llm_providers.openai_provider import OpenAIProvider
+from prich.models.config_providers import OpenAIProviderModel, OllamaProviderModel
+
+
+@pytest.fixture
+def mock_llm_url(request):
+    server = create_mock_llm_server(options=getattr(request, "param", None) or MockLLMOptions())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://{server.server_address[0]}:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _openai_provider(url: str, stream: bool = False) -> OpenAIProvider:
+    provider = OpenAIProvider("mock", OpenAIProviderModel(
+        provider_type="openai", configuration={"api_key": "test", "base_url": f"{url}/v1", "max_retries": 0},
+        options={"model": "mock", "stream": stream}
+    ))
+    provider.show_response = False
+    return provider
+
+
+def _ollama_provider(url: str, stream: bool = False) -> OllamaProvider:
+    provider = OllamaProvider("mock", OllamaProviderModel(provider_type="ollama", model="mock", base_url=url, stream=stream))
+    provider.show_response = False
+    return provider
+
+
+get_mock_llm_CASES = [
+    {"id": "openai", "provider": _openai_provider, "stream": False},
+    {"id": "openai_stream", "provider": _openai_provider, "stream": True},
+    {"id": "ollama", "provider": _ollama_provider, "stream": False},
+    {"id": "ollama_stream", "provider": _ollama_provider, "stream": True},
+]
+@pytest.mark.parametrize("mock_llm_url", [MockLLMOptions(echo=True, ttft_ms=10, tokens_per_sec=1000)], indirect=True)
+@pytest.mark.parametrize("case", get_mock_llm_CASES, ids=[c["id"] for c in get_mock_llm_CASES])
+def test_mock_llm_providers(mock_llm_url, case, monkeypatch):
+    monkeypatch.setattr("prich.core.utils.is_print_enabled", lambda: True)
+    provider = case["provider"](mock_llm_url, stream=case["stream"])
+    assert provider.send_prompt(instructions="Be short", input_="hello mock llm") == "hello mock llm"
+
+
+@pytest.mark.parametrize("mock_llm_url, expected_message", [
+    (MockLLMOptions(rate_limit_rate=1), "Rate limit exceeded"),
+    (MockLLMOptions(error_rate=1), "OpenAI error"),
+], indirect=["mock_llm_url"], ids=["rate_limit", "error"])
+def test_mock_llm_failure_injection(mock_llm_url, expected_message):
+    provider = _openai_provider(mock_llm_url)
+    with pytest.raises(click.ClickException) as e:
+        provider.send_prompt(input_="hello")
+    assert expected_message in str(e.value.message)
@@ -0,0 +1,72 @@
+import threading
+import pytest
+from click.testing import CliRunner
+
+from prich.core.mock_llm import MockLLMOptions, create_mock_llm_server
+from prich.models.config import ConfigModel
+from prich.models.config_providers import OllamaProviderModel, EchoProviderModel
+
+
+@pytest.fixture
+def mock_ollama_config(tmp_path, monkeypatch):
+    server = create_mock_llm_server(options=MockLLMOptions(models=["model1"], load_ms=50))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    config = ConfigModel(providers={
+        "local-llm": OllamaProviderModel(provider_type="ollama", model="model1", base_url=url, keep_alive="10m"),
+        "not-installed": OllamaProviderModel(provider_type="ollama", model="model2", base_url=url),
+        "show_prompt": EchoProviderModel(provider_type="echo"),
+    }, provider_modes=[])
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr("prich.cli.provider.get_loaded_config", lambda: (config, []))
+    yield config
+    server.shutdown()
+    server.server_close()
+
+
+get_provider_cmd_CASES = [
+    {"id": "status_not_loaded",
+     "commands": [["status", "local-llm"]],
+     "expected_output": ["- local-llm (ollama): not loaded"],
+     },
+    {"id": "warmup_then_status",
+     "commands": [["warmup", "local-llm"], ["status", "local-llm"]],
+     "expected_output": ["- local-llm (ollama): loaded, load 50.0 ms", "keep_alive 10m",
+                         "- local-llm (ollama): loaded (expires at", "last warmup load 50.0 ms"],
+     },
+    {"id": "warmup_keep_alive_override",
+     "commands": [["warmup", "local-llm", "--keep-alive", "-1"]],
+     "expected_output": ["keep_alive -1"],
+     },
+    {"id": "warmup_all_with_error",
+     "commands": [["warmup"]],
+     "expected_output": ["- local-llm (ollama): loaded", "- not-installed (ollama): Model 'model2' is not installed on Ollama",
+                         "Some providers failed to warm up."],
+     "expected_exit_code": 1,
+     },
+    {"id": "warmup_not_supported",
+     "commands": [["warmup", "show_prompt"]],
+     "expected_output": ["- show_prompt (echo): warmup is not supported"],
+     },
+    {"id": "warmup_not_found",
+     "commands": [["warmup", "missing"]],
+     "expected_output": ["Provider missing configuration not found."],
+     "expected_exit_code": 1,
+     },
+]
+@pytest.mark.parametrize("case", get_provider_cmd_CASES, ids=[c["id"] for c in get_provider_cmd_CASES])
+def test_provider_cmd(mock_ollama_config, case):
+    from prich.cli.provider import provider_group
+
+    runner = CliRunner()
+    output = ""
+    result = None
+    for command in case["commands"]:
+        result = runner.invoke(provider_group, command, terminal_width=300)
+        output += result.output
+    # ignore console line wrapping
+    output = " ".join(output.split())
+    for expected in case["expected_output"]:
+        assert expected in output
+    assert result.exit_code == case.get("expected_exit_code", 0)
@@ -460,3 +460,430 @@ def test_providers(case, monkeypatch):
             assert case.get("expected_result") == result
             assert case.get("expected_result") == result_repeat
 
+
+
+def test_ollama_provider_reuse_context(monkeypatch):
+    payloads = []
+
+    class FakeResponse:
+        def __init__(self, payload):
+            self.payload = payload
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"response": f"response {len(payloads)}", "context": [1, 2, len(payloads)]}
+
+    def fake_post(url, json=None, **kwargs):
+        payloads.append(json)
+        return FakeResponse(json)
+
+    get_models_calls = []
+    monkeypatch.setattr(OllamaProvider, "_get_models", lambda x: get_models_calls.append(1) or [{"name": "model1"}])
+    monkeypatch.setattr("requests.post", fake_post)
+    monkeypatch.setattr("prich.core.utils.is_print_enabled", lambda: False)
+    provider = OllamaProvider(name="ollama", provider=OllamaProviderModel(
+        provider_type="ollama", name="test", model="model1", keep_alive="10m", reuse_context=True
+    ))
+    assert provider.send_prompt(prompt="first") == "response 1"
+    assert provider.send_prompt(prompt="second") == "response 2"
+    assert payloads[0]["keep_alive"] == "10m"
+    assert "context" not in payloads[0]
+    assert payloads[1]["context"] == [1, 2, 1]
+    assert provider.context == [1, 2, 2]
+    # server and model are checked once per provider instance
+    assert len(get_models_calls) == 1
+
+
+def test_mlx_local_provider_prompt_cache(monkeypatch):
+    from types import SimpleNamespace
+    from prich.llm_providers.mlx_local_provider import MLXLocalProvider
+    from prich.models.config_providers import MLXLocalProviderModel
+
+    class FakeCacheLayer:
+        offset = 0
+
+    class FakeTokenizer:
+        bos_token = None
+
+        def encode(self, text, add_special_tokens=True):
+            return [ord(c) for c in text]
+
+    prompts = []
+    trims = []
+
+    def fake_stream_generate(model, tokenizer, prompt, max_tokens, sampler, prompt_cache=None):
+        prompts.append(prompt)
+        prompt_cache[0].offset += len(prompt)
+        for token in [ord("o"), ord("k")]:
+            prompt_cache[0].offset += 1
+            yield SimpleNamespace(text=chr(token), token=token)
+
+    def fake_trim(cache, count):
+        trims.append(count)
+        cache[0].offset -= count
+
+    monkeypatch.setattr("prich.core.utils.is_print_enabled", lambda: False)
+    monkeypatch.setattr("prich.llm_providers.mlx_local_provider.is_print_enabled", lambda: False)
+    provider = MLXLocalProvider(name="mlx", provider=MLXLocalProviderModel(
+        provider_type="mlx_local", name="test", model_path="model", prompt_cache=True
+    ))
+    provider.client = True
+    provider.show_response = False
+    provider.tokenizer = FakeTokenizer()
+    provider.make_sampler = lambda **kwargs: None
+    provider.stream_generate = fake_stream_generate
+    provider.make_prompt_cache = lambda model: [FakeCacheLayer()]
+    provider.can_trim_prompt_cache = lambda cache: True
+    provider.trim_prompt_cache = fake_trim
+
+    assert provider.send_prompt(prompt="shared prefix: one") == "ok"
+    assert provider.send_prompt(prompt="shared prefix: two") == "ok"
+    assert prompts[0] == [ord(c) for c in "shared prefix: one"]
+    # only the part after the shared prefix is processed again
+    assert prompts[1] == [ord(c) for c in "two"]
+    assert trims == [5]
+    assert provider.cached_tokens == [ord(c) for c in "shared prefix: twook"]
+
+
+def test_openai_provider_cache_friendly_prompt(monkeypatch):
+    from types import SimpleNamespace
+    sent_options = []
+
+    def fake_get_completion(self, **options):
+        sent_options.append(options)
+        self.last_usage = SimpleNamespace(prompt_tokens=1200, completion_tokens=20,
+                                          prompt_tokens_details=SimpleNamespace(cached_tokens=1024))
+        return "test llm response"
+
+    monkeypatch.setattr(OpenAIProvider, "_get_completion", fake_get_completion)
+    monkeypatch.setattr("prich.llm_providers.openai_provider.is_print_enabled", lambda: False)
+    monkeypatch.setattr("prich.llm_providers.openai_provider.is_verbose", lambda: True)
+    provider = OpenAIProvider(name="openai", provider=OpenAIProviderModel(
+        provider_type="openai", name="openai", configuration={"api_key": "test"}, options={"model": "gpt3"},
+        cache_friendly=True, prompt_cache_key="my-template"
+    ))
+    provider.show_response = False
+    prompt = json.dumps([
+        {"content": "question", "role": "user"},
+        {"role": "system", "content": "instructions"},
+    ])
+    result, output = capture_stdout(provider.send_prompt, prompt=prompt)
+    assert result == "test llm response"
+    assert sent_options[0]["messages"] == [
+        {"role": "system", "content": "instructions"},
+        {"role": "user", "content": "question"},
+    ]
+    assert list(sent_options[0]["messages"][1].keys()) == ["role", "content"]
+    assert sent_options[0]["extra_body"] == {"prompt_cache_key": "my-template"}
+    # provider options are not changed by the prompt
+    assert provider.provider.options == {"model": "gpt3"}
+    assert "Usage: prompt tokens 1200, cached tokens 1024, completion tokens 20" in output
+
+
+def _fake_member(response: str = None, delay: float = 0, error: str = None):
+    def call():
+        import time
+        time.sleep(delay)
+        if error:
+            raise RuntimeError(error)
+        return response
+    return call
+
+
+get_provider_group_CASES = [
+    {"id": "failover_first_ok",
+     "group": {"strategy": "failover"},
+     "calls": {"a": _fake_member("from a"), "b": _fake_member("from b")},
+     "expected_member": "a",
+     },
+    {"id": "failover_on_error",
+     "group": {"strategy": "failover"},
+     "calls": {"a": _fake_member(error="down"), "b": _fake_member("from b")},
+     "expected_member": "b",
+     "expected_failures": {"a": 1},
+     },
+    {"id": "failover_on_timeout",
+     "group": {"strategy": "failover", "timeout": 0.1},
+     "calls": {"a": _fake_member("from a", delay=1), "b": _fake_member("from b")},
+     "expected_member": "b",
+     "expected_failures": {"a": 1},
+     },
+    {"id": "latency_uses_fastest_observed",
+     "group": {"strategy": "latency"},
+     "stats": {"a": {"latency_ms": 900, "count": 3, "failures": 0}, "b": {"latency_ms": 100, "count": 3, "failures": 0}},
+     "calls": {"a": _fake_member("from a"), "b": _fake_member("from b")},
+     "expected_member": "b",
+     },
+    {"id": "latency_recently_failed_last",
+     "group": {"strategy": "latency"},
+     "stats": {"a": {"latency_ms": 100, "count": 3, "failures": 2}, "b": {"latency_ms": 900, "count": 3, "failures": 0}},
+     "calls": {"a": _fake_member("from a"), "b": _fake_member("from b")},
+     "expected_member": "b",
+     },
+    {"id": "hedged_second_wins",
+     "group": {"strategy": "hedged", "hedge_after_ms": 50},
+     "calls": {"a": _fake_member("from a", delay=1), "b": _fake_member("from b")},
+     "expected_member": "b",
+     },
+    {"id": "hedged_first_in_time",
+     "group": {"strategy": "hedged", "hedge_after_ms": 1000},
+     "calls": {"a": _fake_member("from a"), "b": _fake_member("from b", delay=1)},
+     "expected_member": "a",
+     },
+    {"id": "all_failed",
+     "group": {"strategy": "hedged", "hedge_after_ms": 10},
+     "calls": {"a": _fake_member(error="down"), "b": _fake_member(error="unauthorized")},
+     "expected_exception_messages": ["All providers of group test-group failed", "a: down", "b: unauthorized"],
+     },
+]
+@pytest.mark.parametrize("case", get_provider_group_CASES, ids=[c["id"] for c in get_provider_group_CASES])
+def test_provider_group(tmp_path, case):
+    from prich.llm_providers.provider_group import ProviderStatsStore, send_to_provider_group
+    from prich.models.config_providers import ProviderGroupModel
+
+    stats_file = tmp_path / "provider_stats.json"
+    if case.get("stats"):
+        stats_file.write_text(json.dumps(case.get("stats")))
+    group = ProviderGroupModel(provider_type="group", providers=list(case["calls"].keys()), **case["group"])
+    if case.get("expected_exception_messages"):
+        with pytest.raises(click.ClickException) as e:
+            send_to_provider_group("test-group", group, case["calls"], ProviderStatsStore(stats_file))
+        for message in case.get("expected_exception_messages"):
+            assert message in str(e.value.message)
+        return
+    member, response, latency_ms = send_to_provider_group("test-group", group, case["calls"], ProviderStatsStore(stats_file))
+    assert member == case["expected_member"]
+    assert response == f"from {case['expected_member']}"
+    saved_stats = json.loads(stats_file.read_text())
+    assert saved_stats[member]["failures"] == 0
+    assert saved_stats[member]["latency_ms"] is not None
+    for failed_member, failures in case.get("expected_failures", {}).items():
+        assert saved_stats[failed_member]["failures"] == failures
+
+
+def test_provider_group_abandoned_call_does_not_block_exit(tmp_path):
+    import threading
+    from prich.llm_providers.provider_group import ProviderStatsStore, send_to_provider_group
+    from prich.models.config_providers import ProviderGroupModel
+
+    release = threading.Event()
+
+    def hung_member():
+        release.wait(30)
+        return "from a"
+
+    group = ProviderGroupModel(provider_type="group", providers=["a", "b"], strategy="failover", timeout=0.1)
+    try:
+        member, _, _ = send_to_provider_group("test-group", group, {"a": hung_member, "b": _fake_member("from b")},
+                                              ProviderStatsStore(tmp_path / "provider_stats.json"))
+        assert member == "b"
+        # timed out call is still running, but in a daemon thread which is not joined at interpreter exit
+        hung_threads = [t for t in threading.enumerate() if t.name == "prich-test-group-a"]
+        assert hung_threads and all(t.daemon for t in hung_threads)
+    finally:
+        release.set()
+
+
+get_stream_writer_CASES = [
+    {"id": "stream_writer_throttled", "chunks": ["a", "b", "c"], "fps": 1, "expected_writes": ["a", "bc", "\n"]},
+    {"id": "stream_writer_unthrottled", "chunks": ["a", "b"], "fps": 0, "expected_writes": ["a", "b", "\n"]},
+    {"id": "stream_writer_disabled", "chunks": ["a", "b"], "fps": 0, "enabled": False, "expected_writes": []},
+    {"id": "stream_writer_print_disabled", "chunks": ["a", "b"], "fps": 0, "print_enabled": False, "expected_writes": []},
+]
+
+
+@pytest.mark.parametrize("case", get_stream_writer_CASES, ids=[c["id"] for c in get_stream_writer_CASES])
+def test_stream_writer(case, monkeypatch):
+    from prich.core.utils import StreamWriter
+
+    class File:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, text):
+            self.writes.append(text)
+
+        def flush(self):
+            pass
+
+    monkeypatch.setattr("prich.core.utils.is_print_enabled", lambda: case.get("print_enabled", True))
+    file = File()
+    with StreamWriter(enabled=case.get("enabled"), fps=case.get("fps"), file=file) as writer:
+        for chunk in case.get("chunks"):
+            writer.write(chunk)
+    assert file.writes == case.get("expected_writes")
+
+
+def test_print_plain_large_output(monkeypatch):
+    import prich.core.utils as utils
+
+    monkeypatch.setattr("prich.core.utils.is_print_enabled", lambda: True)
+    monkeypatch.setattr("prich.core.utils.LARGE_OUTPUT_CHARS", 10)
+
+    def print_outputs():
+        utils.print_plain("[b]small[/b]")
+        utils.print_plain("[b]not markup[/b] " * 2, end="")
+
+    _, output = capture_stdout(print_outputs)
+    assert output == "[b]small[/b]\n" + "[b]not markup[/b] " * 2
+
+
+def test_provider_slot(tmp_path):
+    import threading
+    import time
+    from prich.llm_providers.provider_slots import ProviderSlot
+
+    first = ProviderSlot("local/llm", 2, lock_dir=tmp_path)
+    second = ProviderSlot("local/llm", 2, lock_dir=tmp_path)
+    third = ProviderSlot("local/llm", 2, lock_dir=tmp_path)
+    assert first.try_acquire() and second.try_acquire()
+    assert not third.try_acquire()
+    first.release()
+    assert third.try_acquire()
+    second.release()
+    third.release()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["local_llm.0.lock", "local_llm.1.lock"]
+
+    active = []
+    max_active = []
+
+    def hold_slot():
+        with ProviderSlot("llm", 1, lock_dir=tmp_path) as slot:
+            active.append(slot)
+            max_active.append(len(active))
+            time.sleep(0.05)
+            active.remove(slot)
+        return slot.wait_ms
+
+    threads = [threading.Thread(target=hold_slot) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert max(max_active) == 1
+
+
+def test_step_send_to_llm_max_concurrency(tmp_path, monkeypatch):
+    from prich.core.steps.step_send_to_llm import send_to_llm
+    from prich.llm_providers.provider_group import ProviderStatsStore
+    from prich.models.config import ConfigModel
+    from prich.models.config_providers import EchoProviderModel
+    from prich.models.template import LLMStep, TemplateModel
+
+    monkeypatch.setattr("prich.llm_providers.provider_slots.get_home_dir", lambda: tmp_path)
+    monkeypatch.setattr("prich.llm_providers.provider_group.get_home_dir", lambda: tmp_path)
+    config = ConfigModel(providers={"echo": EchoProviderModel(provider_type="echo", max_concurrency=1)}, provider_modes=[],
+                         settings={"default_provider": "echo"})
+    step = LLMStep(name="ask", type="llm", input="hello")
+    template = TemplateModel(id="test", name="test", version="1.0", schema_version="1.0", steps=[step])
+    assert send_to_llm(template, step, None, config, {}) == "hello"
+    assert ProviderStatsStore().get("echo").get("slot_waits") == 1
+    assert (tmp_path / ".prich" / "locks" / "echo.0.lock").exists()
+
+
+def test_provider_stats_concurrent_saves(tmp_path):
+    import threading
+    from prich.llm_providers.provider_group import ProviderStatsStore
+
+    stats_file = tmp_path / "provider_stats.json"
+    # store loaded before the concurrent updates, they are merged on save
+    reader = ProviderStatsStore(stats_file)
+    reader.record_failure("b")
+
+    def record():
+        for _ in range(5):
+            stats = ProviderStatsStore(stats_file)
+            stats.load()
+            stats.record_slot_wait("a", 10)
+            stats.save()
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    reader.save()
+    saved = json.loads(stats_file.read_text())
+    assert saved["a"] == {"slot_wait_ms": 10, "slot_waits": 20}
+    assert saved["b"] == {"failures": 1}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+class StreamingFakeProvider:
+    name = "fake"
+    show_response = False
+
+    def __init__(self):
+        self.calls = 0
+
+    def send_prompt(self, prompt: str = None, instructions: str = None, input_: str = None) -> str:
+        from prich.core.utils import StreamWriter
+
+        self.calls += 1
+        with StreamWriter(enabled=self.show_response) as writer:
+            for chunk in ["Hel", "lo"]:
+                writer.write(chunk)
+        return "Hello"
+
+
+CASSETTE_CASES = [
+    {"id": "replay_instant", "replay_timing": False},
+    {"id": "replay_timing", "replay_timing": True},
+]
+
+
+@pytest.mark.parametrize("case", CASSETTE_CASES, ids=[c["id"] for c in CASSETTE_CASES])
+def test_cassette_provider(tmp_path, case):
+    from prich.core.run_context import RunContext, use_run_context
+    from prich.llm_providers.cassette_provider import CassetteProvider
+    from prich.models.config_providers import OllamaProviderModel
+
+    provider_config = OllamaProviderModel(provider_type="ollama", model="llama3.2")
+    inner = StreamingFakeProvider()
+    recorded_chunks = []
+    with use_run_context(RunContext(quiet=True, output_sink=recorded_chunks.append)):
+        response = CassetteProvider("local", provider_config, inner, tmp_path).send_prompt(prompt="hi")
+    assert response == "Hello"
+    assert recorded_chunks == ["Hel", "lo"]
+    cassettes = list((tmp_path / "local").glob("*.json"))
+    assert len(cassettes) == 1
+    cassette = json.loads(cassettes[0].read_text())
+    assert cassette["request"]["model"] == "llama3.2"
+    assert [text for _, text in cassette["chunks"]] == ["Hel", "lo"]
+
+    replayed_chunks = []
+    with use_run_context(RunContext(quiet=True, output_sink=replayed_chunks.append)):
+        replay_provider = CassetteProvider("local", provider_config, None, tmp_path, replay=True,
+                                           replay_timing=case["replay_timing"])
+        assert replay_provider.send_prompt(prompt="hi") == "Hello"
+        with pytest.raises(click.ClickException, match="record it with --record"):
+            replay_provider.send_prompt(prompt="other prompt")
+    assert replayed_chunks == ["Hel", "lo"]
+    assert inner.calls == 1
+
+
+def test_step_send_to_llm_record_replay(tmp_path, monkeypatch):
+    from prich.core.run_context import RunContext, use_run_context
+    from prich.core.steps.step_send_to_llm import send_to_llm
+    from prich.models.config import ConfigModel
+    from prich.models.config_providers import EchoProviderModel
+    from prich.models.template import LLMStep, TemplateModel
+
+    monkeypatch.setattr("prich.llm_providers.provider_group.get_home_dir", lambda: tmp_path)
+    config = ConfigModel(providers={"echo": EchoProviderModel(provider_type="echo")}, provider_modes=[],
+                         settings={"default_provider": "echo"})
+    template = TemplateModel(id="test", name="test", version="1.0", schema_version="1.0",
+                             steps=[LLMStep(name="ask", type="llm", input="hello")])
+    with use_run_context(RunContext(quiet=True, record_dir=str(tmp_path / "cassettes"))):
+        assert send_to_llm(template, template.steps[0].model_copy(), None, config, {}) == "hello"
+    assert len(list((tmp_path / "cassettes" / "echo").glob("*.json"))) == 1
+
+    monkeypatch.setattr("prich.llm_providers.get_llm_provider.get_llm_provider",
+                        lambda *args: pytest.fail("provider should not be created when replaying"))
+    with use_run_context(RunContext(quiet=True, replay_dir=str(tmp_path / "cassettes"))):
+        assert send_to_llm(template, template.steps[0].model_copy(), None, config, {}) == "hello"
+        changed_step = LLMStep(name="ask", type="llm", input="bye")
+        with pytest.raises(click.ClickException, match="No recorded response"):
+            send_to_llm(template, changed_step, None, config, {})
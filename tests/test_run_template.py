@@ -828,6 +828,33 @@ get_run_template_CASES = [
             "{\"password\": \"*****\"}"],
         "args": ["--verbose"]
      },
+    {"id": "run_cmd_stream_output_to_stdin", "template":
+        {
+            "id": "test-tpl",
+            "name": "Test TPL",
+            "steps": [
+                CommandStep(
+                    name="Produce lines",
+                    type="command",
+                    call="printf",
+                    args=["error: one\\ninfo: two\\nerror: three\\n"],
+                    output_stream=True,
+                    output_variable="log"
+                ),
+                CommandStep(
+                    name="Count errors",
+                    type="command",
+                    call="grep",
+                    args=["-c", "error"],
+                    stdin="{{ log }}",
+                    output_stream={"line_match": "\\d"},
+                    validate=ValidateStepOutput(match="^2$", match_exit_code=0)
+                ),
+            ],
+            "folder": "."
+        },
+        "expected_output": ["• Produce lines", "• Count errors", "2\n"]
+     },
     {"id": "run_cmd_and_save_output", "template":
         # TemplateModel(
         {
@@ -895,6 +922,33 @@ def test_run_template(case, monkeypatch, basic_config):
                 assert expected in out
 
 
+def test_run_template_streamed_output_not_materialized(monkeypatch, basic_config):
+    from prich.core.state import _loaded_config_paths
+    from prich.core.stream_output import StreamedOutput
+
+    test_template = TemplateModel(id="test-tpl", name="Test TPL", folder=str(Path(__file__).parent.resolve()), steps=[
+        CommandStep(name="Produce lines", type="command", call="printf", args=["one\\ntwo\\n"], output_stream=True,
+                    output_variable="lines"),
+        CommandStep(name="Count lines", type="command", call="wc", args=["-l"], stdin="{{ lines }}", output_stream=True),
+    ])
+    _loaded_templates.clear()
+    _loaded_templates[test_template.id] = test_template
+    monkeypatch.setattr("prich.core.loaders.get_loaded_config", lambda: (basic_config, _loaded_config_paths))
+    monkeypatch.setattr("prich.core.loaders.load_merged_config", lambda: (basic_config, _loaded_config_paths))
+    materialized = []
+    original_str = StreamedOutput.__str__
+    monkeypatch.setattr(StreamedOutput, "__str__", lambda self: materialized.append(self) or original_str(self))
+
+    result, _ = capture_stdout(run_template, test_template.id)
+    # streamed outputs are kept as streams in the run result
+    assert materialized == []
+    assert isinstance(result.output, StreamedOutput)
+    assert isinstance(result.variables["lines"], StreamedOutput)
+    text_result = result.materialize()
+    assert text_result.output.strip() == "2"
+    assert text_result.variables["lines"] == "one\ntwo\n"
+
+
 get_run_template_cli_CASES = [
     {"id": "run_local_template_id", "add_template": True, "args": ["template-local"],
      "expected_output": "• llm step"},
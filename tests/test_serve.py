@@ -0,0 +1,166 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from prich.core.mock_llm import MockLLMOptions, create_mock_llm_server
+from prich.core.server import RunScheduler, create_prich_server
+from prich.core.session import PrichSession
+
+CONFIG_YAML = """
+schema_version: "1.0"
+providers:
+  mock:
+    provider_type: ollama
+    model: mock
+    base_url: "{url}"
+    stream: true
+provider_modes: []
+settings:
+  default_provider: mock
+"""
+
+TEMPLATE_YAML = """
+schema_version: "1.0"
+id: greet
+name: Greet
+version: "1.0"
+variables:
+  - name: name
+    type: str
+    required: true
+steps:
+  - name: Render greeting
+    type: render
+    template: "Hello {{ name }}"
+    output_variable: greeting
+  - name: Ask
+    type: llm
+    input: "{{ greeting }}"
+"""
+
+
+@pytest.fixture
+def prich_server(tmp_path, request):
+    options = getattr(request, "param", {})
+    mock_server = create_mock_llm_server(options=MockLLMOptions(echo=True, ttft_ms=options.get("ttft_ms", 0),
+                                                                error_rate=options.get("error_rate", 0),
+                                                                rate_limit_rate=options.get("rate_limit_rate", 0),
+                                                                retry_after=options.get("retry_after", 1)))
+    threading.Thread(target=mock_server.serve_forever, daemon=True).start()
+    mock_url = f"http://{mock_server.server_address[0]}:{mock_server.server_address[1]}"
+    (tmp_path / "config.yaml").write_text(CONFIG_YAML.format(url=mock_url))
+    (tmp_path / "templates" / "greet").mkdir(parents=True)
+    (tmp_path / "templates" / "greet" / "greet.yaml").write_text(TEMPLATE_YAML)
+    session = PrichSession(config_paths=[tmp_path / "config.yaml"], template_roots=[tmp_path / "templates"])
+    scheduler = RunScheduler(workers=options.get("workers", 2), queue_size=options.get("queue_size", 2))
+    server = create_prich_server(session, scheduler=scheduler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://{server.server_address[0]}:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+    scheduler.shutdown()
+    mock_server.shutdown()
+    mock_server.server_close()
+
+
+def request_server(url: str, body=None, headers: dict = None):
+    data = body.encode("utf-8") if isinstance(body, str) else json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(url, data=data, headers=headers or {}, method="POST" if data is not None else "GET")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, resp.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+get_serve_CASES = [
+    {"id": "run",
+     "path": "/templates/greet/run", "body": {"name": "Alice"},
+     "expected_status": 200, "expected_json": {"output": "Hello Alice", "template_id": "greet"},
+     },
+    {"id": "run_stream",
+     "path": "/templates/greet/run?stream=1", "body": {"name": "Bob"},
+     "expected_status": 200, "expected_events": ["chunk", "chunk", "result"], "expected_chunks": "Hello Bob",
+     },
+    {"id": "run_missing_variable",
+     "path": "/templates/greet/run", "body": {},
+     "expected_status": 400, "expected_json": {"error": "Missing required variable name"},
+     },
+    {"id": "run_not_json_object",
+     "path": "/templates/greet/run", "body": "[1, 2]",
+     "expected_status": 400,
+     },
+    {"id": "run_template_not_found",
+     "path": "/templates/missing/run", "body": {},
+     "expected_status": 404, "expected_json": {"error": "Template missing not found."},
+     },
+    {"id": "templates",
+     "path": "/templates",
+     "expected_status": 200, "expected_json": {"templates": [{"id": "greet", "name": "Greet", "description": None, "variables": ["name"]}]},
+     },
+]
+
+
+@pytest.mark.parametrize("case", get_serve_CASES, ids=[c["id"] for c in get_serve_CASES])
+def test_serve(prich_server, case):
+    status, body = request_server(prich_server + case.get("path"), case.get("body"))
+    assert status == case.get("expected_status")
+    if case.get("expected_json"):
+        data = json.loads(body)
+        for key, value in case.get("expected_json").items():
+            assert data.get(key) == value
+    if case.get("expected_events"):
+        events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+        assert [line[len("event: "):] for line in body.splitlines() if line.startswith("event: ")] == case.get("expected_events")
+        assert "".join(event.get("text") for event in events[:-1]) == case.get("expected_chunks")
+        assert events[-1].get("output") == case.get("expected_chunks")
+
+
+get_serve_provider_failure_CASES = [
+    {"id": "provider_error",
+     "server": {"error_rate": 1},
+     "expected_status": 502, "expected_retry_after": None,
+     },
+    {"id": "provider_rate_limit",
+     "server": {"rate_limit_rate": 1, "retry_after": 7},
+     "expected_status": 503, "expected_retry_after": "7",
+     },
+]
+
+
+@pytest.mark.parametrize("prich_server,case", [(c["server"], c) for c in get_serve_provider_failure_CASES],
+                         ids=[c["id"] for c in get_serve_provider_failure_CASES], indirect=["prich_server"])
+def test_serve_provider_failure(prich_server, case):
+    req = urllib.request.Request(prich_server + "/templates/greet/run", data=json.dumps({"name": "A"}).encode("utf-8"), method="POST")
+    with pytest.raises(urllib.error.HTTPError) as e:
+        urllib.request.urlopen(req, timeout=10)
+    assert e.value.code == case.get("expected_status")
+    assert e.value.headers.get("Retry-After") == case.get("expected_retry_after")
+    assert json.loads(e.value.read().decode("utf-8")).get("error")
+    _, metrics = request_server(prich_server + "/metrics")
+    assert f'prich_requests_total{{template="greet",status="{case.get("expected_status")}"}} 1' in metrics
+
+    status, body = request_server(prich_server + "/templates/greet/run?stream=1", {"name": "A"})
+    events = [json.loads(line[len("data: "):]) for line in body.splitlines() if line.startswith("data: ")]
+    assert status == 200
+    assert events[-1].get("status") == case.get("expected_status")
+
+
+@pytest.mark.parametrize("prich_server", [{"workers": 1, "queue_size": 0, "ttft_ms": 500}], indirect=True)
+def test_serve_queue_full(prich_server):
+    results = []
+    thread = threading.Thread(target=lambda: results.append(request_server(prich_server + "/templates/greet/run", {"name": "A"})))
+    thread.start()
+    time.sleep(0.2)
+    status, body = request_server(prich_server + "/templates/greet/run", {"name": "B"})
+    thread.join()
+    assert status == 429
+    assert results[0][0] == 200
+    _, metrics = request_server(prich_server + "/metrics")
+    assert 'prich_requests_total{template="greet",status="429"} 1' in metrics
+    assert 'prich_request_duration_seconds_count{template="greet"} 2' in metrics
+    assert 'prich_request_duration_seconds_bucket{template="greet",le="+Inf"} 2' in metrics
@@ -0,0 +1,53 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from prich.core.session import PrichSession, PrichError
+from tests.fixtures.session import session_paths  # noqa: F401
+
+get_session_run_CASES = [
+    {"id": "session_run",
+     "variables": {"name": "Alice"},
+     "expected_output": "### User:\nHello Alice!\n\n### Assistant:",
+     "expected_variables": {"name": "Alice", "greeting": "Hello Alice"},
+     "expected_steps": ["Render greeting", "Ask"],
+     },
+    {"id": "session_run_missing_variable",
+     "variables": {},
+     "expected_exception": "Missing required variable name",
+     },
+    {"id": "session_run_not_found",
+     "template_id": "missing",
+     "expected_exception": "Template missing not found.",
+     },
+]
+
+
+@pytest.mark.parametrize("case", get_session_run_CASES, ids=[c["id"] for c in get_session_run_CASES])
+def test_session_run(session_paths, case, capsys):  # noqa: F811
+    config_file, templates_dir = session_paths
+    session = PrichSession(config_paths=[config_file], template_roots=[templates_dir])
+    if case.get("expected_exception"):
+        with pytest.raises(PrichError) as e:
+            session.run(case.get("template_id", "greet"), case.get("variables"))
+        assert case.get("expected_exception") in e.value.message
+        return
+    result = session.run(case.get("template_id", "greet"), case.get("variables"))
+    assert result.template_id == "greet"
+    assert result.output == case.get("expected_output")
+    for name, value in case.get("expected_variables").items():
+        assert result.variables.get(name) == value
+    assert [step.name for step in result.steps] == case.get("expected_steps")
+    assert all(step.duration_ms is not None for step in result.steps)
+    # nothing is printed by default
+    assert capsys.readouterr().out == ""
+
+
+def test_session_run_concurrently(session_paths):  # noqa: F811
+    config_file, templates_dir = session_paths
+    session = PrichSession(config_paths=[config_file], template_roots=[templates_dir])
+    names = [f"user{idx}" for idx in range(20)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda name: session.run("greet", {"name": name}), names))
+    assert [result.variables.get("greeting") for result in results] == [f"Hello {name}" for name in names]
+    # shared loaded template is not changed by runs
+    assert session.get_template("greet").steps[-1].output_console is None
@@ -173,3 +173,388 @@ def test_template_install_force_overwrite(temp_template_dir, mock_paths):
         result = runner.invoke(template_install, [str(temp_template_dir), "--force"])
         assert result.exit_code == 0
         assert "installed successfully" in result.output
+
+
+MIRROR_TEMPLATE_YAML = """
+schema_version: "1.0"
+id: {id}
+name: {id}
+version: "1.0"
+steps:
+  - name: Render
+    type: render
+    template: "Hello"
+"""
+
+
+def _create_local_mirror(mirror_dir, mock_paths, templates: dict):
+    """ Local templates repository mirror with template id: tags, configured in the local config """
+    import json
+    import yaml
+    from prich.cli.template_utils import directory_hash
+
+    manifest_templates = []
+    for template_id, tags in templates.items():
+        (mirror_dir / template_id / "scripts").mkdir(parents=True)
+        (mirror_dir / template_id / f"{template_id}.yaml").write_text(MIRROR_TEMPLATE_YAML.format(id=template_id))
+        (mirror_dir / template_id / "scripts" / "run.py").write_text(f"print('{template_id}')")
+        folder_checksum, files = directory_hash(mirror_dir / template_id)
+        manifest_templates.append({"id": template_id, "name": template_id, "version": "1.0", "schema_version": "1.0",
+                                   "author": "test", "description": "Test template", "files": files,
+                                   "folder_checksum": folder_checksum, "tags": tags})
+    manifest_file = mirror_dir / "manifest.json"
+    manifest_file.write_text(json.dumps({
+        "name": "Mirror", "description": "Local mirror", "repository": str(mirror_dir), "schema_version": "1.0",
+        "templates_path": str(mirror_dir), "templates_download_path": str(mirror_dir), "templates": manifest_templates}))
+    config_file = mock_paths.prich.local_dir / "config.yaml"
+    config = yaml.safe_load(config_file.read_text())
+    config["settings"]["templates_manifest_url"] = str(manifest_file)
+    config_file.write_text(yaml.safe_dump(config))
+    return manifest_file
+
+
+get_template_install_from_mirror_CASES = [
+    {"id": "install_one", "args": ["tpl-a", "-r"], "expected_installed": ["tpl-a"]},
+    {"id": "install_many", "args": ["tpl-a", "tpl-b", "-r"], "expected_installed": ["tpl-a", "tpl-b"]},
+    {"id": "install_all", "args": ["-r", "--all"], "expected_installed": ["tpl-a", "tpl-b", "tpl-c"]},
+    {"id": "install_tag", "args": ["-r", "--tag", "code"], "expected_installed": ["tpl-a", "tpl-c"]},
+    {"id": "install_tag_not_found", "args": ["-r", "--tag", "missing"], "expected_installed": [],
+     "expected_messages": ["No templates to install with tags: missing"]},
+    {"id": "install_not_found", "args": ["tpl-a", "missing", "-r"], "expected_installed": [], "expected_exit_code": 1,
+     "expected_messages": ["Remote Template ID missing not found in the repository"]},
+    {"id": "all_without_remote", "args": ["--all"], "expected_installed": [], "expected_exit_code": 1,
+     "expected_messages": ["Options --all and --tag are supported only with --remote"]},
+    {"id": "no_paths", "args": [], "expected_installed": [], "expected_exit_code": 1,
+     "expected_messages": ["Specify template path, zip file or remote template ids"]},
+]
+
+
+@pytest.mark.parametrize("case", get_template_install_from_mirror_CASES, ids=[c["id"] for c in get_template_install_from_mirror_CASES])
+def test_template_install_from_local_mirror(mock_paths, monkeypatch, tmp_path, case):
+    import yaml
+    _create_local_mirror(tmp_path / "mirror", mock_paths, {"tpl-a": ["code"], "tpl-b": ["docs"], "tpl-c": ["code"]})
+    monkeypatch.setattr("prich.core.loaders._loaded_config", None)
+
+    runner = CliRunner()
+    result = runner.invoke(template_install, case["args"])
+    assert result.exit_code == case.get("expected_exit_code", 0), result.output
+    for message in case.get("expected_messages", []):
+        assert message in result.output
+    assert "checksum is not matching" not in result.output
+    installed = sorted(folder.name for folder in mock_paths.prich.local_templates.iterdir()) \
+        if mock_paths.prich.local_templates.exists() else []
+    assert installed == case["expected_installed"]
+    lock_file = mock_paths.prich.local_dir / "templates.lock"
+    if case["expected_installed"]:
+        assert [item["id"] for item in yaml.safe_load(lock_file.read_text())["templates"]] == case["expected_installed"]
+    else:
+        assert not lock_file.exists()
+
+
+def test_template_install_from_local_mirror_install_failed(mock_paths, monkeypatch, tmp_path):
+    import tempfile
+    import yaml
+    import click
+    from prich.cli import templates
+
+    _create_local_mirror(tmp_path / "mirror", mock_paths, {"tpl-a": ["code"], "tpl-b": ["docs"], "tpl-c": ["code"]})
+    monkeypatch.setattr("prich.core.loaders._loaded_config", None)
+    download_tmp = tmp_path / "download-tmp"
+    download_tmp.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(download_tmp))
+    install_template_source = templates._install_template_source
+
+    def failing_install(path, *args, source=None, **kwargs):
+        if source["id"] == "tpl-b":
+            raise click.ClickException("Install failed")
+        return install_template_source(path, *args, source=source, **kwargs)
+
+    monkeypatch.setattr(templates, "_install_template_source", failing_install)
+    result = CliRunner().invoke(template_install, ["tpl-a", "tpl-b", "tpl-c", "-r"])
+    assert result.exit_code == 1
+    assert "Install failed" in result.output
+    assert sorted(folder.name for folder in mock_paths.prich.local_templates.iterdir()) == ["tpl-a"]
+    lock_file = mock_paths.prich.local_dir / "templates.lock"
+    assert [item["id"] for item in yaml.safe_load(lock_file.read_text())["templates"]] == ["tpl-a"]
+    assert not list(download_tmp.iterdir())
+
+
+def test_templates_sync(mock_paths, monkeypatch, tmp_path):
+    from prich.cli.templates import templates_sync
+
+    manifest_file = _create_local_mirror(tmp_path / "mirror", mock_paths, {"tpl-a": ["code"], "tpl-b": ["docs"]})
+    monkeypatch.setattr("prich.core.loaders._loaded_config", None)
+    runner = CliRunner()
+    result = runner.invoke(templates_sync, [])
+    assert result.exit_code == 1
+    assert "templates.lock not found" in result.output
+
+    assert runner.invoke(template_install, ["tpl-a", "tpl-b", "-r"]).exit_code == 0
+    result = runner.invoke(templates_sync, [])
+    assert result.exit_code == 0, result.output
+    assert "Synced 2 templates, 0 installed, 2 up to date." in result.output
+
+    # modified and removed templates are installed again, venv and other files not in the manifest are ignored
+    templates_dir = mock_paths.prich.local_templates
+    (templates_dir / "tpl-a" / "scripts" / "run.py").write_text("changed")
+    (templates_dir / "tpl-a" / "scripts" / "venv").mkdir()
+    import shutil
+    shutil.rmtree(templates_dir / "tpl-b")
+    result = runner.invoke(templates_sync, [])
+    assert result.exit_code == 0, result.output
+    assert "Synced 2 templates, 2 installed, 0 up to date." in result.output
+    assert (templates_dir / "tpl-a" / "scripts" / "run.py").read_text() == "print('tpl-a')"
+    assert (templates_dir / "tpl-b" / "tpl-b.yaml").exists()
+
+    # downloaded files don't match the locked folder checksum, nothing is installed
+    import tempfile
+    download_tmp = tmp_path / "download-tmp"
+    download_tmp.mkdir()
+    monkeypatch.setattr(tempfile, "tempdir", str(download_tmp))
+    (templates_dir / "tpl-a" / "scripts" / "run.py").write_text("changed")
+    (tmp_path / "mirror" / "tpl-a" / "scripts" / "run.py").write_text("corrupted")
+    result = runner.invoke(templates_sync, [])
+    assert result.exit_code == 1
+    assert "Downloaded template tpl-a folder checksum" in result.output
+    assert (templates_dir / "tpl-a" / "scripts" / "run.py").read_text() == "changed"
+    assert not list(download_tmp.iterdir())
+    (tmp_path / "mirror" / "tpl-a" / "scripts" / "run.py").write_text("print('tpl-a')")
+
+    # locked version is not available in the repository anymore
+    (tmp_path / "mirror" / "tpl-b" / "scripts" / "run.py").write_text("new version")
+    import json
+    from prich.cli.template_utils import directory_hash
+    manifest = json.loads(manifest_file.read_text())
+    manifest["templates"][1]["folder_checksum"] = directory_hash(tmp_path / "mirror" / "tpl-b")[0]
+    manifest["templates"][1]["version"] = "1.1"
+    manifest_file.write_text(json.dumps(manifest))
+    result = runner.invoke(templates_sync, [])
+    assert result.exit_code == 1
+    assert "Template tpl-b 1.0 is not available in the repository (available 1.1)" in result.output
+
+
+template_update_remote_CASES = [
+    {"id": "with_file_checksums", "file_checksums": True},
+    {"id": "without_file_checksums", "file_checksums": False},
+]
+
+
+@pytest.mark.parametrize("case", template_update_remote_CASES, ids=[c["id"] for c in template_update_remote_CASES])
+def test_templates_update_remote(case, mock_paths, monkeypatch, tmp_path):
+    import json
+    import yaml
+    from prich.cli.templates import templates_update
+    from prich.cli.template_utils import directory_hash, file_sha256, load_template_meta
+
+    mirror_dir = tmp_path / "mirror"
+    manifest_file = _create_local_mirror(mirror_dir, mock_paths, {"tpl-a": ["code"]})
+    monkeypatch.setattr("prich.core.loaders._loaded_config", None)
+    runner = CliRunner()
+    assert runner.invoke(template_install, ["tpl-a", "-r"]).exit_code == 0
+    result = runner.invoke(templates_update, [])
+    assert result.exit_code == 0, result.output
+    assert "tpl-a: up to date" in result.output
+
+    # new repository version: one changed and one new file
+    (mirror_dir / "tpl-a" / "scripts" / "run.py").write_text("print('changed')")
+    (mirror_dir / "tpl-a" / "scripts" / "new.py").write_text("print('new')")
+    templates_dir = mock_paths.prich.local_templates
+    (templates_dir / "tpl-a" / "notes.txt").write_text("local file")
+    manifest = json.loads(manifest_file.read_text())
+    folder_checksum, files = directory_hash(mirror_dir / "tpl-a")
+    manifest["templates"][0].update({"version": "1.1", "folder_checksum": folder_checksum, "files": files})
+    if case["file_checksums"]:
+        manifest["templates"][0]["file_checksums"] = {rel: file_sha256(mirror_dir / "tpl-a" / rel) for rel in files}
+    manifest_file.write_text(json.dumps(manifest))
+    yaml_mtime = (templates_dir / "tpl-a" / "tpl-a.yaml").stat().st_mtime_ns
+
+    result = runner.invoke(templates_update, ["tpl-a"])
+    assert result.exit_code == 0, result.output
+    assert "tpl-a: updated (2 changed, 0 removed)" in result.output
+    assert "Updated 1 of 1 templates." in result.output
+    assert (templates_dir / "tpl-a" / "scripts" / "run.py").read_text() == "print('changed')"
+    assert (templates_dir / "tpl-a" / "scripts" / "new.py").read_text() == "print('new')"
+    # unchanged and not installed by prich files are kept
+    assert (templates_dir / "tpl-a" / "tpl-a.yaml").stat().st_mtime_ns == yaml_mtime
+    assert (templates_dir / "tpl-a" / "notes.txt").exists()
+    assert load_template_meta(templates_dir / "tpl-a")["version"] == "1.1"
+    lock = yaml.safe_load((mock_paths.prich.local_dir / "templates.lock").read_text())
+    assert lock["templates"][0]["version"] == "1.1"
+
+    # file removed from the repository is removed from the installed template
+    (mirror_dir / "tpl-a" / "scripts" / "new.py").unlink()
+    folder_checksum, files = directory_hash(mirror_dir / "tpl-a")
+    manifest["templates"][0].update({"version": "1.2", "folder_checksum": folder_checksum, "files": files})
+    if case["file_checksums"]:
+        manifest["templates"][0]["file_checksums"] = {rel: file_sha256(mirror_dir / "tpl-a" / rel) for rel in files}
+    manifest_file.write_text(json.dumps(manifest))
+    result = runner.invoke(templates_update, [])
+    assert result.exit_code == 0, result.output
+    assert "tpl-a: updated (0 changed, 1 removed)" in result.output
+    assert not (templates_dir / "tpl-a" / "scripts" / "new.py").exists()
+
+    # downloaded file doesn't match the manifest, nothing is updated
+    (mirror_dir / "tpl-a" / "scripts" / "run.py").write_text("print('v3')")
+    folder_checksum, files = directory_hash(mirror_dir / "tpl-a")
+    manifest["templates"][0].update({"version": "1.3", "folder_checksum": folder_checksum, "files": files})
+    if case["file_checksums"]:
+        manifest["templates"][0]["file_checksums"] = {rel: file_sha256(mirror_dir / "tpl-a" / rel) for rel in files}
+    manifest_file.write_text(json.dumps(manifest))
+    (mirror_dir / "tpl-a" / "scripts" / "run.py").write_text("corrupted")
+    result = runner.invoke(templates_update, ["tpl-a"])
+    assert result.exit_code == 1
+    assert ("files don't match the manifest checksums: scripts/run.py" if case["file_checksums"] else
+            "Updated template tpl-a folder checksum") in result.output
+    assert (templates_dir / "tpl-a" / "scripts" / "run.py").read_text() == "print('changed')"
+    assert load_template_meta(templates_dir / "tpl-a")["version"] == "1.2"
+
+    # files without checksum in the manifest are downloaded and checked by the folder checksum
+    (mirror_dir / "tpl-a" / "scripts" / "run.py").write_text("print('v3')")
+    manifest["templates"][0].get("file_checksums", {}).pop("scripts/run.py", None)
+    manifest_file.write_text(json.dumps(manifest))
+    result = runner.invoke(templates_update, ["tpl-a"])
+    assert result.exit_code == 0, result.output
+    assert "tpl-a: updated (1 changed, 0 removed)" in result.output
+    assert (templates_dir / "tpl-a" / "scripts" / "run.py").read_text() == "print('v3')"
+
+
+def test_templates_update_folder(mock_paths, monkeypatch, tmp_path):
+    from prich.cli.templates import templates_update
+
+    source_dir = tmp_path / "source" / "tpl-a"
+    (source_dir / "scripts").mkdir(parents=True)
+    (source_dir / "tpl-a.yaml").write_text(MIRROR_TEMPLATE_YAML.format(id="tpl-a"))
+    (source_dir / "scripts" / "run.py").write_text("print('tpl-a')")
+    runner = CliRunner()
+    assert runner.invoke(template_install, [str(source_dir)]).exit_code == 0
+    (source_dir / "scripts" / "run.py").write_text("print('changed')")
+    result = runner.invoke(templates_update, [])
+    assert result.exit_code == 0, result.output
+    assert "tpl-a: updated (1 changed, 0 removed)" in result.output
+    assert (mock_paths.prich.local_templates / "tpl-a" / "scripts" / "run.py").read_text() == "print('changed')"
+
+    # templates without install metadata (installed by older versions) are skipped
+    (mock_paths.prich.local_templates / "tpl-a" / ".prich-meta.json").unlink()
+    result = runner.invoke(templates_update, [])
+    assert result.exit_code == 0, result.output
+    assert "no install metadata" in result.output
+
+    result = runner.invoke(templates_update, ["missing"])
+    assert result.exit_code == 1
+    assert "Template missing is not installed" in result.output
+
+
+class FakeDownloadResponse:
+    def __init__(self, status_code: int, chunks: list, headers: dict = None, fail_after: int = None):
+        self.status_code = status_code
+        self.chunks = chunks
+        self.headers = headers or {}
+        self.fail_after = fail_after
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        import requests
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+    def iter_content(self, chunk_size=None):
+        import requests
+        for idx, chunk in enumerate(self.chunks):
+            if self.fail_after is not None and idx >= self.fail_after:
+                raise requests.exceptions.ChunkedEncodingError("Connection broken")
+            yield chunk
+
+
+class FakeDownloadSession:
+    def __init__(self, responses: list):
+        self.responses = responses
+        self.requests = []
+
+    def get(self, url, stream=None, headers=None, timeout=None):
+        self.requests.append(headers)
+        return self.responses.pop(0)
+
+
+get_download_file_CASES = [
+    {"id": "download",
+     "responses": [FakeDownloadResponse(200, [b"abc", b"def"])],
+     "expected_content": b"abcdef", "expected_ranges": [None], "expected_restarts": 0},
+    {"id": "resume_interrupted",
+     "responses": [FakeDownloadResponse(200, [b"abc", b"def"], {"ETag": '"v1"'}, fail_after=1),
+                   FakeDownloadResponse(206, [b"def"])],
+     "expected_content": b"abcdef", "expected_ranges": [None, "bytes=3-"], "expected_restarts": 0},
+    {"id": "restart_without_ranges",
+     "responses": [FakeDownloadResponse(200, [b"abc", b"def"], {"ETag": '"v1"'}, fail_after=1),
+                   FakeDownloadResponse(200, [b"abc", b"def"])],
+     "expected_content": b"abcdef", "expected_ranges": [None, "bytes=3-"], "expected_restarts": 1},
+    {"id": "restart_on_range_not_satisfiable",
+     "responses": [FakeDownloadResponse(200, [b"abc", b"def"], {"ETag": '"v1"'}, fail_after=1),
+                   FakeDownloadResponse(416, []),
+                   FakeDownloadResponse(200, [b"abc", b"def"])],
+     "expected_content": b"abcdef", "expected_ranges": [None, "bytes=3-", None], "expected_restarts": 1},
+    {"id": "range_not_satisfiable_on_last_attempt",
+     "responses": [FakeDownloadResponse(200, [b"abc", b"def"], {"ETag": '"v1"'}, fail_after=1),
+                   FakeDownloadResponse(416, [])],
+     "retries": 1,
+     "expected_exception": "download restarted too many times"},
+    {"id": "not_found",
+     "responses": [FakeDownloadResponse(404, [])],
+     "expected_exception": "404 Error"},
+]
+
+
+@pytest.mark.parametrize("case", get_download_file_CASES, ids=[c["id"] for c in get_download_file_CASES])
+def test_download_file(tmp_path, monkeypatch, case):
+    import requests
+    from prich.cli.templates import _download_file, DOWNLOAD_RETRIES
+
+    monkeypatch.setattr("time.sleep", lambda _: None)
+    session = FakeDownloadSession(list(case["responses"]))
+    received = []
+    restarts = []
+    dest_file = tmp_path / "file.zip"
+    if case.get("expected_exception"):
+        with pytest.raises(requests.HTTPError, match=case["expected_exception"]):
+            _download_file("https://example.com/file.zip", dest_file, session=session, retries=case.get("retries", DOWNLOAD_RETRIES))
+        return
+    _download_file("https://example.com/file.zip", dest_file, session=session, on_chunk=received.append,
+                   on_restart=lambda: restarts.append(1))
+    assert dest_file.read_bytes() == case["expected_content"]
+    assert [(headers or {}).get("Range") for headers in session.requests] == case["expected_ranges"]
+    assert len(restarts) == case["expected_restarts"]
+    if not restarts:
+        assert b"".join(received) == case["expected_content"]
+
+
+get_ordered_directory_hasher_CASES = [
+    {"id": "in_order", "order": ["a.txt", "b.yaml", "scripts/a.py"], "restart": None, "expected_valid": True},
+    {"id": "reversed", "order": ["scripts/a.py", "b.yaml", "a.txt"], "restart": None, "expected_valid": True},
+    {"id": "restart_buffered_file", "order": ["scripts/a.py", "b.yaml", "a.txt"], "restart": "scripts/a.py", "expected_valid": True},
+    {"id": "restart_hashed_file", "order": ["a.txt", "b.yaml", "scripts/a.py"], "restart": "a.txt", "expected_valid": False},
+]
+
+
+@pytest.mark.parametrize("case", get_ordered_directory_hasher_CASES, ids=[c["id"] for c in get_ordered_directory_hasher_CASES])
+def test_ordered_directory_hasher(tmp_path, case):
+    from prich.cli.template_utils import OrderedDirectoryHasher, directory_hash
+
+    files = {"a.txt": b"x" * 100, "b.yaml": b"id: b", "scripts/a.py": b"print(1)"}
+    for rel, content in files.items():
+        (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel).write_bytes(content)
+    hasher = OrderedDirectoryHasher(list(files))
+    for rel in case["order"]:
+        hasher.update(rel, files[rel][:3])
+        if rel == case["restart"]:
+            hasher.restart(rel)
+            hasher.update(rel, files[rel][:3])
+        hasher.update(rel, files[rel][3:])
+        hasher.complete(rel)
+    assert hasher.valid == case["expected_valid"]
+    if hasher.valid:
+        assert hasher.hexdigest() == directory_hash(tmp_path)[0]
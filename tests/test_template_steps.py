@@ -346,3 +346,747 @@ def test_step_send_to_llm(tmp_path, case, monkeypatch):
         assert actual_output == case.get('expected_output', ''), "Method output to console value failed"
         # check method return
         assert actual_res == case.get("expected_return"), "Method return value failed"
+
+
+def test_step_send_to_llm_reuses_provider(monkeypatch):
+    from prich.core.steps.step_send_to_llm import send_to_llm
+    from prich.llm_providers import get_llm_provider as get_llm_provider_module
+
+    created = []
+    original_get_llm_provider = get_llm_provider_module.get_llm_provider
+    def counting_get_llm_provider(name, provider):
+        created.append(name)
+        return original_get_llm_provider(name, provider)
+    monkeypatch.setattr(get_llm_provider_module, "get_llm_provider", counting_get_llm_provider)
+    monkeypatch.setattr("prich.core.steps.step_send_to_llm.is_quiet", lambda: True)
+
+    config = ConfigModel(providers={"echo-provider": EchoProviderModel(name="echo-provider", provider_type="echo")}, provider_modes=[], settings=SettingsConfig(default_provider="echo-provider"))
+    template = TemplateModel(id="test", name="test", steps=[LLMStep(type="llm", name="test", input="hello")])
+    llm_providers = {}
+    for question in ["first", "second"]:
+        step = LLMStep(type="llm", name="test", input=question)
+        assert send_to_llm(template, step, None, config, {}, llm_providers=llm_providers) == question
+    assert created == ["echo-provider"]
+    assert list(llm_providers.keys()) == ["echo-provider"]
+
+
+def test_streamed_output_chunks_and_lines():
+    from prich.core.stream_output import StreamedOutput
+
+    # multibyte characters split across read chunks and spooled to the disk
+    text = "first line ✓\nsecond line ✓✓\nlast"
+    output = StreamedOutput.from_text(text, spool_max_size=8, chunk_size=5)
+    assert output.size == len(text.encode("utf-8"))
+    assert "".join(output.iter_chunks()) == text
+    assert list(output.iter_lines()) == ["first line ✓\n", "second line ✓✓\n", "last"]
+    assert str(output) == text
+    assert output == text
+    assert bool(output)
+    assert not StreamedOutput()
+
+
+get_step_run_command_stream_CASES = [
+    {"id": "stream_output",
+     "step": {"call": "printf", "args": ["one\\ntwo\\nthree\\n"], "output_stream": True},
+     "expected_return": "one\ntwo\nthree\n"},
+    {"id": "stream_output_small_chunks",
+     "step": {"call": "printf", "args": ["one\\ntwo\\nthree\\n"], "output_stream": {"chunk_size": 2, "spool_max_size": 3}},
+     "expected_return": "one\ntwo\nthree\n"},
+    {"id": "stream_output_line_match",
+     "step": {"call": "printf", "args": ["one\\ntwo\\nthree"], "output_stream": {"line_match": "^t"}},
+     "expected_return": "two\nthree"},
+    {"id": "stream_output_line_not_match",
+     "step": {"call": "printf", "args": ["one\\ntwo\\nthree\\n"], "output_stream": {"line_not_match": "o"}},
+     "expected_return": "three\n"},
+    {"id": "stream_output_stdin_from_streamed_variable",
+     "step": {"call": "cat", "stdin": "{{ prev }}", "output_stream": True},
+     "variables": {"prev": "streamed"},
+     "expected_return": "streamed text\n"},
+    {"id": "buffered_output_stdin_from_streamed_variable",
+     "step": {"call": "cat", "stdin": "{{ prev }}"},
+     "variables": {"prev": "streamed"},
+     "expected_return": "streamed text\n"},
+    {"id": "buffered_output_stdin_template",
+     "step": {"call": "cat", "stdin": "Hello {{ name }}"},
+     "variables": {"name": "World"},
+     "expected_return": "Hello World"},
+]
+@pytest.mark.parametrize("case", get_step_run_command_stream_CASES, ids=[c["id"] for c in get_step_run_command_stream_CASES])
+def test_step_run_command_stream(tmp_path, case, monkeypatch):
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.core.stream_output import StreamedOutput
+    from prich.models.template import CommandStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    step = CommandStep(type="command", name="stream", **case["step"])
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    variables = {}
+    for k, v in case.get("variables", {}).items():
+        variables[k] = StreamedOutput.from_text(f"{v} text\n") if k == "prev" else v
+
+    (actual_res, exit_code), actual_output = capture_stdout(run_command_step, template, step, variables)
+    assert exit_code == 0
+    assert actual_output == ""
+    if step.output_stream:
+        assert isinstance(actual_res, StreamedOutput)
+    assert str(actual_res) == case["expected_return"]
+
+
+def test_step_run_command_stream_tee(tmp_path, monkeypatch):
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.models.template import CommandStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    output_file = tmp_path / "out.txt"
+    step = CommandStep(type="command", name="stream", call="printf", args=["a\\nb\\n"], output_stream=True,
+                       output_file=str(output_file), output_console=True)
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    (actual_res, exit_code), actual_output = capture_stdout(run_command_step, template, step, {})
+    assert actual_res.teed_file and actual_res.teed_console
+    assert output_file.read_text() == "a\nb\n"
+    assert actual_output == "a\nb\n"
+
+
+def test_step_run_command_stream_read_failure(tmp_path, monkeypatch):
+    import time
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.core.stream_output import StreamedOutput
+    from prich.models.template import CommandStep
+
+    outputs = []
+
+    class FailingOutput(StreamedOutput):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.closed = False
+            outputs.append(self)
+
+        def write(self, data: bytes):
+            raise OSError("No space left on device")
+
+        def close(self):
+            self.closed = True
+            super().close()
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    monkeypatch.setattr("prich.core.steps.step_run_command.StreamedOutput", FailingOutput)
+    step = CommandStep(type="command", name="stream", call="sh", args=["-c", "echo started; sleep 30"], output_stream=True)
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    started = time.monotonic()
+    with pytest.raises(click.ClickException, match="No space left on device"):
+        run_command_step(template, step, {})
+    # process is killed (not waited for 30 seconds) and the spool file is closed
+    assert time.monotonic() - started < 10
+    assert outputs[0].closed
+
+
+WORKER_SCRIPT = """
+import os
+import sys
+sys.prich_calls = getattr(sys, "prich_calls", 0) + 1
+print(f"{sys.argv[1:]} {sys.stdin.read()} calls={sys.prich_calls} pid={os.getpid()}")
+if os.environ.get("FAIL"):
+    raise ValueError("failed")
+if os.environ.get("CRASH"):
+    os._exit(3)
+sys.exit(int(os.environ.get("EXIT_CODE", "0")))
+"""
+
+
+def test_step_python_worker(tmp_path, monkeypatch):
+    import os
+    import re
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.models.template import PythonStep
+
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "count.py").write_text(WORKER_SCRIPT)
+    env = dict(os.environ)
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: env)
+    step = PythonStep(type="python", name="count", call="count.py", args=["{{ name }}"], stdin="in",
+                      worker={"max_calls": 3})
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+
+    def run():
+        (actual_res, exit_code), _ = capture_stdout(run_command_step, template, step, {"name": "a"})
+        match = re.fullmatch(r"\['a'\] in calls=(\d+) pid=(\d+)\n(.*)", actual_res, re.DOTALL)
+        assert match, actual_res
+        return int(match.group(1)), match.group(2), exit_code, match.group(3)
+
+    # script module state and imports are kept between calls of one worker
+    first, second, third = run(), run(), run()
+    assert [first[0], second[0], third[0]] == [1, 2, 3]
+    assert first[1] == second[1] == third[1]
+    # worker is restarted after max_calls
+    calls, pid, exit_code, _ = run()
+    assert calls == 1 and pid != first[1] and exit_code == 0
+
+    env["EXIT_CODE"] = "4"
+    assert run()[2] == 4
+    env.pop("EXIT_CODE")
+    env["FAIL"] = "1"
+    _, _, exit_code, error = run()
+    assert exit_code == 1 and "ValueError: failed" in error
+    env.pop("FAIL")
+    # crashed worker is replaced
+    env["CRASH"] = "1"
+    (actual_res, exit_code), _ = capture_stdout(run_command_step, template, step, {"name": "a"})
+    assert exit_code == 3 and "Python worker exited unexpectedly" in actual_res
+    env.pop("CRASH")
+    calls, crashed_pid, exit_code, _ = run()
+    assert calls == 1 and exit_code == 0
+
+
+def test_step_python_worker_with_output_stream():
+    from pydantic import ValidationError
+    from prich.models.template import PythonStep
+
+    with pytest.raises(ValidationError, match="worker is not supported together with output_stream"):
+        PythonStep(type="python", name="count", call="count.py", worker=True, output_stream=True)
+
+
+def test_step_python_worker_fd_output(tmp_path, monkeypatch):
+    import os
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.models.template import PythonStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: dict(os.environ))
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "child.py").write_text(
+        "import os, subprocess, sys\n"
+        "print('script-output', flush=True)\n"
+        "subprocess.run(['echo', 'child-output'])\n"
+        "os.write(2, b'fd-error\\n')\n"
+        "print('script-error', file=sys.stderr)\n")
+    results = []
+    for mode in [{}, {"worker": True}]:
+        step = PythonStep(type="python", name="child", call="child.py", **mode)
+        template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+        (actual_res, exit_code), _ = capture_stdout(run_command_step, template, step, {})
+        results.append((actual_res, exit_code))
+    # subprocess and C extension (fd level) output is captured by the worker like by the script subprocess
+    assert results[0] == results[1] == ("script-output\nchild-output\nfd-error\nscript-error\n", 0)
+
+
+get_step_python_in_process_CASES = [
+    {"id": "run_variables",
+     "script": "def run(variables):\n    print('items', len(variables['items']))\n    return variables['name'].upper()\n",
+     "variables": {"name": "world", "items": [1, 2, 3]},
+     "expected_return": "items 3\nWORLD", "expected_exit_code": 0},
+    {"id": "run_streamed_variable",
+     "script": "def run(variables):\n    return variables['prev'].strip()\n",
+     "variables": {"prev": "streamed"},
+     "expected_return": "streamed text", "expected_exit_code": 0},
+    {"id": "main_argv_stdin",
+     "script": "import sys\ndef main(argv):\n    print(argv, sys.stdin.read())\n    return 3\n",
+     "step": {"args": ["{{ name }}", "b"], "stdin": "in"}, "variables": {"name": "a"},
+     "expected_return": "['a', 'b'] in\n", "expected_exit_code": 3},
+    {"id": "main_sys_exit",
+     "script": "import sys\ndef main(argv):\n    sys.exit(2)\n",
+     "expected_return": "", "expected_exit_code": 2},
+    {"id": "script_main_block_not_executed",
+     "script": "def run(variables):\n    return 'run'\nif __name__ == '__main__':\n    print('main')\n",
+     "expected_return": "run", "expected_exit_code": 0},
+    {"id": "exception",
+     "script": "def run(variables):\n    raise ValueError('bad input')\n",
+     "expected_return_contains": "ValueError: bad input", "expected_exit_code": 1},
+    {"id": "no_entry_point",
+     "script": "print('hello')\n",
+     "expected_exception_message": "should define run(variables) or main(argv) function"},
+    {"id": "import_error",
+     "script": "import not_existing_module_xyz\n",
+     "expected_exception_message": "Failed to load python script"},
+]
+@pytest.mark.parametrize("case", get_step_python_in_process_CASES, ids=[c["id"] for c in get_step_python_in_process_CASES])
+def test_step_python_in_process(tmp_path, case, monkeypatch):
+    import io
+    import re
+    import sys
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.core.stream_output import StreamedOutput
+    from prich.models.template import PythonStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {})
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "script.py").write_text(case["script"])
+    step = PythonStep(type="python", name="script", call="script.py", in_process=True, **case.get("step", {}))
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    variables = {k: StreamedOutput.from_text(f"{v} text\n") if k == "prev" else v
+                 for k, v in case.get("variables", {}).items()}
+    stdout = io.StringIO()
+    for name in ("stdin", "stdout", "stderr"):
+        monkeypatch.setattr(sys, name, stdout if name == "stdout" else getattr(sys, name))
+    if case.get("expected_exception_message"):
+        with pytest.raises(click.ClickException, match=re.escape(case["expected_exception_message"])):
+            run_command_step(template, step, variables)
+    else:
+        (actual_res, exit_code), actual_output = capture_stdout(run_command_step, template, step, variables)
+        assert exit_code == case["expected_exit_code"]
+        assert actual_output == ""
+        if "expected_return" in case:
+            assert actual_res == case["expected_return"]
+        if "expected_return_contains" in case:
+            assert case["expected_return_contains"] in actual_res
+    # writes outside of the script call go to the original stream
+    print("after")
+    assert stdout.getvalue() == "after\n"
+
+
+def test_step_python_in_process_other_threads(tmp_path, monkeypatch):
+    import io
+    import sys
+    import threading
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.core.stream_output import StreamedOutput
+    from prich.models.template import PythonStep
+
+    class NotReadOutput(StreamedOutput):
+        def __str__(self):
+            raise AssertionError("not used streamed output is read")
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {})
+    for name in ("stdin", "stdout", "stderr"):
+        monkeypatch.setattr(sys, name, getattr(sys, name))
+    stdout = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", stdout)
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "script.py").write_text(
+        "def run(variables):\n"
+        "    print('script-output')\n"
+        "    variables['started'].set()\n"
+        "    variables['printed'].wait(5)\n"
+        "    return variables['prev'].strip()\n")
+    step = PythonStep(type="python", name="script", call="script.py", in_process=True)
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    started, printed = threading.Event(), threading.Event()
+
+    def other_thread():
+        started.wait(5)
+        print("other-thread-output")
+        printed.set()
+
+    thread = threading.Thread(target=other_thread)
+    thread.start()
+    result = run_command_step(template, step, {"started": started, "printed": printed,
+                                               "prev": StreamedOutput.from_text("streamed\n"),
+                                               "unused": NotReadOutput.from_text("unused")})
+    thread.join()
+    # output printed by other threads during the script call is not captured
+    assert result == ("script-output\nstreamed", 0)
+    assert stdout.getvalue() == "other-thread-output\n"
+
+
+def test_step_python_in_process_reload(tmp_path, monkeypatch):
+    import os
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.models.template import PythonStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {})
+    (tmp_path / "scripts").mkdir()
+    script = tmp_path / "scripts" / "script.py"
+    script.write_text("calls = []\ndef run(variables):\n    calls.append(1)\n    return f'v1 {len(calls)}'\n")
+    step = PythonStep(type="python", name="script", call="script.py", in_process=True)
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    # script module is loaded once
+    assert run_command_step(template, step, {}) == ("v1 1", 0)
+    assert run_command_step(template, step, {}) == ("v1 2", 0)
+    # and reloaded when changed
+    script.write_text("def run(variables):\n    return 'v2'\n")
+    os.utime(script, ns=(script.stat().st_atime_ns, script.stat().st_mtime_ns + 1_000_000))
+    assert run_command_step(template, step, {}) == ("v2", 0)
+
+
+def test_step_python_in_process_with_venv():
+    from prich.models.template import PythonStep
+
+    step = PythonStep(type="python", name="script", call="script.py", in_process=True)
+    with pytest.raises(click.ClickException, match="in_process is supported only in templates without venv"):
+        TemplateModel(id="test", name="test", steps=[step], venv="isolated")
+
+
+get_step_run_command_env_vars_CASES = [
+    {"id": "env_vars",
+     "step": {"call": "printenv", "args": ["GREETING", "EMPTY"],
+              "env_vars": {"GREETING": "Hello {{ name }}", "EMPTY": ""}},
+     "expected_return": "Hello World\n\n"},
+    {"id": "vars_file_all_variables",
+     "step": {"call": "sh", "args": ["-c", "cat `printenv PRICH_VARS_FILE`"], "vars_file": "json"},
+     "expected_json": {"name": "World", "items": [1, 2], "prev": "streamed text\n"}},
+    {"id": "vars_file_selected_variables_custom_env_var",
+     "step": {"call": "sh", "args": ["-c", "cat `printenv VARS`"], "vars_file": {"variables": ["prev"], "env_var": "VARS"}},
+     "expected_json": {"prev": "streamed text\n"}},
+    {"id": "vars_file_streamed_output",
+     "step": {"call": "sh", "args": ["-c", "cat `printenv PRICH_VARS_FILE`"], "vars_file": "json", "output_stream": True},
+     "expected_json": {"name": "World", "items": [1, 2], "prev": "streamed text\n"}},
+    {"id": "vars_file_not_defined_variable",
+     "step": {"call": "sh", "args": ["-c", "true"], "vars_file": {"variables": ["missing"]}},
+     "expected_exception_message": "vars_file variables are not defined: missing"},
+]
+@pytest.mark.parametrize("case", get_step_run_command_env_vars_CASES, ids=[c["id"] for c in get_step_run_command_env_vars_CASES])
+def test_step_run_command_env_vars(tmp_path, case, monkeypatch):
+    import json
+    import tempfile
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.core.stream_output import StreamedOutput
+    from prich.models.template import CommandStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    step = CommandStep(type="command", name="env", **case["step"])
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    variables = {"name": "World", "items": [1, 2], "prev": StreamedOutput.from_text("streamed text\n")}
+    if case.get("expected_exception_message"):
+        with pytest.raises(click.ClickException, match=case["expected_exception_message"]):
+            run_command_step(template, step, variables)
+        return
+    (actual_res, exit_code), _ = capture_stdout(run_command_step, template, step, variables)
+    assert exit_code == 0
+    if "expected_return" in case:
+        assert str(actual_res) == case["expected_return"]
+    if "expected_json" in case:
+        actual_json = json.loads(str(actual_res))
+        assert {k: v for k, v in actual_json.items() if k != "builtin"} == case["expected_json"]
+    # vars file is removed after the step
+    assert not list(tmp_path.glob("prich-vars-*"))
+
+
+def test_step_python_env_vars_and_vars_file(tmp_path, monkeypatch):
+    import os
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.models.template import PythonStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: dict(os.environ))
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "vars.py").write_text(
+        "import json, os\n"
+        "def run(variables):\n"
+        "    return read()\n"
+        "def read():\n"
+        "    with open(os.environ['PRICH_VARS_FILE']) as f:\n"
+        "        return os.environ['MODE'] + ' ' + json.load(f)['diff']\n"
+        "if __name__ == '__main__':\n"
+        "    print(read(), end='')\n")
+    for mode in [{}, {"worker": True}, {"in_process": True}]:
+        step = PythonStep(type="python", name="vars", call="vars.py", vars_file={"variables": ["diff"]},
+                          env_vars={"MODE": "{{ mode }}"}, **mode)
+        template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+        (actual_res, exit_code), _ = capture_stdout(run_command_step, template, step, {"diff": "x" * 300000, "mode": "m"})
+        assert (actual_res, exit_code) == ("m " + "x" * 300000, 0), mode
+    assert "MODE" not in os.environ and "PRICH_VARS_FILE" not in os.environ
+
+
+get_step_run_command_limits_CASES = [
+    {"id": "timeout_kills_child_processes",
+     "step": {"call": "sh", "args": ["-c", "sleep 30 & sleep 30"], "timeout": 0.5},
+     "expected_exception_message": "Step 'limits' timed out after 0.5 seconds"},
+    {"id": "timeout_streamed",
+     "step": {"call": "sh", "args": ["-c", "echo started; sleep 30"], "timeout": 0.5, "output_stream": True},
+     "expected_exception_message": "Step 'limits' timed out after 0.5 seconds"},
+    {"id": "timeout_not_reached",
+     "step": {"call": "echo", "args": ["done"], "timeout": 10},
+     "expected_return": "done\n"},
+    {"id": "max_output_truncate",
+     "step": {"call": "sh", "args": ["-c", "yes | head -c 200000"], "max_output_bytes": 10},
+     "expected_return": "y\ny\ny\ny\ny\n"},
+    {"id": "max_output_error",
+     "step": {"call": "yes", "max_output_bytes": 1000, "on_max_output": "error"},
+     "expected_exception_message": "Step 'limits' output exceeded max_output_bytes (1000 bytes)"},
+    {"id": "stderr_variable",
+     "step": {"call": "sh", "args": ["-c", "echo out; echo err >&2; exit 3"], "stderr_variable": "errors"},
+     "expected_return": "out\n", "expected_exit_code": 3, "expected_variables": {"errors": "err\n"}},
+    {"id": "rlimits_open_files",
+     "step": {"call": "sh", "args": ["-c", "ulimit -n"], "rlimits": {"open_files": 16}},
+     "expected_return": "16\n"},
+    {"id": "rlimits_cpu_seconds",
+     "step": {"call": "sh", "args": ["-c", "ulimit -t"], "rlimits": {"cpu_seconds": 5}},
+     "expected_return": "5\n"},
+]
+@pytest.mark.parametrize("case", get_step_run_command_limits_CASES, ids=[c["id"] for c in get_step_run_command_limits_CASES])
+def test_step_run_command_limits(tmp_path, case, monkeypatch):
+    import re
+    import time
+    from prich.core.steps.step_run_command import run_command_step
+    from prich.models.template import CommandStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    step = CommandStep(type="command", name="limits", **case["step"])
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    variables = {}
+    started = time.monotonic()
+    if case.get("expected_exception_message"):
+        with pytest.raises(click.ClickException, match=re.escape(case["expected_exception_message"])):
+            capture_stdout(run_command_step, template, step, variables)
+        # child processes holding the output pipe are killed too
+        assert time.monotonic() - started < 10
+        return
+    (actual_res, exit_code), _ = capture_stdout(run_command_step, template, step, variables)
+    assert str(actual_res) == case["expected_return"]
+    assert exit_code == case.get("expected_exit_code", 0)
+    for name, value in case.get("expected_variables", {}).items():
+        assert variables[name] == value
+
+
+get_step_limits_validation_CASES = [
+    {"id": "max_output_with_output_stream", "step": {"type": "command", "call": "echo", "max_output_bytes": 10, "output_stream": True},
+     "expected_exception_message": "max_output_bytes and stderr_variable are not supported together with output_stream"},
+    {"id": "invalid_stderr_variable", "step": {"type": "command", "call": "echo", "stderr_variable": "bad-name"},
+     "expected_exception_message": "Invalid stderr_variable name 'bad-name'"},
+    {"id": "timeout_with_worker", "step": {"type": "python", "call": "script.py", "timeout": 1, "worker": True},
+     "expected_exception_message": "not supported together with worker or in_process"},
+    {"id": "zero_timeout", "step": {"type": "command", "call": "echo", "timeout": 0},
+     "expected_exception_message": "greater than 0"},
+    {"id": "unknown_rlimit", "step": {"type": "command", "call": "echo", "rlimits": {"memory": 10}},
+     "expected_exception_message": "Extra inputs are not permitted"},
+]
+@pytest.mark.parametrize("case", get_step_limits_validation_CASES, ids=[c["id"] for c in get_step_limits_validation_CASES])
+def test_step_limits_validation(case):
+    import re
+    from pydantic import ValidationError
+    from prich.models.template import CommandStep, PythonStep
+
+    model = PythonStep if case["step"]["type"] == "python" else CommandStep
+    with pytest.raises(ValidationError, match=re.escape(case["expected_exception_message"])):
+        model(name="limits", **case["step"])
+
+
+get_step_run_pipeline_CASES = [
+    {"id": "two_commands",
+     "commands": [{"call": "printf", "args": ["b\\na\\nc\\n"]}, {"call": "sort"}],
+     "expected_return": "a\nb\nc\n", "expected_exit_codes": [0, 0], "expected_exit_code": 0},
+    {"id": "three_commands_with_variables",
+     "commands": [{"call": "printf", "args": ["{{ text }}"]}, {"call": "grep", "args": ["-v", "skip"]}, {"call": "head", "args": ["-n", "1"]}],
+     "variables": {"text": "skip\nkeep 1\nkeep 2\n"},
+     "expected_return": "keep 1\n", "expected_exit_codes": [0, 0, 0], "expected_exit_code": 0},
+    {"id": "stdin",
+     "commands": [{"call": "cat"}, {"call": "wc", "args": ["-w"]}], "stdin": "{{ text }}",
+     "variables": {"text": "one\ntwo\n"},
+     "expected_return_stripped": "2", "expected_exit_codes": [0, 0], "expected_exit_code": 0},
+    {"id": "streamed_stdin",
+     "commands": [{"call": "cat"}, {"call": "tr", "args": ["a-z", "A-Z"]}], "stdin": "{{ prev }}",
+     "variables": {"prev": "streamed"},
+     "expected_return": "STREAMED TEXT\n", "expected_exit_codes": [0, 0], "expected_exit_code": 0},
+    {"id": "middle_command_fails",
+     "commands": [{"call": "printf", "args": ["a\\n"]}, {"call": "grep", "args": ["missing"]}, {"call": "cat"}],
+     "expected_return": "", "expected_exit_codes": [0, 1, 0], "expected_exit_code": 1},
+    {"id": "env_vars",
+     "commands": [{"call": "printenv", "args": ["GREETING"]}, {"call": "cat"}], "env_vars": {"GREETING": "Hi {{ text }}"},
+     "variables": {"text": "there"},
+     "expected_return": "Hi there\n", "expected_exit_codes": [0, 0], "expected_exit_code": 0},
+    {"id": "command_not_found",
+     "commands": [{"call": "printf", "args": ["a"]}, {"call": "not-existing-command-xyz"}],
+     "expected_exception_message": "Pipeline command not found: not-existing-command-xyz"},
+]
+@pytest.mark.parametrize("case", get_step_run_pipeline_CASES, ids=[c["id"] for c in get_step_run_pipeline_CASES])
+def test_step_run_pipeline(tmp_path, case, monkeypatch):
+    from prich.core.steps.step_run_pipeline import run_pipeline_step
+    from prich.core.stream_output import StreamedOutput
+    from prich.models.template import CommandPipelineStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_pipeline.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    step = CommandPipelineStep(type="pipeline", name="pipeline", commands=case["commands"], stdin=case.get("stdin"),
+                               env_vars=case.get("env_vars"))
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    variables = {k: StreamedOutput.from_text(f"{v} text\n") if k == "prev" else v
+                 for k, v in case.get("variables", {}).items()}
+    if case.get("expected_exception_message"):
+        with pytest.raises(click.ClickException, match=case["expected_exception_message"]):
+            run_pipeline_step(template, step, variables)
+        return
+    (actual_res, exit_code, exit_codes), _ = capture_stdout(run_pipeline_step, template, step, variables)
+    if "expected_return" in case:
+        assert actual_res == case["expected_return"]
+    if "expected_return_stripped" in case:
+        assert actual_res.strip() == case["expected_return_stripped"]
+    assert exit_codes == case["expected_exit_codes"]
+    assert exit_code == case["expected_exit_code"]
+
+
+def test_step_run_pipeline_large_output(tmp_path, monkeypatch):
+    from prich.core.steps.step_run_pipeline import run_pipeline_step
+    from prich.models.template import CommandPipelineStep
+
+    monkeypatch.setattr("prich.core.steps.step_run_pipeline.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    monkeypatch.setattr("prich.core.steps.step_run_command.get_env_vars", lambda: {"PATH": "/usr/bin:/bin"})
+    # the first command is stopped by SIGPIPE when the last one exits early
+    step = CommandPipelineStep(type="pipeline", name="pipeline",
+                               commands=[{"call": "yes"}, {"call": "head", "args": ["-n", "100000"]}, {"call": "wc", "args": ["-l"]}])
+    template = TemplateModel(id="test", name="test", steps=[step], folder=str(tmp_path))
+    (actual_res, exit_code, exit_codes), _ = capture_stdout(run_pipeline_step, template, step, {})
+    assert actual_res.strip() == "100000"
+    assert exit_codes[1:] == [0, 0] and exit_codes[0] != 0
+    assert exit_code == exit_codes[0]
+
+
+def test_step_send_to_llm_provider_group(tmp_path, monkeypatch):
+    from prich.core.steps.step_send_to_llm import send_to_llm
+    from prich.models.config_providers import ProviderGroupModel
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr("prich.core.steps.step_send_to_llm.is_quiet", lambda: True)
+    config = ConfigModel(providers={
+        "echo-provider": EchoProviderModel(name="echo-provider", provider_type="echo"),
+        "echo-flat": EchoProviderModel(name="echo-flat", provider_type="echo", mode="flat"),
+        "fast": ProviderGroupModel(name="fast", provider_type="group", providers=["echo-flat", "echo-provider"]),
+        "broken": ProviderGroupModel(name="broken", provider_type="group", providers=["missing", "echo-provider"]),
+    }, provider_modes=[ProviderModeModel(name="flat", prompt="flat: {{ input }}")])
+    template = TemplateModel(id="test", name="test", steps=[LLMStep(type="llm", name="test", input="hello")])
+    step = LLMStep(type="llm", name="test", input="hello {{ name }}")
+    assert send_to_llm(template, step, "fast", config, sample_variables) == "flat: hello Example Name"
+    assert (tmp_path / ".prich" / "provider_stats.json").exists()
+    with pytest.raises(click.ClickException) as e:
+        send_to_llm(template, step, "broken", config, sample_variables)
+    assert str(e.value.message) == "Provider missing (group broken member) configuration not found. Check your config.yaml file."
+
+
+def test_tokenizer_estimate_split():
+    from prich.core.tokenizer import Tokenizer
+
+    tokenizer = Tokenizer()
+    assert tokenizer.count("") == 0
+    assert tokenizer.count("abcde") == 2
+    text = "".join(f"line {i:03d}\n" for i in range(100))
+    chunks = tokenizer.split(text, chunk_tokens=50, overlap_tokens=10)
+    assert len(chunks) > 1
+    assert all(tokenizer.count(chunk) <= 50 for chunk in chunks)
+    # chunks are cut at line ends and overlap
+    assert all(chunk.endswith("\n") for chunk in chunks)
+    assert chunks[1].startswith("line ")
+    assert chunks[0].endswith(chunks[1][:chunks[1].index(chunks[0][-9:]) + 9])
+    assert chunks[-1].endswith("line 099\n")
+
+
+get_step_send_to_llm_chunking_CASES = [
+    {"id": "fits_no_chunking",
+     "step": LLMStep(type="llm", name="test", input="Summarize: {{ text }}", chunking=True),
+     "context_tokens": 1000,
+     "variables": {"text": "short text"},
+     "expected_return": "Summarize: short text",
+     },
+    {"id": "chunked_input_joined",
+     "step": LLMStep(type="llm", name="test", input="{{ text }}", chunking={"chunk_tokens": 5, "overlap_tokens": 0}),
+     "variables": {"text": "aaaaaaaaaa\nbbbbbbbbbb\ncccc"},
+     "expected_return": "aaaaaaaaaa\n\nbbbbbbbbbb\ncccc",
+     },
+    {"id": "chunked_variable_with_reduce",
+     "step": LLMStep(type="llm", name="test", instructions="Sum up", input="Part {{ chunk_index }}/{{ chunks_count }}: {{ text }}",
+                     chunking={"variable": "text", "chunk_tokens": 8, "overlap_tokens": 0, "max_concurrency": 2,
+                               "reduce": "{% for output in chunk_outputs %}[{{ output }}]{% endfor %}"}),
+     "variables": {"text": "x" * 30 + "\n" + "y" * 30},
+     "expected_return": "Sum up\n[Sum up\nPart 1/2: " + "x" * 30 + "][Sum up\nPart 2/2: " + "y" * 30 + "]",
+     },
+    {"id": "over_budget_without_chunking",
+     "step": LLMStep(type="llm", name="test", input="{{ text }}"),
+     "context_tokens": 5,
+     "variables": {"text": "x" * 100},
+     "expected_exception_message": "Prompt of step test has 25 tokens (estimate), it exceeds provider echo-provider context_tokens 5. Use llm step 'chunking' to split the input.",
+     },
+    {"id": "chunking_without_size_limit",
+     "step": LLMStep(type="llm", name="test", input="{{ text }}", chunking=True),
+     "variables": {"text": "x" * 100},
+     "expected_exception_message": "Step test chunking requires chunking chunk_tokens or provider echo-provider context_tokens.",
+     },
+    {"id": "chunking_variable_not_found",
+     "step": LLMStep(type="llm", name="test", input="{{ text }}", chunking={"variable": "missing"}),
+     "context_tokens": 5,
+     "variables": {"text": "x" * 100},
+     "expected_exception_message": "Chunking variable missing is not found in step test.",
+     },
+]
+@pytest.mark.parametrize("case", get_step_send_to_llm_chunking_CASES, ids=[c["id"] for c in get_step_send_to_llm_chunking_CASES])
+def test_step_send_to_llm_chunking(case, monkeypatch):
+    from prich.core.steps.step_send_to_llm import send_to_llm
+
+    monkeypatch.setattr("prich.core.steps.step_send_to_llm.is_quiet", lambda: True)
+    monkeypatch.setattr("prich.core.utils.is_quiet", lambda: True)
+    config = ConfigModel(providers={"echo-provider": EchoProviderModel(name="echo-provider", provider_type="echo", context_tokens=case.get("context_tokens"))},
+                         provider_modes=[], settings=SettingsConfig(default_provider="echo-provider"))
+    template = TemplateModel(id="test", name="test", steps=[case["step"]])
+    if case.get("expected_exception_message"):
+        with pytest.raises(click.ClickException) as e:
+            send_to_llm(template, case["step"], None, config, case["variables"])
+        assert str(e.value.message) == case["expected_exception_message"]
+    else:
+        assert send_to_llm(template, case["step"], None, config, case["variables"]) == case["expected_return"]
+
+
+get_chunking_validation_CASES = [
+    {"id": "negative_chunk_tokens", "chunking": {"chunk_tokens": -5}, "expected_exception_message": "greater than 0"},
+    {"id": "zero_max_concurrency", "chunking": {"max_concurrency": 0}, "expected_exception_message": "greater than 0"},
+    {"id": "negative_overlap_tokens", "chunking": {"overlap_tokens": -1}, "expected_exception_message": "greater than or equal to 0"},
+    {"id": "negative_reserve_tokens", "chunking": {"reserve_tokens": -1}, "expected_exception_message": "greater than or equal to 0"},
+]
+@pytest.mark.parametrize("case", get_chunking_validation_CASES, ids=[c["id"] for c in get_chunking_validation_CASES])
+def test_chunking_validation(case):
+    from pydantic import ValidationError
+
+    with pytest.raises(ValidationError, match=case["expected_exception_message"]):
+        LLMStep(type="llm", name="test", input="{{ text }}", chunking=case["chunking"])
+
+
+def test_step_send_to_llm_chunks_use_own_provider_state(monkeypatch):
+    import threading
+    from prich.core.steps.step_send_to_llm import send_to_llm
+    from prich.llm_providers.echo_provider import EchoProvider
+
+    class ContextProvider(EchoProvider):
+        """ Keeps context between prompts like ollama reuse_context """
+        def __init__(self, name, provider):
+            super().__init__(name, provider)
+            self.context = []
+
+        def send_prompt(self, prompt: str = None, instructions: str = None, input_: str = None) -> str:
+            self.context.append(input_)
+            return "|".join(self.context)
+
+        def reset(self):
+            self.context = []
+
+    lock = threading.Lock()
+    instances = []
+
+    def get_llm_provider(name, provider):
+        with lock:
+            instances.append(ContextProvider(name, provider))
+            return instances[-1]
+
+    monkeypatch.setattr("prich.llm_providers.get_llm_provider.get_llm_provider", get_llm_provider)
+    monkeypatch.setattr("prich.core.steps.step_send_to_llm.is_quiet", lambda: True)
+    monkeypatch.setattr("prich.core.utils.is_quiet", lambda: True)
+    config = ConfigModel(providers={"echo-provider": EchoProviderModel(name="echo-provider", provider_type="echo")},
+                         provider_modes=[], settings=SettingsConfig(default_provider="echo-provider"))
+    step = LLMStep(type="llm", name="test", input="{{ text }}", chunking={"chunk_tokens": 3, "overlap_tokens": 0, "max_concurrency": 3})
+    template = TemplateModel(id="test", name="test", steps=[step])
+    run_provider = ContextProvider("echo-provider", config.providers["echo-provider"])
+    run_provider.context = ["previous step"]
+    llm_providers = {"echo-provider": (run_provider, False)}
+    text = "".join(f"chunk{i:02d}\n" for i in range(12))
+    result = send_to_llm(template, step, None, config, {"text": text}, llm_providers=llm_providers)
+    # every chunk prompt is sent without context of other chunks or previous steps
+    assert [output.strip() for output in result.split("\n\n")] == [f"chunk{i:02d}" for i in range(12)]
+    # concurrent chunks don't use the run provider instance
+    assert run_provider.context == ["previous step"]
+    assert 1 <= len(instances) <= 3
+
+
+def test_step_send_to_llm_tiktoken_not_installed(monkeypatch):
+    import builtins
+    from prich.core.steps.step_send_to_llm import send_to_llm
+
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name == "tiktoken":
+            raise ImportError("No module named 'tiktoken'")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+    monkeypatch.setattr("prich.core.steps.step_send_to_llm.is_quiet", lambda: True)
+    config = ConfigModel(providers={"echo-provider": EchoProviderModel(name="echo-provider", provider_type="echo", context_tokens=100, tokenizer="tiktoken")},
+                         provider_modes=[], settings=SettingsConfig(default_provider="echo-provider"))
+    step = LLMStep(type="llm", name="test", input="hello")
+    template = TemplateModel(id="test", name="test", steps=[step])
+    with pytest.raises(click.ClickException) as e:
+        send_to_llm(template, step, None, config, {})
+    assert "Missing optional dependency 'tiktoken'" in str(e.value.message)
+    assert "pip install prich[tiktoken]" in str(e.value.message)
@@ -0,0 +1,121 @@
+import json
+import pytest
+from click.testing import CliRunner
+
+from prich.cli.testing import run_tests
+from prich.core.session import PrichSession
+from prich.core.template_tests import load_template_tests, run_template_tests, junit_report
+from tests.fixtures.paths import mock_paths  # noqa: F401
+from tests.fixtures.session import session_paths, TEMPLATE_YAML  # noqa: F401
+
+get_template_tests_CASES = [
+    {"id": "expected_output",
+     "case_yaml": """
+name: echo prompt
+variables:
+  name: Alice
+expected_output_contains: ["Hello Alice!"]
+expected_variables:
+  greeting: Hello Alice
+""",
+     "expected_status": "passed"},
+    {"id": "mock_response",
+     "case_yaml": """
+variables:
+  name: Bob
+mock_response: Hi Bob
+expected_output: |
+  Hi Bob
+""",
+     "expected_status": "passed"},
+    {"id": "mock_responses_list",
+     "case_yaml": """
+- variables: {name: Bob}
+  mock_response: ["first", "second"]
+  expected_output: first
+- variables: {name: Eve}
+  mock_response: ["one"]
+  expected_output_regex: "^o.e$"
+""",
+     "expected_names": ["case[1]", "case[2]"],
+     "expected_status": "passed"},
+    {"id": "failed_expectations",
+     "case_yaml": """
+variables:
+  name: Bob
+mock_response: Hi Bob
+expected_output: Hello Bob
+expected_variables:
+  greeting: Hi
+  missing: 1
+""",
+     "expected_status": "failed",
+     "expected_failures": ["Output 'Hi Bob' doesn't match expected 'Hello Bob'",
+                           "Variable greeting value 'Hello Bob' doesn't match expected 'Hi'",
+                           "Variable missing is not set"]},
+    {"id": "run_error",
+     "case_yaml": """
+variables: {}
+""",
+     "expected_status": "error",
+     "expected_failures": ["Missing required variable name"]},
+]
+
+
+@pytest.mark.parametrize("case", get_template_tests_CASES, ids=[c["id"] for c in get_template_tests_CASES])
+def test_template_tests(session_paths, case):  # noqa: F811
+    config_file, templates_dir = session_paths
+    (templates_dir / "greet" / "tests").mkdir()
+    (templates_dir / "greet" / "tests" / "case.yaml").write_text(case["case_yaml"])
+    session = PrichSession(config_paths=[config_file], template_roots=[templates_dir])
+    tests = load_template_tests(session.get_template("greet"))
+    results = run_template_tests(session, tests, jobs=2)
+    assert [result.name for result in results] == case.get("expected_names", [tests[0].case.name or "case"])
+    assert {result.status for result in results} == {case["expected_status"]}
+    if case.get("expected_failures"):
+        assert results[0].failures == case["expected_failures"]
+    report = junit_report(results)
+    assert f'tests="{len(results)}"' in report
+    assert ("<failure" in report) == (case["expected_status"] == "failed")
+    assert ("<error" in report) == (case["expected_status"] == "error")
+
+
+def test_template_tests_wrong_case(session_paths):  # noqa: F811
+    import click
+
+    config_file, templates_dir = session_paths
+    (templates_dir / "greet" / "tests").mkdir()
+    (templates_dir / "greet" / "tests" / "wrong.yaml").write_text("unknown_field: 1\n")
+    session = PrichSession(config_paths=[config_file], template_roots=[templates_dir])
+    with pytest.raises(click.ClickException, match="Failed to load template greet test file"):
+        load_template_tests(session.get_template("greet"))
+
+
+def test_template_tests_cli(mock_paths, tmp_path):  # noqa: F811
+    template_dir = mock_paths.prich.local_templates / "greet"
+    (template_dir / "tests").mkdir(parents=True)
+    (template_dir / "greet.yaml").write_text(TEMPLATE_YAML)
+    (template_dir / "tests" / "cases.yaml").write_text("""
+- name: passing
+  variables: {name: Alice}
+  mock_response: Hi
+  expected_output: Hi
+- name: failing
+  variables: {name: Alice}
+  mock_response: Hi
+  expected_output: Bye
+""")
+    junit_file = tmp_path / "report.xml"
+    runner = CliRunner()
+    result = runner.invoke(run_tests, ["greet", "-j", "2", "--junit", str(junit_file)])
+    assert result.exit_code == 2
+    assert "greet › passing: passed" in result.output
+    assert "greet › failing: failed" in result.output
+    assert "1 passed, 1 failed" in result.output
+    assert 'name="failing"' in junit_file.read_text()
+
+    result = runner.invoke(run_tests, ["greet", "--json"])
+    assert [r["status"] for r in json.loads(result.output)["results"]] == ["passed", "failed"]
+
+    result = runner.invoke(run_tests, ["missing"])
+    assert "Template missing not found." in result.output
@@ -116,7 +116,7 @@ get_validate_template_CASES = [
     {"id": "file_wrong_steps",
      "args": ["--file", "{resources}/wrong_steps.yaml"],
      "expected_output": ["wrong_steps.yaml", "is not valid (3 issues)", "Failed to load template",
-                         "1. Field value 'provider' found using 'type' does not match any of the expected values: 'python', 'command', 'llm', 'render' at 'steps[1]':  ---  - name: Ask to generate 1st",
+                         "1. Field value 'provider' found using 'type' does not match any of the expected values: 'python', 'command', 'pipeline', 'llm', 'render' at 'steps[1]':  ---  - name: Ask to generate 1st",
                          "2. Missing required field at 'steps[2].name':  ---  step_name: Ask to generate 2nd",
                          "3. Unrecognized field at 'steps[2].step_name':  ---  step_name: Ask to generate 2nd",
                          "See Steps documentation:", "https://oleks-dev.github.io/prich/reference/template/steps/"]},
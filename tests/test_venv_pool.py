@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from prich.cli.venv_utils import normalize_requirements, requirements_hash, link_pooled_venv, gc_pooled_venvs, \
+    load_pooled_venv_meta, get_venv_pool_dir
+from tests.fixtures.paths import mock_paths  # noqa: F811
+
+
+get_normalize_requirements_CASES = [
+    {"id": "empty", "text": "", "expected": []},
+    {"id": "comments_and_blank_lines", "text": "# deps\n\nrequests  # http\n", "expected": ["requests"]},
+    {"id": "sorted", "text": "rich\nPyYAML>=6\n", "expected": ["pyyaml>=6", "rich"]},
+    {"id": "name_normalized", "text": "Foo_Bar.Baz == 1.0\n", "expected": ["foo-bar-baz==1.0"]},
+    {"id": "duplicates", "text": "rich\nRich\n", "expected": ["rich"]},
+    {"id": "options_kept", "text": "--index-url https://example.com/simple\nrich\n",
+     "expected": ["--index-url https://example.com/simple", "rich"]},
+]
+
+
+@pytest.mark.parametrize("case", get_normalize_requirements_CASES, ids=[c["id"] for c in get_normalize_requirements_CASES])
+def test_normalize_requirements(case):
+    assert normalize_requirements(case["text"]) == case["expected"]
+
+
+def test_requirements_hash(tmp_path):
+    first = tmp_path / "first.txt"
+    second = tmp_path / "second.txt"
+    first.write_text("rich\nPyYAML>=6\n")
+    second.write_text("# same requirements\npyyaml >= 6\nrich\n")
+    assert requirements_hash(first) == requirements_hash(second)
+    second.write_text("rich\n")
+    assert requirements_hash(first) != requirements_hash(second)
+    assert requirements_hash(None) == requirements_hash(tmp_path / "missing.txt")
+
+
+@pytest.fixture
+def fake_venv(monkeypatch):
+    """ Venv creation and requirements install without python venv and pip """
+    calls = {"create": 0, "install": 0}
+
+    def create_venv(venv_folder):
+        calls["create"] += 1
+        (venv_folder / "bin").mkdir(parents=True)
+        (venv_folder / "bin" / "python").write_text("")
+
+    def install_requirements(venv_folder, requirements_file):
+        calls["install"] += 1
+
+    monkeypatch.setattr("prich.cli.venv_utils._create_venv", create_venv)
+    monkeypatch.setattr("prich.cli.venv_utils.install_requirements", install_requirements)
+    return calls
+
+
+def test_link_pooled_venv(mock_paths, fake_venv, tmp_path):
+    from prich.cli.templates import venv_gc
+
+    requirements = {}
+    for template_id, text in [("tpl-a", "rich\n"), ("tpl-b", "# same\nRich\n"), ("tpl-c", "requests\n")]:
+        requirements[template_id] = tmp_path / template_id / "scripts" / "requirements.txt"
+        requirements[template_id].parent.mkdir(parents=True)
+        requirements[template_id].write_text(text)
+    venv_a = link_pooled_venv(tmp_path / "tpl-a" / "scripts" / "venv", requirements["tpl-a"])
+    venv_b = link_pooled_venv(tmp_path / "tpl-b" / "scripts" / "venv", requirements["tpl-b"])
+    venv_c = link_pooled_venv(tmp_path / "tpl-c" / "scripts" / "venv", requirements["tpl-c"])
+
+    # templates with the same normalized requirements share one venv
+    assert venv_a == venv_b != venv_c
+    assert fake_venv == {"create": 2, "install": 2}
+    assert (tmp_path / "tpl-b" / "scripts" / "venv").resolve() == venv_a.resolve()
+    assert (tmp_path / "tpl-a" / "scripts" / "venv" / "bin" / "python").exists()
+    meta = load_pooled_venv_meta(venv_a)
+    assert meta["requirements"] == ["rich"]
+    assert len(meta["links"]) == 2
+
+    # venv is not used by any template anymore after the template requirements change
+    requirements["tpl-c"].write_text("rich\n")
+    assert link_pooled_venv(tmp_path / "tpl-c" / "scripts" / "venv", requirements["tpl-c"]) == venv_a
+    assert fake_venv == {"create": 2, "install": 2}
+    assert gc_pooled_venvs(dry_run=True) == [venv_c]
+    assert venv_c.exists()
+
+    # incomplete venv (failed build) is removed too
+    (get_venv_pool_dir() / "incomplete").mkdir()
+    result = CliRunner().invoke(venv_gc, [])
+    assert result.exit_code == 0, result.output
+    assert "Removed 2 unreferenced venvs." in result.output
+    assert not venv_c.exists()
+    assert venv_a.exists()
+
+    # removed templates don't reference the venv
+    import shutil
+    for template_id in ["tpl-a", "tpl-b", "tpl-c"]:
+        shutil.rmtree(tmp_path / template_id)
+    assert gc_pooled_venvs() == [venv_a]
+    result = CliRunner().invoke(venv_gc, [])
+    assert "No unreferenced venvs" in result.output
+
+
+def test_link_pooled_venv_force(mock_paths, fake_venv, tmp_path):
+    link = tmp_path / "tpl-a" / "scripts" / "venv"
+    venv_folder = link_pooled_venv(link, None)
+    # template venv created before the pool is replaced with force
+    link.unlink()
+    link.mkdir()
+    assert link_pooled_venv(link, None, force=True) == venv_folder
+    assert link.is_symlink()
+    # no requirements, nothing to install
+    assert fake_venv == {"create": 2, "install": 0}
+
+
+def test_link_pooled_venv_force_keeps_links(mock_paths, fake_venv, tmp_path):
+    requirements = {}
+    links = {}
+    for template_id in ["tpl-a", "tpl-b"]:
+        requirements[template_id] = tmp_path / template_id / "scripts" / "requirements.txt"
+        requirements[template_id].parent.mkdir(parents=True)
+        requirements[template_id].write_text("rich\n")
+        links[template_id] = tmp_path / template_id / "scripts" / "venv"
+        venv_folder = link_pooled_venv(links[template_id], requirements[template_id])
+    # rebuilt venv keeps the other templates links
+    assert link_pooled_venv(links["tpl-a"], requirements["tpl-a"], force=True) == venv_folder
+    assert load_pooled_venv_meta(venv_folder)["links"] == sorted(str(link) for link in links.values())
+    requirements["tpl-a"].write_text("requests\n")
+    link_pooled_venv(links["tpl-a"], requirements["tpl-a"])
+    assert gc_pooled_venvs(dry_run=True) == []
+    assert links["tpl-b"].resolve() == venv_folder.resolve()
+
+
+def test_gc_pooled_venvs_installed_templates(mock_paths, fake_venv):
+    link = mock_paths.prich.local_templates / "tpl-a" / "scripts" / "venv"
+    venv_folder = link_pooled_venv(link, None)
+    # venv metadata without links (ex. written by an older version), the installed template link is found
+    meta = load_pooled_venv_meta(venv_folder)
+    meta["links"] = []
+    (venv_folder / ".prich-venv.json").write_text(json.dumps(meta))
+    assert gc_pooled_venvs(dry_run=True) == []
+    link.unlink()
+    assert gc_pooled_venvs(dry_run=True) == [venv_folder]